@@ -1,14 +1,18 @@
+import logging
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Import SiloManager for database path routing
 def get_db_path():
     """Get the database path for the active silo. CRITICAL: No fallback - must resolve correctly."""
     from .silo_manager import SiloManager
     path = SiloManager.get_silo_db_path()
-    print(f"[DB_PATH] Using database: {path}", flush=True)
+    logger.debug("[DB_PATH] Using database: %s", path)
     return path
 
 # Database schema: All tables use "CREATE TABLE IF NOT EXISTS"
@@ -123,11 +127,18 @@ CREATE TABLE IF NOT EXISTS model_versions (
 
 CREATE INDEX IF NOT EXISTS idx_media_date ON media_files(date_taken DESC);
 CREATE INDEX IF NOT EXISTS idx_media_type ON media_files(type);
+-- MIN/MAX size for the advanced search filter options
+CREATE INDEX IF NOT EXISTS idx_media_size ON media_files(size);
 CREATE INDEX IF NOT EXISTS idx_media_hash ON media_files(hash);
 CREATE INDEX IF NOT EXISTS idx_uncertain_media ON uncertain_detections(media_id);
 CREATE INDEX IF NOT EXISTS idx_uncertain_reviewed ON uncertain_detections(reviewed);
 CREATE INDEX IF NOT EXISTS idx_uncertain_type ON uncertain_detections(detection_type);
+-- Review list pages (ORDER BY confidence) walk these in index order with no temp b-tree;
+-- the first also covers the unreviewed counts by type, grouped in index order
+CREATE INDEX IF NOT EXISTS idx_uncertain_review_type ON uncertain_detections(reviewed, detection_type, confidence);
+CREATE INDEX IF NOT EXISTS idx_uncertain_review_confidence ON uncertain_detections(reviewed, confidence);
 CREATE INDEX IF NOT EXISTS idx_face_media ON face_embeddings(media_id);
+CREATE INDEX IF NOT EXISTS idx_face_media_conf ON face_embeddings(media_id, confidence DESC);
 CREATE INDEX IF NOT EXISTS idx_object_media ON object_detections(media_id);
 CREATE INDEX IF NOT EXISTS idx_ocr_media ON ocr_results(media_id);
 CREATE INDEX IF NOT EXISTS idx_feedback_query ON search_feedback(query);
@@ -155,12 +166,107 @@ CREATE TABLE IF NOT EXISTS folder_media (
     UNIQUE(folder_id, media_id)
 );
 
+-- Photos the user removed from a face cluster
+CREATE TABLE IF NOT EXISTS face_cluster_exclusions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cluster_id TEXT NOT NULL,
+    media_id INTEGER NOT NULL,
+    created_at INTEGER,
+    UNIQUE(cluster_id, media_id)
+);
+
 CREATE INDEX IF NOT EXISTS idx_folder_parent ON virtual_folders(parent_id);
 CREATE INDEX IF NOT EXISTS idx_folder_silo ON virtual_folders(silo_id);
 CREATE INDEX IF NOT EXISTS idx_folder_media_folder ON folder_media(folder_id);
 CREATE INDEX IF NOT EXISTS idx_folder_media_media ON folder_media(media_id);
 """
 
+# Indexes on columns that older databases only get from the column migrations
+# in init_db, so they must be created after those have run.
+POST_MIGRATION_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_media_attempted ON media_files(face_detection_attempted) WHERE face_detection_attempted = 1;
+-- Covers the total/processed image counts: per-type index seeks with no table lookups
+CREATE INDEX IF NOT EXISTS idx_media_type_attempted ON media_files(type, face_detection_attempted);
+-- Covers /api/media/by-date: index-order walk of visible rows by date with no table lookups or temp sort (id is the rowid)
+CREATE INDEX IF NOT EXISTS idx_media_hidden_date ON media_files(is_hidden, date_taken DESC, path, type, size, width, height, rotation);
+"""
+
+
+# Rebuild one media file's row in the media_search full-text index from its
+# searchable columns plus its OCR text and detected object classes
+_SEARCH_FTS_REFRESH = """
+    DELETE FROM media_search WHERE rowid = {media_id};
+    INSERT INTO media_search(rowid, path, objects, animals, text_content, ocr_text, detection_classes)
+    SELECT m.id, m.path, m.objects, m.animals, m.text_content,
+           (SELECT group_concat(text, char(10)) FROM ocr_results WHERE media_id = m.id),
+           (SELECT group_concat(class_name, char(10)) FROM object_detections WHERE media_id = m.id)
+    FROM media_files m WHERE m.id = {media_id};
+"""
+
+# Keyword search index: trigram FTS5 answers the same case-insensitive substring
+# matches as LIKE '%q%' from an index instead of scanning every row.
+# Triggers keep it in sync with media_files, ocr_results and object_detections.
+SEARCH_FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS media_search USING fts5(
+    path, objects, animals, text_content, ocr_text, detection_classes,
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS media_search_media_ai AFTER INSERT ON media_files BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="NEW.id")}
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_media_au AFTER UPDATE OF path, objects, animals, text_content ON media_files BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="NEW.id")}
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_media_ad AFTER DELETE ON media_files BEGIN
+    DELETE FROM media_search WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS media_search_ocr_ai AFTER INSERT ON ocr_results BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="NEW.media_id")}
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_ocr_au AFTER UPDATE OF text ON ocr_results BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="NEW.media_id")}
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_ocr_ad AFTER DELETE ON ocr_results BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="OLD.media_id")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS media_search_objects_ai AFTER INSERT ON object_detections BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="NEW.media_id")}
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_objects_au AFTER UPDATE OF class_name ON object_detections BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="NEW.media_id")}
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_objects_ad AFTER DELETE ON object_detections BEGIN
+    {_SEARCH_FTS_REFRESH.format(media_id="OLD.media_id")}
+END;
+"""
+
+# One-time fill for databases that had media before the index existed
+SEARCH_FTS_BACKFILL = """
+INSERT INTO media_search(rowid, path, objects, animals, text_content, ocr_text, detection_classes)
+SELECT m.id, m.path, m.objects, m.animals, m.text_content,
+       (SELECT group_concat(text, char(10)) FROM ocr_results WHERE media_id = m.id),
+       (SELECT group_concat(class_name, char(10)) FROM object_detections WHERE media_id = m.id)
+FROM media_files m;
+"""
+
+
+def _init_search_fts(conn: sqlite3.Connection) -> None:
+    """Create and backfill the media_search index; search falls back to LIKE if FTS5/trigram is missing."""
+    try:
+        conn.executescript(SEARCH_FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        print(f"[INIT_DB] Full-text search index unavailable, keyword search will use LIKE: {e}", flush=True)
+        return
+    
+    if conn.execute("SELECT 1 FROM media_search LIMIT 1").fetchone() is None:
+        if conn.execute("SELECT 1 FROM media_files LIMIT 1").fetchone() is not None:
+            print("[INIT_DB] Building full-text search index...", flush=True)
+            conn.executescript(SEARCH_FTS_BACKFILL)
+            print("[INIT_DB] ✓ Full-text search index built", flush=True)
+
 
 def init_db(db_path: str = None) -> None:
     """Initialize database schema for a silo. If db_path not provided, uses active silo."""
@@ -225,6 +331,8 @@ def init_db(db_path: str = None) -> None:
                         print(f"Note: {col_name} column already exists or migration skipped: {e}")
             
             conn.commit()
+            conn.executescript(POST_MIGRATION_INDEXES)
+            _init_search_fts(conn)
             print(f"[INIT_DB] ✓ Database initialization complete", flush=True)
     except Exception as e:
         print(f"[INIT_DB] FATAL ERROR: {e}", flush=True)
@@ -233,29 +341,106 @@ def init_db(db_path: str = None) -> None:
         raise
 
 
+# Per-connection tuning applied once when a pooled connection is opened
+CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-65536;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA foreign_keys=ON;
+"""
+
+MAX_IDLE_CONNECTIONS = 4  # Idle connections kept per (db_path, cached_statements, readonly)
+
+# (db_path, cached_statements, readonly) -> idle connections. A connection is checked out by
+# exactly one `with get_db()` at a time, so nested or interleaved blocks never share a transaction.
+_idle_connections: Dict[Tuple[str, int, bool], List[sqlite3.Connection]] = {}
+_pool_lock = threading.Lock()
+
+
+def _open_connection(db_path: str, cached_statements: int, readonly: bool = False) -> sqlite3.Connection:
+    # check_same_thread=False: idle connections may be picked up by another worker thread
+    conn = sqlite3.connect(db_path, cached_statements=cached_statements, check_same_thread=False)
+    conn.executescript(CONNECTION_PRAGMAS)
+    if readonly:
+        # Reader pool: never takes the write lock, so it can't stall indexing writes
+        conn.execute("PRAGMA query_only=1")
+    return conn
+
+
+def close_idle_connections(db_path: str = None) -> None:
+    """Close pooled connections (all, or only those for db_path), e.g. before deleting a database."""
+    with _pool_lock:
+        keys = [key for key in _idle_connections if db_path is None or key[0] == db_path]
+        conns = [conn for key in keys for conn in _idle_connections.pop(key)]
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
 @contextmanager
-def get_db() -> Iterator[sqlite3.Connection]:
-    """Get database connection for the active silo."""
+def get_db(cached_statements: int = 128, readonly: bool = False) -> Iterator[sqlite3.Connection]:
+    """Get database connection for the active silo.
+    
+    Connections are pooled per database so the page cache and prepared statements
+    survive across requests; each one is reset and returned to the pool on exit.
+    
+    Long-lived callers that repeat the same queries can raise cached_statements
+    so SQLite keeps more prepared statements around for the connection.
+    Read-only request paths pass readonly=True to use a separate pool of
+    query_only connections (any write on them raises sqlite3.OperationalError).
+    """
     # Always get the current silo's DB path (in case silo switched)
     db_path = get_db_path()
-    print(f"[GET_DB] Opening connection to: {db_path}", flush=True)
+    key = (db_path, cached_statements, readonly)
     
     # CRITICAL: Ensure database exists before trying to connect
     if not os.path.exists(db_path):
         print(f"[GET_DB] Database doesn't exist yet, initializing: {db_path}", flush=True)
+        close_idle_connections(db_path)  # Stale handles to a deleted file
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         init_db(db_path)
         print(f"[GET_DB] ✓ Database initialized", flush=True)
     
-    conn = sqlite3.connect(db_path)
+    with _pool_lock:
+        idle = _idle_connections.get(key)
+        conn = idle.pop() if idle else None
+    if conn is None:
+        conn = _open_connection(db_path, cached_statements, readonly)
+    
+    reusable = False
     try:
         yield conn
         conn.commit()  # AUTO-COMMIT on successful context exit
-    except Exception:
-        conn.rollback()  # ROLLBACK on error
+        reusable = True
+    except sqlite3.ProgrammingError:
+        # Connection was closed by the caller - nothing to roll back or reuse
+        raise
+    except BaseException:
+        try:
+            conn.rollback()  # ROLLBACK on error
+            reusable = True
+        except sqlite3.Error:
+            pass
         raise
     finally:
-        conn.close()
+        if reusable:
+            # Undo per-caller customisation (e.g. FolderService sets sqlite3.Row)
+            conn.row_factory = None
+            conn.text_factory = str
+            with _pool_lock:
+                idle = _idle_connections.setdefault(key, [])
+                if len(idle) < MAX_IDLE_CONNECTIONS:
+                    idle.append(conn)
+                    conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
 
 
-__all__ = ["init_db", "get_db", "get_db_path"]
+__all__ = ["init_db", "get_db", "get_db_path", "close_idle_connections"]
@@ -1,3 +1,4 @@
+import gc
 import os
 from functools import lru_cache
 from typing import Optional
@@ -29,6 +30,16 @@ else:
     DEVICE = "cpu"
 
 
+def _freeze_loaded_model() -> None:
+    """Move a just-loaded (and cached for the process lifetime) model out of the
+    collector's reach, so later gc sweeps don't rescan its many objects.
+
+    Collect first so only live objects end up in the permanent generation.
+    """
+    gc.collect()
+    gc.freeze()
+
+
 @lru_cache(maxsize=1)
 def get_clip_components():
     """Load CLIP model + preprocessors once."""
@@ -41,6 +52,7 @@ def get_clip_components():
         )
         tokenizer = open_clip.get_tokenizer(CLIP_MODEL_NAME)
         model.eval()
+        _freeze_loaded_model()
         return model, preprocess, tokenizer
     except Exception as e:
         print(f"[CLIP] Failed to load model (possibly OOM): {e}")
@@ -53,6 +65,7 @@ def get_sbert_model():
         return None
     model = SentenceTransformer(SBERT_MODEL_NAME, device=DEVICE)
     model.eval()
+    _freeze_loaded_model()
     return model
 
 
@@ -1,5 +1,6 @@
 import json
 import os
+from collections import Counter
 from dataclasses import dataclass
 from typing import List, Optional
 
@@ -17,6 +18,7 @@ except ImportError:
 from .db import get_db
 from .config import get_cache_dir
 from .silo_manager import SiloManager
+from .user_config import LABEL_INDEX_MIN_LEN, _build_label_index
 
 # Resolve paths relative to backend root directory, not working directory
 _backend_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -95,7 +97,7 @@ _preload_models()
 class FaceInstance:
     path: str
     bbox: List[float]
-    embedding: List[float]
+    embedding: List[float]  # float32 row view when loaded from the DB
     score: float
 
 
@@ -239,15 +241,26 @@ def detect_faces(paths: List[str], batch_size: int = 1) -> List[FaceInstance]:
     return faces
 
 
+def detect_faces_by_image(paths: List[str], batch_size: int = 1) -> List[List[FaceInstance]]:
+    """Run detect_faces over a whole batch of images in one call.
+    
+    Returns one list per input path (same order), empty when no faces were found
+    or the image was skipped, so callers can zip the result with their inputs.
+    """
+    by_path = {}
+    for face in detect_faces(paths, batch_size=batch_size):
+        by_path.setdefault(face.path, []).append(face)
+    return [by_path.get(path, []) for path in paths]
+
+
 def load_faces_from_db() -> List[FaceInstance]:
     """Load stored face embeddings from SQLite, deduplicated by image."""
+    from .indexer import blob_dim, blobs_to_matrix
+    
     instances: List[FaceInstance] = []
-    total_embeddings = 0
-    skipped_invalid = 0
-    skipped_conversion = 0
     skipped_error = 0
     
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cur = conn.execute(
             """
             SELECT media_files.id, media_files.path, face_embeddings.embedding, face_embeddings.bbox, face_embeddings.confidence
@@ -257,44 +270,40 @@ def load_faces_from_db() -> List[FaceInstance]:
             """
         )
         rows = cur.fetchall()
-        total_embeddings = len(rows)
-        
-        for media_id, path, emb_blob, bbox_json, conf in rows:
-            try:
-                emb = np.frombuffer(emb_blob, dtype=np.float32).tolist() if emb_blob else []
-                bbox = json.loads(bbox_json) if bbox_json else []
-                
-                # Validate embedding is a valid list of floats
-                if not emb or not isinstance(emb, list) or len(emb) == 0:
-                    skipped_invalid += 1
-                    continue
-                
-                # Validate all elements are numbers
-                try:
-                    emb = [float(x) for x in emb]
-                except (TypeError, ValueError):
-                    skipped_conversion += 1
-                    continue
-                
-                instances.append(
-                    FaceInstance(
-                        path=path,
-                        bbox=[float(x) for x in bbox] if bbox else [0, 0, 0, 0],
-                        embedding=emb,
-                        score=float(conf) if conf is not None else 0.0,
-                    )
+    total_embeddings = len(rows)
+    
+    # Decode every embedding into one float32 matrix in a single pass; each instance's
+    # embedding is a row view of it rather than its own list of Python floats.
+    # Empty blobs and sizes other than the most common one are skipped as invalid.
+    blobs = [row[2] for row in rows]
+    dims = Counter(d for d in map(blob_dim, blobs) if d)
+    dim = dims.most_common(1)[0][0] if dims else 0
+    keep, matrix = blobs_to_matrix(blobs, dim) if dim else ([], None)
+    skipped_invalid = total_embeddings - len(keep)
+    
+    for i, pos in enumerate(keep):
+        media_id, path, _, bbox_json, conf = rows[pos]
+        try:
+            bbox = json.loads(bbox_json) if bbox_json else []
+            instances.append(
+                FaceInstance(
+                    path=path,
+                    bbox=[float(x) for x in bbox] if bbox else [0, 0, 0, 0],
+                    embedding=matrix[i],
+                    score=float(conf) if conf is not None else 0.0,
                 )
-            except Exception as e:
-                skipped_error += 1
-                print(f"[WARNING] Error loading face from {path}: {e}")
-                continue
+            )
+        except Exception as e:
+            skipped_error += 1
+            print(f"[WARNING] Error loading face from {path}: {e}")
+            continue
     
     # Simple deduplication: for faces from the same image path that are very similar embeddings,
     # keep only the highest confidence one. This removes detector noise without loading everything.
     # We'll do this more efficiently by just keeping all faces - clustering will handle near-duplicates
     # through the distance threshold. The key insight: we don't need perfect dedup, clustering threshold handles it.
     
-    print(f"[FACE_LOAD] Total embeddings from DB: {total_embeddings}, Loaded: {len(instances)}, Skipped (invalid): {skipped_invalid}, (conversion): {skipped_conversion}, (error): {skipped_error}")
+    print(f"[FACE_LOAD] Total embeddings from DB: {total_embeddings}, Loaded: {len(instances)}, Skipped (invalid): {skipped_invalid}, (error): {skipped_error}")
     
     if not instances:
         print("[INFO] No valid face embeddings found in database")
@@ -332,7 +341,7 @@ def cluster_faces(instances: List[FaceInstance], min_cluster_size: int = 2):
     expected_size = None
     valid_instances = []
     for instance in instances:
-        if not instance.embedding or len(instance.embedding) == 0:
+        if instance.embedding is None or len(instance.embedding) == 0:
             continue
         if expected_size is None:
             expected_size = len(instance.embedding)
@@ -441,25 +450,45 @@ def cluster_faces(instances: List[FaceInstance], min_cluster_size: int = 2):
     return result
 
 
+# (label_path, mtime_ns, size) -> parsed people.json, so repeated loads skip the read and parse
+_labels_cache = {"key": None, "data": {}}
+
+
+def _copy_labels(labels: dict) -> dict:
+    """Copy of a labels dict down to its lists, so callers can mutate it without touching the cache."""
+    return {
+        cluster_id: {k: list(v) if isinstance(v, list) else v for k, v in data.items()} if isinstance(data, dict) else data
+        for cluster_id, data in labels.items()
+    }
+
+
 def load_labels():
     """
     Load user-assigned face labels (people.json).
     
     IMPORTANT: This file is NEVER overwritten during indexing.
     User labels are persistent and preserved across reindex operations.
+    
+    The parsed file is cached until its mtime/size change; each call returns a fresh copy.
     """
+    global _labels_cache
+    key = _labels_file_key()
+    if _labels_cache["key"] == key:
+        return _copy_labels(_labels_cache["data"])
     try:
         label_path = _get_label_path()
         # Ensure cache directory exists
         os.makedirs(os.path.dirname(label_path), exist_ok=True)
         with open(label_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            data = json.load(f)
     except FileNotFoundError:
         # File doesn't exist yet - return empty labels
-        return {}
+        data = {}
     except Exception as e:
         print(f"[WARNING] Error loading labels from {_get_label_path()}: {e}")
         return {}
+    _labels_cache = {"key": key, "data": data}
+    return _copy_labels(data)
 
 
 def save_labels(data: dict):
@@ -473,6 +502,72 @@ def save_labels(data: dict):
     os.makedirs(os.path.dirname(label_path), exist_ok=True)
     with open(label_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
+    _labels_cache["key"] = None
+
+
+def _labels_file_key():
+    """(label_path, mtime_ns, size) of people.json; changes whenever labels are saved."""
+    label_path = _get_label_path()
+    try:
+        st = os.stat(label_path)
+        return (label_path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (label_path, None, None)
+
+
+# (label_path, mtime_ns, size) -> {media_id: [cluster_id, ...]} built from confirmed_photos
+_media_cluster_index = {"key": None, "data": {}}
+
+
+def get_media_cluster_index():
+    """
+    Reverse map of media_id -> cluster ids whose confirmed_photos contain it.
+    
+    Rebuilt only when people.json changes on disk (mtime/size), so per-media
+    lookups don't reload and scan every cluster.
+    """
+    key = _labels_file_key()
+    cached = _media_cluster_index
+    if cached["key"] == key:
+        return cached["data"]
+    
+    index = {}
+    for cluster_id, cluster_data in load_labels().items():
+        for media_id in cluster_data.get("confirmed_photos", []):
+            index.setdefault(media_id, []).append(cluster_id)
+    
+    _media_cluster_index.update(key=key, data=index)
+    return index
+
+
+# (label_path, mtime_ns, size) -> lowercased labels plus {substring: [cluster_id, ...]}
+_label_index = {"key": None, "labels": {}, "substrings": {}}
+
+
+def find_clusters_by_label(query: str) -> List[str]:
+    """
+    Cluster ids whose user-assigned label contains query (case-insensitive).
+    
+    Every substring of length >= LABEL_INDEX_MIN_LEN of every label is indexed
+    when people.json changes, so typical lookups are a single dict hit.
+    """
+    query = query.lower().strip()
+    if not query:
+        return []
+    
+    key = _labels_file_key()
+    if _label_index["key"] != key:
+        labels = {}
+        for cluster_id, data in load_labels().items():
+            label = (data.get("label") or "").lower()
+            if label:
+                labels[cluster_id] = label
+        substrings = _build_label_index({cluster_id: [label] for cluster_id, label in labels.items()})
+        _label_index.update(key=key, labels=labels, substrings=substrings)
+    
+    if len(query) >= LABEL_INDEX_MIN_LEN:
+        return list(_label_index["substrings"].get(query, ()))
+    return [cluster_id for cluster_id, label in _label_index["labels"].items() if query in label]
 
 
 def load_rotations():
@@ -564,6 +659,7 @@ def assign_new_faces_to_confirmed_clusters(clusters):
         Updated clusters with new faces assigned to confirmed clusters
     """
     from scipy.spatial.distance import cdist
+    from .indexer import blob_to_array
     
     labels = load_labels()
     
@@ -597,7 +693,7 @@ def assign_new_faces_to_confirmed_clusters(clusters):
                     )
                     row = cur.fetchone()
                     if row and row[0]:
-                        emb = np.frombuffer(row[0], dtype=np.float32)
+                        emb = blob_to_array(row[0])
                         embeddings.append(emb)
                 except:
                     pass
@@ -646,7 +742,7 @@ def assign_new_faces_to_confirmed_clusters(clusters):
                         )
                         row = cur.fetchone()
                         if row and row[0]:
-                            emb = np.frombuffer(row[0], dtype=np.float32)
+                            emb = blob_to_array(row[0])
                             # Normalize
                             emb = emb / (np.linalg.norm(emb) + 1e-6)
                             cluster_embeddings.append(emb)
@@ -960,5 +1056,6 @@ def set_animal_label(animal_id: str, name: str = None, hidden: bool = None):
     save_animal_labels(labels)
 
 
-__all__ = ["detect_faces", "cluster_faces", "FaceInstance", "load_faces_from_db", "apply_labels", "set_label",
+__all__ = ["detect_faces", "detect_faces_by_image", "cluster_faces", "FaceInstance", "load_faces_from_db", "apply_labels", "set_label",
+           "get_media_cluster_index", "find_clusters_by_label",
            "load_animals_from_db", "cluster_animals", "AnimalInstance", "apply_animal_labels", "set_animal_label"]
@@ -32,6 +32,7 @@ except ImportError:
     DeepFace = None
 
 from .db import get_db
+from .indexer import to_blob
 from .face_cluster import (
     FaceInstance, 
     detect_faces, 
@@ -304,25 +305,24 @@ def recompute_embeddings_for_media(progress_callback=None) -> int:
                     # Delete old embeddings for this media
                     conn.execute("DELETE FROM face_embeddings WHERE media_id = ?", (media_id,))
                     
-                    # Insert new embeddings
-                    for rep in reps:
-                        embedding = np.array(rep.get('embedding', []), dtype='float32')
-                        bbox = _bbox_from_facial_area(rep.get('facial_area', {}))
-                        confidence = float(rep.get('face_confidence', 0.5))
-                        
-                        conn.execute(
-                            "INSERT INTO face_embeddings " +
-                            "(media_id, embedding, bbox, confidence, created_at, updated_at) " +
-                            "VALUES (?, ?, ?, ?, ?, ?)",
+                    # Insert new embeddings in one executemany
+                    now = int(time.time())
+                    conn.executemany(
+                        "INSERT INTO face_embeddings " +
+                        "(media_id, embedding, bbox, confidence, created_at, updated_at) " +
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [
                             (
                                 media_id,
-                                embedding.tobytes(),
-                                json.dumps(bbox),
-                                confidence,
-                                int(time.time()),
-                                int(time.time())
+                                to_blob(rep.get('embedding', [])),
+                                json.dumps(_bbox_from_facial_area(rep.get('facial_area', {}))),
+                                float(rep.get('face_confidence', 0.5)),
+                                now,
+                                now
                             )
-                        )
+                            for rep in reps
+                        ]
+                    )
                     
                     regenerated += 1
                     if regenerated % 10 == 0:
@@ -1,10 +1,13 @@
 import asyncio
 import hashlib
 import json
+import logging
 import os
 import time
 import sqlite3
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Iterator, List, Optional
 
 import numpy as np
 from PIL import Image, ExifTags
@@ -18,6 +21,8 @@ from .animal_detector import detect_objects
 from .ocr import run_ocr
 from .search_index import build_index, load_index, save_index
 
+logger = logging.getLogger(__name__)
+
 SUPPORTED_IMAGE_TYPES = {".jpg", ".jpeg", ".png", ".heic", ".webp", ".tiff", ".tif", ".bmp", ".gif", ".ico", ".svg"}
 SUPPORTED_VIDEO_TYPES = {".mp4", ".mov", ".avi", ".mkv", ".flv", ".wmv", ".webm", ".m4v", ".3gp", ".ts"}
 SUPPORTED_AUDIO_TYPES = {".mp3", ".wav", ".flac", ".aac", ".m4a", ".ogg", ".wma", ".opus", ".alac", ".aif", ".aiff", ".ape", ".dsd"}
@@ -102,17 +107,64 @@ def md5sum(path: str, chunk_size: int = 1024 * 1024) -> str:
     return h.hexdigest()
 
 
+# Precomputed extension sets for the directory scan hot path
+_MEDIA_EXTS_NO_VIDEO = frozenset(SUPPORTED_IMAGE_TYPES | SUPPORTED_AUDIO_TYPES | SUPPORTED_TEXT_TYPES)
+_MEDIA_EXTS = _MEDIA_EXTS_NO_VIDEO | SUPPORTED_VIDEO_TYPES
+
+
 def is_media(path: str, skip_videos: bool) -> bool:
     ext = os.path.splitext(path.lower())[1]
-    if ext in SUPPORTED_IMAGE_TYPES:
-        return True
-    if not skip_videos and ext in SUPPORTED_VIDEO_TYPES:
-        return True
-    if ext in SUPPORTED_AUDIO_TYPES:
-        return True
-    if ext in SUPPORTED_TEXT_TYPES:
-        return True
-    return False
+    return ext in (_MEDIA_EXTS_NO_VIDEO if skip_videos else _MEDIA_EXTS)
+
+
+SCAN_WORKERS = 8  # Threads walking top-level subdirectories in scan_media_files
+
+
+def _scan_media_dir(path: str, exts: frozenset, subdirs: Optional[list]) -> Iterator[str]:
+    """Yield media files directly inside path, appending its subdirectories to subdirs (unless None)."""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if subdirs is not None:
+                            subdirs.append(entry.path)
+                        continue
+                    # Inlined is_media: one rfind + frozenset lookup per name
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot > 0 and name[dot:].lower() in exts:
+                        yield entry.path
+                except OSError:
+                    continue
+    except OSError as e:
+        print(f"[INDEXING] ⚠ Could not scan {path}: {e}")
+
+
+def iter_media_files(root: str, recursive: bool = True, skip_videos: bool = False) -> Iterator[str]:
+    """Yield media file paths under root as the directory walk finds them.
+    
+    Uses os.scandir so files can be processed before the whole tree has been
+    walked and without holding every path in memory.
+    """
+    exts = _MEDIA_EXTS_NO_VIDEO if skip_videos else _MEDIA_EXTS
+    stack = [root]
+    while stack:
+        yield from _scan_media_dir(stack.pop(), exts, stack if recursive else None)
+
+
+def scan_media_files(paths: List[str], skip_videos: bool = False) -> List[str]:
+    """All media files under the given directories, walking top-level subdirectories in parallel."""
+    exts = _MEDIA_EXTS_NO_VIDEO if skip_videos else _MEDIA_EXTS
+    found, subtrees = [], []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(_scan_media_dir(path, exts, subtrees))
+    if subtrees:
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            for files in pool.map(lambda root: list(iter_media_files(root, skip_videos=skip_videos)), subtrees):
+                found.extend(files)
+    return found
 
 
 def extract_text_content(path: str) -> str:
@@ -350,28 +402,94 @@ def extract_exif(path: str) -> dict:
     return meta
 
 
+# Embeddings are stored as float16 (half the bytes of float32) behind this tag;
+# untagged blobs are the older raw float32 format and still decode
+EMBEDDING_FP16_TAG = b"F16\x00"
+
+
 def to_blob(vec: List[float]) -> sqlite3.Binary:
     if vec is None:
         return None
-    return sqlite3.Binary(np.asarray(vec, dtype="float32").tobytes())
+    arr = np.asarray(vec, dtype="float16")
+    if arr.size == 0:
+        return sqlite3.Binary(b"")
+    return sqlite3.Binary(EMBEDDING_FP16_TAG + arr.tobytes())
+
+
+def blob_to_array(blob) -> np.ndarray:
+    """Deserialize an embedding blob (tagged float16 or legacy float32) to a float32 array."""
+    if not blob:
+        return np.empty(0, dtype=np.float32)
+    if bytes(blob[:4]) == EMBEDDING_FP16_TAG:
+        return np.frombuffer(blob, dtype=np.float16, offset=4).astype(np.float32)
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def blob_dim(blob) -> int:
+    """Number of components an embedding blob holds, read from its length without decoding."""
+    if not blob:
+        return 0
+    if bytes(blob[:len(EMBEDDING_FP16_TAG)]) == EMBEDDING_FP16_TAG:
+        return (len(blob) - len(EMBEDDING_FP16_TAG)) // 2
+    return len(blob) // 4
+
+
+def blobs_to_matrix(blobs, dim: int):
+    """
+    Decode many embedding blobs into one (N, dim) float32 matrix.
+    
+    Payloads of each format are concatenated and decoded with a single
+    np.frombuffer call instead of one array per row. Returns (keep, matrix) where
+    keep lists the input positions whose blob had exactly dim components.
+    """
+    tag_len = len(EMBEDDING_FP16_TAG)
+    fp16_rows, fp16_parts = [], []
+    fp32_rows, fp32_parts = [], []
+    keep = []
+    for pos, blob in enumerate(blobs):
+        if not blob:
+            continue
+        if len(blob) == tag_len + 2 * dim and bytes(blob[:tag_len]) == EMBEDDING_FP16_TAG:
+            fp16_rows.append(len(keep))
+            fp16_parts.append(bytes(blob[tag_len:]))
+        elif len(blob) == 4 * dim and bytes(blob[:tag_len]) != EMBEDDING_FP16_TAG:
+            fp32_rows.append(len(keep))
+            fp32_parts.append(bytes(blob))
+        else:
+            continue
+        keep.append(pos)
+    
+    matrix = np.empty((len(keep), dim), dtype=np.float32)
+    if fp16_parts:
+        matrix[fp16_rows] = np.frombuffer(b"".join(fp16_parts), dtype=np.float16).reshape(-1, dim)
+    if fp32_parts:
+        matrix[fp32_rows] = np.frombuffer(b"".join(fp32_parts), dtype=np.float32).reshape(-1, dim)
+    return keep, matrix
 
 
 def from_blob(blob) -> List[float]:
     """Deserialize embedding from binary blob."""
     if blob is None:
         return None
-    return np.frombuffer(blob, dtype="float32").tolist()
+    return blob_to_array(blob).tolist()
+
+
+def compact_embedding_blob(blob):
+    """Re-encode a legacy float32 blob as tagged float16; None if it needs no rewrite."""
+    if not blob or bytes(blob[:4]) == EMBEDDING_FP16_TAG:
+        return None
+    return to_blob(np.frombuffer(blob, dtype=np.float32))
 
 
 def store_object_detections(conn: sqlite3.Connection, media_id: int, detections: list):
     now = int(time.time())
     conn.execute("DELETE FROM object_detections WHERE media_id = ?", (media_id,))
-    for det in detections:
-        conn.execute(
-            """
-            INSERT INTO object_detections (media_id, class_name, confidence, bbox, class_id, source, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    conn.executemany(
+        """
+        INSERT INTO object_detections (media_id, class_name, confidence, bbox, class_id, source, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
             (
                 media_id,
                 det["class_name"],
@@ -381,20 +499,22 @@ def store_object_detections(conn: sqlite3.Connection, media_id: int, detections:
                 det.get("source", "yolo"),
                 now,
                 now,
-            ),
-        )
+            )
+            for det in detections
+        ],
+    )
 
 
 def store_face_embeddings(conn: sqlite3.Connection, media_id: int, faces: list):
     now = int(time.time())
-    print(f"[INDEXING] store_face_embeddings called with {len(faces)} faces for media_id={media_id}")
+    logger.debug("[INDEXING] store_face_embeddings called with %d faces for media_id=%s", len(faces), media_id)
     conn.execute("DELETE FROM face_embeddings WHERE media_id = ?", (media_id,))
     if not faces:
         # Mark image as "processed with no faces" by inserting a marker row
         # Use a zero-length numpy array as placeholder embedding
         import numpy as np
         zero_embedding = np.array([], dtype=np.float32)
-        print(f"[INDEXING]   Inserting marker (0-byte embedding) for media_id={media_id}")
+        logger.debug("[INDEXING]   Inserting marker (0-byte embedding) for media_id=%s", media_id)
         conn.execute(
             """
             INSERT INTO face_embeddings (media_id, embedding, bbox, confidence, label, created_at, updated_at)
@@ -411,18 +531,14 @@ def store_face_embeddings(conn: sqlite3.Connection, media_id: int, faces: list):
             ),
         )
     else:
+        rows = []
         for i, face in enumerate(faces):
             embedding = face.get("embedding")
-            # DEBUG: Log the embedding info
             if embedding:
-                print(f"[INDEXING]   Face {i}: Storing embedding with {len(embedding)} floats, score={face.get('score')}")
+                logger.debug("[INDEXING]   Face %d: Storing embedding with %d floats, score=%s", i, len(embedding), face.get('score'))
             else:
-                print(f"[INDEXING]   Face {i}: WARNING - No embedding! Keys: {list(face.keys())}, Values: {face}")
-            conn.execute(
-                """
-                INSERT INTO face_embeddings (media_id, embedding, bbox, confidence, label, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                logger.warning("[INDEXING]   Face %d: No embedding for media_id=%s (keys: %s)", i, media_id, list(face.keys()))
+            rows.append(
                 (
                     media_id,
                     to_blob(embedding),
@@ -431,8 +547,16 @@ def store_face_embeddings(conn: sqlite3.Connection, media_id: int, faces: list):
                     face.get("label"),
                     now,
                     now,
-                ),
+                )
             )
+        # One executemany per image so the statement is parsed once for all faces
+        conn.executemany(
+            """
+            INSERT INTO face_embeddings (media_id, embedding, bbox, confidence, label, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
 
 
 def store_ocr_results(conn: sqlite3.Connection, media_id: int, results: list):
@@ -1160,7 +1284,9 @@ async def watch_directories(callback):
     #         observer.join()
 
 
-async def process_single(path: str):
+async def process_single(path: str, conn: Optional[sqlite3.Connection] = None):
+    """Index one media file. Pass conn to reuse an open connection (the caller
+    then owns it); otherwise a connection is opened for this file."""
     print(f"[PROCESS_SINGLE] Starting: {path}")
     
     # DEBUG: Check which silo context we have
@@ -1185,7 +1311,8 @@ async def process_single(path: str):
         return
     
     print(f"[PROCESS_SINGLE] File IS media, getting database connection...", flush=True)
-    with get_db() as conn:
+    shared_conn = conn is not None
+    with (nullcontext(conn) if shared_conn else get_db()) as conn:
         print(f"[PROCESS_SINGLE] ✓ Got database connection successfully", flush=True)
         try:
             stat = os.stat(path)
@@ -1323,6 +1450,8 @@ async def process_single(path: str):
             print(f"[PROCESS_SINGLE_ERROR] Exception message: {str(e)}")
             import traceback
             traceback.print_exc()
+            if shared_conn:
+                conn.rollback()  # get_db rolls back for us; a shared connection doesn't
             raise  # Re-raise so indexing loop knows there was an error
 
 
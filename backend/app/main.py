@@ -1,32 +1,54 @@
 import asyncio
+import errno
 import json
 import os
 import sys
 import time
 import gc
 import glob
+import logging
+import shutil
+import sqlite3
 import subprocess
+import threading
+import zlib
 import numpy as np
+import psutil
+from collections import Counter, OrderedDict, deque
+from email.utils import formatdate, parsedate_to_datetime
 from typing import List, Optional, Dict, Any
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from fastapi import FastAPI, Query, HTTPException, Body, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, Query, HTTPException, Body, UploadFile, File, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it at render time
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    FastJSONResponse = JSONResponse
+    ORJSON_AVAILABLE = False
+
 from .config import load_config, ensure_paths
-from .db import init_db, get_db
-from .indexer import full_reindex, rebuild_faiss_index_from_db, watch_directories, process_single, is_media, md5sum, extract_exif, SUPPORTED_IMAGE_TYPES, store_face_embeddings
+from .db import init_db, get_db, get_db_path
+from .indexer import full_reindex, rebuild_faiss_index_from_db, watch_directories, process_single, iter_media_files, scan_media_files, md5sum, extract_exif, SUPPORTED_IMAGE_TYPES, store_face_embeddings, blob_dim, blobs_to_matrix
 from .embeddings import get_text_embedding, get_image_embedding
-from .search_index import load_index, search, save_index
-from .face_cluster import load_faces_from_db, cluster_faces, apply_labels, set_label, detect_faces, load_labels, save_labels, assign_new_faces_to_confirmed_clusters
+from .search_index import load_index, search, save_index, cosine_top_k
+from .face_cluster import load_faces_from_db, cluster_faces, apply_labels, set_label, detect_faces_by_image, load_labels, save_labels, assign_new_faces_to_confirmed_clusters, _labels_file_key
 from .user_config import get_config_manager
 from .folder_service import FolderService
 from .silo_manager import SiloManager
 from .startup_cleanup import startup_cleanup
 from . import silo_endpoints
 
+# Verbose per-request search diagnostics go to logger.debug; enable them through the
+# logging config (e.g. uvicorn --log-level debug)
+logger = logging.getLogger(__name__)
+
 # Demo mode helper
 def check_read_only():
     """Check if system is in read-only demo mode."""
@@ -57,7 +79,15 @@ def get_executor():
         _executor = ThreadPoolExecutor(max_workers=1)  # Single worker to prevent memory issues
     return _executor
 
-app = FastAPI(title="PersonalAI Photo Manager", version="0.1.0")
+# Dedicated pool for blocking filesystem work (directory scans/counts) so long
+# walks don't compete with other users of the default asyncio executor
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="indexing-io")
+
+async def run_io(func, *args):
+    """Run a blocking filesystem call on the indexing I/O pool."""
+    return await asyncio.get_running_loop().run_in_executor(_IO_EXECUTOR, func, *args)
+
+app = FastAPI(title="PersonalAI Photo Manager", version="0.1.0", default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -65,6 +95,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include silo management router
@@ -90,9 +121,16 @@ _currently_processing_silo = None
 def _set_processing_silo(silo_name: str) -> None:
     """Explicitly set which silo is currently being processed."""
     global _currently_processing_silo
+    from .silo_manager import SiloManager
+    if _currently_processing_silo == silo_name:
+        active = SiloManager.get_active_silo()
+        if active and active.get("name") == silo_name:
+            # Already current and active: skip the silos.json rewrite in switch_silo
+            return
+    else:
+        SiloManager.clear_path_cache()
     _currently_processing_silo = silo_name
     # Also update silos.json to ensure consistency
-    from .silo_manager import SiloManager
     SiloManager.switch_silo(silo_name)
 
 def _create_indexing_state():
@@ -125,14 +163,23 @@ def _get_current_silo_name():
     except:
         return "default"
 
-def _get_silo_indexing_state():
-    """Get indexing state for the current silo."""
+def _get_silo_indexing_state(silo_name: str = None):
+    """Get indexing state for the current (or given) silo."""
     global _silo_indexing_states
-    silo_name = _get_current_silo_name()
+    silo_name = silo_name or _get_current_silo_name()
     if silo_name not in _silo_indexing_states:
         _silo_indexing_states[silo_name] = _create_indexing_state()
     return _silo_indexing_states[silo_name]
 
+# Per-silo locks for multi-field indexing_state updates, so status polls never
+# serialize a half-applied update (e.g. new processed with old total)
+_silo_indexing_locks = {}
+
+def _get_silo_indexing_lock(silo_name: str = None) -> threading.Lock:
+    """Get the lock guarding the current (or given) silo's indexing state."""
+    silo_name = silo_name or _get_current_silo_name()
+    return _silo_indexing_locks.setdefault(silo_name, threading.Lock())
+
 # Keep a reference to indexing_state for backwards compatibility
 indexing_state = None
 
@@ -814,6 +861,86 @@ async def detect_faces_only(silo_name: str = None):
     return {"status": "face_detection_started", "mode": "detect_only_no_reindex"}
 
 
+async def _tail_stream(stream: asyncio.StreamReader, tail: deque) -> None:
+    """Read a subprocess stream line by line, keeping only the most recent lines."""
+    async for raw in stream:
+        line = raw.decode("utf-8", errors="ignore").rstrip()
+        if line:
+            tail.append(line)
+
+
+# Images sent to the long-lived face detection worker per stdin request
+FACE_WORKER_BATCH_SIZE = 20
+# Attempts at the same batch before its images are marked attempted and skipped
+FACE_WORKER_BATCH_RETRIES = 3
+
+
+def _next_face_detection_batch(limit: int) -> List[int]:
+    """Get ids of the next still images that haven't been through face detection."""
+    with get_db() as conn:
+        cur = conn.execute(
+            """SELECT id FROM media_files 
+               WHERE face_detection_attempted = 0
+               AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')
+               ORDER BY id LIMIT ?""",
+            (limit,)
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def _mark_face_detection_attempted(media_ids: List[int]) -> None:
+    """Mark images as attempted so a batch that keeps failing isn't fetched again."""
+    placeholders = ",".join("?" for _ in media_ids)
+    with get_db() as conn:
+        conn.execute(
+            f"UPDATE media_files SET face_detection_attempted = 1 WHERE id IN ({placeholders})",
+            media_ids,
+        )
+        conn.commit()
+
+
+async def _read_worker_status(proc, tail: deque, timeout: float = 3600) -> Optional[dict]:
+    """Read worker stdout until its next JSON status line.
+    
+    Other output is kept in tail. Returns None if the worker exits or stays
+    silent for longer than timeout.
+    """
+    while True:
+        try:
+            raw = await asyncio.wait_for(proc.stdout.readline(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"[WORKER] No output for {timeout}s, killing worker", flush=True)
+            proc.kill()
+            return None
+        if not raw:
+            return None
+        line = raw.decode("utf-8", errors="ignore").strip()
+        if line.startswith("{"):
+            try:
+                message = json.loads(line)
+                if isinstance(message, dict) and "status" in message:
+                    return message
+            except ValueError:
+                pass
+        if line:
+            tail.append(line)
+
+
+async def _send_worker_batch(proc, media_ids: List[int], tail: deque) -> Optional[dict]:
+    """Send one batch to the worker and wait for its reply (None if it died)."""
+    try:
+        proc.stdin.write((json.dumps({"media_ids": media_ids}) + "\n").encode("utf-8"))
+        await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        return None
+    
+    while True:
+        message = await _read_worker_status(proc, tail)
+        # A "restarting" notice means the worker is about to exit - wait for EOF
+        if message is None or message.get("status") != "restarting":
+            return message
+
+
 async def _run_face_detection_worker(silo_name: str = None):
     """Run face detection worker as a subprocess."""
     # CRITICAL: Restore silo context for async task
@@ -864,80 +991,118 @@ async def _run_face_detection_worker(silo_name: str = None):
         
         print(f"[API] Starting face detection worker subprocess for {total_files} images...", flush=True)
         
-        # Run subprocess in a thread to avoid deadlock
-        def run_worker():
-            import subprocess
+        # Supervise one long-lived worker directly on the event loop. Models are
+        # loaded once; batches of media ids are fed over stdin until none remain.
+        async def run_worker():
             global _face_detection_running
-            max_restarts = 100  # Allow many restarts to process all files
+            max_restarts = 100  # Worker is only respawned after a crash or detection timeout
             restart_count = 0
+            batches_done = 0
+            last_batch = None
+            batch_retries = 0
+            proc = None
+            stderr_reader = None
             
             # Setup environment for worker with silo DB path and cluster cache path
             worker_env = os.environ.copy()
             worker_env["PAI_DB"] = db_path
             worker_env["PAI_CLUSTER_CACHE"] = cluster_cache_path
             
-            while restart_count < max_restarts:
-                # Ensure flag stays set during restarts
-                _face_detection_running = True
-                
-                result = subprocess.run(
-                    [sys.executable, worker_script],
-                    cwd=backend_dir,
-                    capture_output=True,
-                    timeout=3600,  # 1 hour timeout
-                    text=True,
-                    env=worker_env  # Pass silo DB path to worker
-                )
-                
-                # Log worker output for debugging
-                if result.stdout:
-                    print(f"[WORKER-STDOUT] {result.stdout[:500]}", flush=True)
-                if result.stderr:
-                    print(f"[WORKER-STDERR] {result.stderr[:500]}", flush=True)
-                print(f"[WORKER] Exit code: {result.returncode}", flush=True)
-                
-                # Check if any unprocessed files remain (regardless of exit code)
-                try:
-                    with get_db() as conn:
-                        cur = conn.execute(
-                            """SELECT COUNT(*) FROM media_files 
-                               WHERE face_detection_attempted = 0
-                               AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
-                        )
-                        remaining = cur.fetchone()[0] or 0
-                except Exception as e:
-                    print(f"[API] Error checking remaining files: {e}", flush=True)
-                    remaining = 0
-                
-                # If exit code was 0 or there are still files to process, check what to do
-                if result.returncode == 0 or remaining > 0:
-                    if remaining == 0:
-                        print(f"[API] ✅ face detection COMPLETE - all {restart_count + 1} batches processed", flush=True)
-                        _face_detection_running = False
-                        return 0
-                    else:
-                        # More files to process, restart worker (even if previous batch had errors)
+            # Keep only the last lines of worker output - memory stays constant
+            stdout_tail = deque(maxlen=20)
+            stderr_tail = deque(maxlen=20)
+            
+            try:
+                while True:
+                    # Ensure flag stays set for the whole run
+                    _face_detection_running = True
+                    
+                    batch_ids = await run_io(_next_face_detection_batch, FACE_WORKER_BATCH_SIZE)
+                    if not batch_ids:
+                        break
+                    
+                    if batch_ids == last_batch:
+                        # Worker errored or nothing got marked - don't spin on the same batch
                         restart_count += 1
-                        if result.returncode != 0:
-                            print(f"[API] ⚠️ Worker batch #{restart_count} failed with exit code {result.returncode}, but files remain - restarting...", flush=True)
-                        else:
-                            print(f"[API] 🔄 Worker batch #{restart_count} complete - restarting ({remaining} files remaining)...", flush=True)
-                        time.sleep(0.5)  # Brief pause between restarts
+                        batch_retries += 1
+                        if restart_count >= max_restarts:
+                            print(f"[API] ⚠️  Maximum restart limit ({max_restarts}) reached", flush=True)
+                            break
+                        if batch_retries >= FACE_WORKER_BATCH_RETRIES:
+                            print(f"[API] ⚠️ Batch starting at media_id {batch_ids[0]} failed {batch_retries} times, skipping {len(batch_ids)} images", flush=True)
+                            await run_io(_mark_face_detection_attempted, batch_ids)
+                            last_batch = None
+                            batch_retries = 0
+                            continue
+                        print(f"[API] ⚠️ Batch starting at media_id {batch_ids[0]} was not marked processed, retrying...", flush=True)
+                        await asyncio.sleep(2 ** batch_retries)  # Back off, e.g. while the DB is locked
+                    else:
+                        batch_retries = 0
+                    last_batch = batch_ids
+                    
+                    if proc is None or proc.returncode is not None:
+                        if proc is not None:
+                            restart_count += 1
+                        if restart_count >= max_restarts:
+                            print(f"[API] ⚠️  Maximum restart limit ({max_restarts}) reached", flush=True)
+                            break
+                        if proc is not None:
+                            print(f"[API] 🔄 Respawning worker (restart #{restart_count})...", flush=True)
+                            await asyncio.sleep(0.5)  # Brief pause between restarts
+                        
+                        proc = await asyncio.create_subprocess_exec(
+                            sys.executable, worker_script, "--serve",
+                            cwd=backend_dir,
+                            stdin=asyncio.subprocess.PIPE,
+                            stdout=asyncio.subprocess.PIPE,
+                            stderr=asyncio.subprocess.PIPE,
+                            env=worker_env,  # Pass silo DB path to worker
+                            limit=1024 * 1024,  # Tracebacks can exceed the default 64KiB line limit
+                        )
+                        stderr_reader = asyncio.ensure_future(_tail_stream(proc.stderr, stderr_tail))
+                        print(f"[API] Worker process started (PID: {proc.pid})", flush=True)
+                    
+                    result = await _send_worker_batch(proc, batch_ids, stdout_tail)
+                    if result and result.get("status") == "batch_complete":
+                        batches_done += 1
+                        print(f"[API] Worker batch #{batches_done} complete: {result.get('processed', 0)} images, {result.get('faces_found', 0)} faces", flush=True)
                         continue
-                else:
-                    # Worker crashed and no files remain (or error checking files)
-                    print(f"[API] ❌ Worker batch #{restart_count + 1} exited with code {result.returncode}, no files remaining", flush=True)
-                    if result.stderr:
-                        print(f"[API] STDERR: {result.stderr[:500]}", flush=True)
-                    _face_detection_running = False
-                    return result.returncode
-            
-            print(f"[API] ⚠️  Maximum restart limit ({max_restarts}) reached", flush=True)
-            _face_detection_running = False
-            return 0
-        
-        loop = asyncio.get_event_loop()
-        returncode = await loop.run_in_executor(None, run_worker)
+                    
+                    if result and result.get("status") == "error":
+                        print(f"[API] ⚠️ Worker reported batch error: {result.get('error')}", flush=True)
+                        continue
+                    
+                    # Worker exited mid-batch (timeout exit or crash) - respawn on next pass
+                    if proc.returncode is None:
+                        proc.kill()
+                    returncode = await proc.wait()
+                    if stdout_tail:
+                        print("[WORKER-STDOUT] " + "\n".join(stdout_tail), flush=True)
+                    if stderr_tail:
+                        print("[WORKER-STDERR] " + "\n".join(stderr_tail), flush=True)
+                    print(f"[WORKER] Exit code: {returncode}", flush=True)
+                
+                # No more work: closing stdin lets the worker log final stats and exit
+                if proc is not None and proc.returncode is None:
+                    proc.stdin.close()
+                    await _read_worker_status(proc, stdout_tail)
+                    returncode = await proc.wait()
+                    print(f"[WORKER] Exit code: {returncode}", flush=True)
+                
+                print(f"[API] ✅ face detection COMPLETE - {batches_done} batches processed", flush=True)
+                _face_detection_running = False
+                return 0
+            except asyncio.CancelledError:
+                # Task cancelled - don't leave an orphaned worker behind
+                if proc is not None and proc.returncode is None:
+                    proc.terminate()
+                    await proc.wait()
+                raise
+            finally:
+                if stderr_reader is not None:
+                    stderr_reader.cancel()
+        
+        returncode = await run_worker()
         
         if returncode == 0:
             # Query final face count
@@ -948,8 +1113,7 @@ async def _run_face_detection_worker(silo_name: str = None):
                 total_faces = cur.fetchone()[0]
             
             # Clear face clusters cache now that new faces have been detected
-            _face_clusters_cache["data"] = None
-            _face_clusters_cache["timestamp"] = 0
+            _face_clusters_cache["key"] = None
             print(f"[API] Cleared face clusters cache after detecting {total_faces} total faces", flush=True)
             
             indexing_state["faces_found"] = total_faces
@@ -989,12 +1153,69 @@ indexing_state = {
     "animals_found": 0,
 }
 
-# Cache for face clustering to avoid recalculating every request
+# Cache for face clustering to avoid recalculating every request. Keyed on the
+# silo database plus (COUNT(*), MAX(id)) of face_embeddings, so it only goes
+# stale when faces change; invalidate by setting "key" to None.
+FACE_CLUSTERS_CACHE_TTL = 60  # Cache for 60 seconds to prevent constant re-clustering
 _face_clusters_cache = {
+    "key": None,
+    "data": None,
+    "photo_ids": {},  # cluster id -> frozenset of media ids in the cluster's photos
+    "ts": 0,
+}
+
+
+def _get_face_clusters() -> List[dict]:
+    """Return cluster_faces() output for the active silo, reusing the cached result
+    while face_embeddings is unchanged. Returns shallow copies so callers can
+    apply labels without touching the cached clusters."""
+    global _face_clusters_cache
+    from .db import get_db_path
+    
+    with get_db() as conn:
+        count, max_id = conn.execute("SELECT COUNT(*), MAX(id) FROM face_embeddings").fetchone()
+    key = (get_db_path(), count, max_id)
+    
+    cache = _face_clusters_cache
+    if cache["key"] == key and time.time() - cache["ts"] < FACE_CLUSTERS_CACHE_TTL:
+        return [dict(c) for c in cache["data"]]
+    
+    clusters = cluster_faces(load_faces_from_db())
+    # Pre-aggregate each cluster's media ids once so people search doesn't walk photos per request
+    photo_ids = {
+        c.get("id"): frozenset(p.get("media_id") for p in c.get("photos", []) if p.get("media_id"))
+        for c in clusters
+    }
+    # Swap the whole dict so concurrent readers never see a half-updated entry
+    _face_clusters_cache = {"key": key, "data": clusters, "photo_ids": photo_ids, "ts": time.time()}
+    return [dict(c) for c in clusters]
+
+
+def _get_cached_clusters():
+    """Labeled clusters for request paths: the on-disk cluster cache if present
+    (as /api/people uses), otherwise the in-memory _get_face_clusters() result.
+    Only clusters on demand when neither cache is warm.
+    
+    Returns (clusters, photo_ids) where photo_ids maps cluster id to its
+    pre-aggregated media ids (empty for clusters from the on-disk cache)."""
+    from .face_cluster import load_cluster_cache
+    clusters = load_cluster_cache()
+    if clusters:
+        return apply_labels(clusters), {}
+    clusters = _get_face_clusters()
+    return apply_labels(clusters), _face_clusters_cache["photo_ids"]
+
+
+# Last parsed worker progress file plus a short-lived attempted-count, so
+# frequent /api/indexing polls don't re-read the file or hit SQLite each time
+_progress_cache = {
+    "path": None,
+    "mtime": 0,
     "data": None,
-    "timestamp": 0,
-    "cache_duration": 60,  # Cache for 60 seconds to prevent constant re-clustering
+    "attempted": 0,
+    "attempted_ts": 0,
 }
+_PROGRESS_ATTEMPTED_TTL = 2  # seconds
 
 
 @app.post("/api/indexing")
@@ -1083,183 +1304,227 @@ async def _index_path_with_progress_locked(root_path: str, recursive: bool = Tru
 
 
 
+FULL_GC_EVERY_FILES = 50
+FULL_GC_RSS_MB = 2048  # Force a full collection when the server grows past this
+
+
+def _collect_after_file(files_done: int) -> None:
+    """Cheap young-generation sweep after each file, with a full collection
+    every FULL_GC_EVERY_FILES files or when RSS crosses FULL_GC_RSS_MB."""
+    rss_mb = psutil.Process().memory_info().rss / 1024 / 1024
+    if files_done % FULL_GC_EVERY_FILES == 0 or rss_mb > FULL_GC_RSS_MB:
+        gc.collect()
+    else:
+        gc.collect(0)
+
+
+def _fetch_face_batch(limit: int, skip_ids: set = frozenset()) -> List[tuple]:
+    """Next (id, path) images that have no face_embeddings rows yet, except skip_ids."""
+    with get_db() as conn:
+        return conn.execute(
+            """SELECT id, path FROM media_files 
+               WHERE id NOT IN (SELECT DISTINCT media_id FROM face_embeddings) 
+               AND id NOT IN (SELECT value FROM json_each(?))
+               AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')
+               LIMIT ?""",
+            (json.dumps(sorted(skip_ids)), limit)
+        ).fetchall()
+
+
+def _commit_face_batch(pending_embeddings: List[tuple]) -> None:
+    """Write a batch's embeddings in a single transaction (one fsync) instead of one per image."""
+    with get_db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for media_id, face_rows in pending_embeddings:
+            store_face_embeddings(conn, media_id, face_rows)
+        conn.commit()
+
+
+async def _face_detect_coroutine(indexing_state: dict, batch_size: int = 10) -> int:
+    """Detect faces in every image without embeddings, in-process, one batch at a time.
+    
+    Pulls a batch from the DB, detects it in one detect_faces_by_image call, commits it and
+    loops until nothing is left; blocking work runs in threads so the event loop
+    stays free. Returns the number of faces found.
+    """
+    total_faces_detected = 0
+    processed_count = 0
+    failed_ids = set()  # Batches that errored this run; not re-fetched
+    
+    while unindexed_faces := await asyncio.to_thread(_fetch_face_batch, batch_size, failed_ids):
+        print(f"[INDEXING] Processing face detection batch: {len(unindexed_faces)} files ({processed_count} done so far)...")
+        
+        # Memory cleanup every 3 images happens inside detect_faces_by_image
+        indexing_state["current_file"] = f"Detecting faces: {len(unindexed_faces)} images"
+        try:
+            faces_per_image = await asyncio.to_thread(
+                detect_faces_by_image, [path for _, path in unindexed_faces], 3
+            )
+        except Exception as e:
+            print(f"[INDEXING] ✗ face detection error for batch, skipping {len(unindexed_faces)} files: {e}")
+            import traceback
+            traceback.print_exc()
+            failed_ids.update(media_id for media_id, _ in unindexed_faces)
+            continue
+        
+        # Images without faces get the no-faces marker so they aren't selected again
+        pending_embeddings = []
+        for (media_id, path), faces in zip(unindexed_faces, faces_per_image):
+            pending_embeddings.append((
+                media_id,
+                [
+                    {
+                        "embedding": f.embedding,
+                        "bbox": f.bbox,
+                        "score": f.score,
+                    }
+                    for f in faces
+                ],
+            ))
+            processed_count += 1
+            if faces:
+                total_faces_detected += len(faces)
+                print(f"[INDEXING] [{processed_count}] • Found {len(faces)} face(s) in {os.path.basename(path)}")
+        
+        await asyncio.to_thread(_commit_face_batch, pending_embeddings)
+        indexing_state["faces_found"] = total_faces_detected
+    
+    print(f"[INDEXING] ✓ face detection finished: {processed_count} files processed")
+    return total_faces_detected
+
+
 async def _index_path_with_progress(root_path: str, recursive: bool = True):
     """Index files in a path with progress tracking - memory efficient, single file at a time."""
-    indexing_state = _get_silo_indexing_state()
+    silo = _get_current_silo_name()
+    indexing_state = _get_silo_indexing_state(silo)
+    state_lock = _get_silo_indexing_lock(silo)
     
     print(f"[INDEXING_START] Currently processing silo: {_currently_processing_silo}")
     
     try:
         animals_found = 0
-        # Count total files first
-        file_list = []
         print(f"[INDEXING] Starting indexing for path: {root_path}, recursive={recursive}")
         print(f"[INDEXING] Path exists: {os.path.exists(root_path)}")
         print(f"[INDEXING] Path is directory: {os.path.isdir(root_path)}")
         
-        file_count_scanned = 0
-        for dirpath, dirnames, filenames in os.walk(root_path):
-            for name in filenames:
-                file_count_scanned += 1
-                full_path = os.path.join(dirpath, name)
-                if is_media(full_path, skip_videos=False):
-                    file_list.append(full_path)
-            if not recursive:
-                break
-        
-        print(f"[INDEXING] Found {len(file_list)} media files to index")
-        indexing_state["total"] = len(file_list)
-        
-        if len(file_list) == 0:
-            print(f"[INDEXING] no media filesfound in {root_path}, marking as complete")
-            indexing_state["status"] = "complete"
-            return
-        
-        # Index each file one at a time with memory management
-        # Process 1 file at a time with delay between each to reduce CPU/GPU load
-        print(f"[INDEXING] Starting to process {len(file_list)} media files (strictly sequential)")
-        for idx, file_path in enumerate(file_list):
+        # One directory walk, run in an IO thread, streams files straight into indexing
+        # so the first file starts immediately; its length is the exact total once it
+        # finishes. Until then progress is reported against files seen so far.
+        indexing_state["total"] = 0
+        loop = asyncio.get_running_loop()
+        # Bounded so a walk far ahead of indexing doesn't hold the whole path list
+        found_files = asyncio.Queue(maxsize=256)
+        stop_walk = threading.Event()
+        
+        def _walk() -> int:
+            count = 0
             try:
-                indexing_state["current_file"] = file_path
-
-                # Skip already indexed files
-                with get_db() as conn:
-                    cur = conn.execute("SELECT id FROM media_files WHERE path = ?", (file_path,))
-                    existing = cur.fetchone()
-                    if existing:
-                        print(f"[INDEXING_SKIP] File already in DB: {file_path}")
-                        indexing_state["processed"] += 1
-                        indexing_state["percentage"] = int((indexing_state["processed"] / indexing_state["total"]) * 100)
-                        print(f"[INDEXING] Skipping ({idx + 1}/{len(file_list)}): {os.path.basename(file_path)} (already indexed)")
-                        await asyncio.sleep(0.1)  # Small delay even for skipped files
-                        continue
-                    else:
-                        print(f"[INDEXING_NEW] File not in DB: {file_path}")
+                for path in iter_media_files(root_path, recursive):
+                    if stop_walk.is_set():
+                        break
+                    count += 1
+                    asyncio.run_coroutine_threadsafe(found_files.put(path), loop).result()
+            finally:
+                asyncio.run_coroutine_threadsafe(found_files.put(None), loop).result()  # End of walk
+            with state_lock:
+                indexing_state["total"] = max(count, indexing_state["processed"])
+            print(f"[INDEXING] Found {count} media files to index")
+            return count
+        
+        async def _iter_found_files():
+            while (path := await found_files.get()) is not None:
+                yield path
+        
+        def _update_percentage(advance: int = 0):
+            # processed and percentage change together under the silo lock
+            with state_lock:
+                indexing_state["processed"] += advance
+                total = max(indexing_state["total"], indexing_state["processed"])
+                indexing_state["percentage"] = int((indexing_state["processed"] / total) * 100) if total else 0
+        
+        walk_task = asyncio.ensure_future(run_io(_walk))
+        try:
+            # Index each file one at a time with memory management
+            print(f"[INDEXING] Starting to process media files as they are found (strictly sequential)")
+            files_seen = 0
+            # One connection for the whole walk: the per-file path lookups and
+            # process_single's writes reuse its prepared-statement cache
+            with get_db(cached_statements=256) as conn:
+                conn.execute("PRAGMA cache_spill=OFF")
+                idx = -1
+                async for file_path in _iter_found_files():
+                    idx += 1
+                    files_seen = idx + 1
+                    total_label = indexing_state["total"] or "?"
+                    try:
+                        indexing_state["current_file"] = file_path
+
+                        # Skip already indexed files
+                        existing = conn.execute("SELECT id FROM media_files WHERE path = ?", (file_path,)).fetchone()
+                        if existing:
+                            print(f"[INDEXING_SKIP] File already in DB: {file_path}")
+                            _update_percentage(advance=1)
+                            print(f"[INDEXING] Skipping ({idx + 1}/{total_label}): {os.path.basename(file_path)} (already indexed)")
+                            await asyncio.sleep(0)  # Yield to the event loop without a fixed delay
+                            continue
+                        else:
+                            print(f"[INDEXING_NEW] File not in DB: {file_path}")
 
-                print(f"[INDEXING] Processing ({idx + 1}/{len(file_list)}): {os.path.basename(file_path)}")
-                await process_single(file_path)
+                        print(f"[INDEXING] Processing ({idx + 1}/{total_label}): {os.path.basename(file_path)}")
+                        await process_single(file_path, conn)
 
-                # Count animals recorded for reporting
-                with get_db() as conn:
-                    cur = conn.execute("SELECT animals FROM media_files WHERE path = ?", (file_path,))
-                    row = cur.fetchone()
-                    if row and row[0]:
-                        try:
-                            animals_found += len(json.loads(row[0]))
-                        except Exception:
-                            pass
+                        # Count animals recorded for reporting
+                        row = conn.execute("SELECT animals FROM media_files WHERE path = ?", (file_path,)).fetchone()
+                        if row and row[0]:
+                            try:
+                                animals_found += len(json.loads(row[0]))
+                            except Exception:
+                                pass
 
-                indexing_state["processed"] += 1
-                indexing_state["percentage"] = int((indexing_state["processed"] / indexing_state["total"]) * 100)
+                        _update_percentage(advance=1)
                 
-                print(f"[INDEXING] ✓ Successfully indexed ({idx + 1}/{len(file_list)})")
+                        print(f"[INDEXING] ✓ Successfully indexed ({idx + 1}/{total_label})")
                 
-                # Aggressive memory cleanup after EVERY file
-                gc.collect()
+                        _collect_after_file(indexing_state["processed"])
                 
-                # Longer delay between files to prevent blocking and ensure cleanup
-                print(f"[INDEXING] Waiting 1 second before next file...")
-                await asyncio.sleep(1.0)
-
-            except Exception as e:
-                print(f"[INDEXING] ✗ Error indexing {file_path}: {e}")
-                import traceback
-                traceback.print_exc()
-                indexing_state["processed"] += 1
-                indexing_state["percentage"] = int((indexing_state["processed"] / indexing_state["total"]) * 100)
-                # Still delay on errors to reduce load
-                gc.collect()
-                await asyncio.sleep(1.0)
-                continue
+                        # process_single already dominates wall time - just let other tasks run
+                        await asyncio.sleep(0)
+
+                    except Exception as e:
+                        print(f"[INDEXING] ✗ Error indexing {file_path}: {e}")
+                        import traceback
+                        traceback.print_exc()
+                        _update_percentage(advance=1)
+                        _collect_after_file(indexing_state["processed"])
+                        await asyncio.sleep(0)
+                        continue
+        
+            # Walk finished - the number of files seen is the exact total
+            await walk_task
+        finally:
+            if not walk_task.done():
+                # Indexing stopped early - end the walk instead of leaving it blocked on a full queue
+                stop_walk.set()
+                while not walk_task.done():
+                    while not found_files.empty():
+                        found_files.get_nowait()
+                    await asyncio.wait({walk_task}, timeout=0.1)
+        
+        with state_lock:
+            indexing_state["total"] = files_seen
+        _update_percentage()
+        
+        if files_seen == 0:
+            print(f"[INDEXING] no media filesfound in {root_path}, marking as complete")
+            indexing_state["status"] = "complete"
+            return
         
         # Run face detection on ALL newly indexed files with memory efficiency and throttling
         indexing_state["current_file"] = "Detecting faces in all indexed images..."
         print(f"[INDEXING] Starting batch face detection for all unprocessed files...")
-        print(f"[INDEXING] Using throttled face detection with 3-second delay every 3 images for system stability")
+        print(f"[INDEXING] Detecting faces in batches with memory cleanup every 3 images")
         try:
-            total_faces_detected = 0
-            batch_size = 10  # Reduced batch size from 50 to 10 for better throttling
-            processed_count = 0
-            
-            # Keep processing batches until no more files without face embeddings
-            while True:
-                with get_db() as conn:
-                    # Find files without face embeddings (using embeddings table, not faces JSON)
-                    cur = conn.execute(
-                        """SELECT COUNT(*) FROM media_files 
-                           WHERE id NOT IN (SELECT DISTINCT media_id FROM face_embeddings) 
-                           AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
-                    )
-                    remaining = cur.fetchone()[0]
-                    
-                    if remaining == 0:
-                        print(f"[INDEXING] ✓ face detection complete! All {processed_count} files processed.")
-                        break
-                    
-                    # Get next batch of files without face embeddings
-                    cur = conn.execute(
-                        """SELECT id, path FROM media_files 
-                           WHERE id NOT IN (SELECT DISTINCT media_id FROM face_embeddings) 
-                           AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')
-                           LIMIT ?""",
-                        (batch_size,)
-                    )
-                    unindexed_faces = cur.fetchall()
-                
-                if not unindexed_faces:
-                    break
-                
-                print(f"[INDEXING] Processing face detection batch: {len(unindexed_faces)} files ({remaining} remaining)...")
-                
-                for batch_idx, (media_id, path) in enumerate(unindexed_faces):
-                    try:
-                        indexing_state["current_file"] = f"Detecting faces: {path.split('/')[-1]}"
-                        print(f"[INDEXING] [{processed_count + 1}/{processed_count + len(unindexed_faces)}] Processing {path.split('/')[-1]}...")
-                        
-                        # Process one image at a time through detect_faces
-                        # (detect_faces now handles internal throttling)
-                        faces = detect_faces([path])
-                        
-                        if faces:
-                            with get_db() as conn:
-                                store_face_embeddings(
-                                    conn,
-                                    media_id,
-                                    [
-                                        {
-                                            "embedding": f.embedding,
-                                            "bbox": f.bbox,
-                                            "score": f.score,
-                                        }
-                                        for f in faces
-                                    ],
-                                )
-                            total_faces_detected += len(faces)
-                            print(f"[INDEXING] • Found {len(faces)} face(s)")
-                        
-                        processed_count += 1
-                    except Exception as e:
-                        print(f"[INDEXING] ✗ face detection error for {path}: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        processed_count += 1
-                    
-                    # Throttle: Every 3 images, do aggressive memory cleanup
-                    if (processed_count % 3) == 0:
-                        print(f"[INDEXING] Memory cleanup checkpoint ({processed_count} images processed)...")
-                        gc.collect()
-                        # Try to clean CUDA cache if available
-                        try:
-                            import torch
-                            if torch.cuda.is_available():
-                                torch.cuda.empty_cache()
-                        except:
-                            pass
-                        # Minimal delay between batches
-                        await asyncio.sleep(0.5)
-                    else:
-                        # No delay between consecutive images to speed up
-                        pass
+            total_faces_detected = await _face_detect_coroutine(indexing_state)
             
             print(f"[INDEXING] ✓ face detection phase complete: {total_faces_detected} total faces found")
             indexing_state["faces_found"] = total_faces_detected
@@ -1301,7 +1566,9 @@ async def get_indexing_status(silo_name: str = None):
     if silo_name:
         _set_processing_silo(silo_name)
     
-    indexing_state = _get_silo_indexing_state()
+    silo = _get_current_silo_name()
+    indexing_state = _get_silo_indexing_state(silo)
+    state_lock = _get_silo_indexing_lock(silo)
     
     # If face detection is running, try to read progress from the worker's progress file
     if _face_detection_running:
@@ -1310,37 +1577,56 @@ async def get_indexing_status(silo_name: str = None):
             cache_dir = SiloManager.get_silo_cache_dir()
             progress_file = os.path.join(cache_dir, "detection-progress.json")
             if os.path.exists(progress_file):
-                with open(progress_file, "r") as f:
-                    progress_data = json.load(f)
-                    if progress_data.get("total", 0) > 0:
-                        # Get count of already-attempted files from database
+                # Only re-parse the file when the worker has rewritten it
+                st = os.stat(progress_file)
+                if st.st_mtime != _progress_cache["mtime"] or progress_file != _progress_cache["path"]:
+                    if progress_file != _progress_cache["path"]:
+                        _progress_cache["attempted_ts"] = 0  # Different silo - count is stale
+                    with open(progress_file, "r") as f:
+                        _progress_cache["data"] = json.load(f)
+                    _progress_cache["mtime"] = st.st_mtime
+                    _progress_cache["path"] = progress_file
+                progress_data = _progress_cache["data"]
+                if progress_data.get("total", 0) > 0:
+                    # Get count of already-attempted files from database (partial index, cached briefly)
+                    now = time.monotonic()
+                    if now - _progress_cache["attempted_ts"] > _PROGRESS_ATTEMPTED_TTL:
                         try:
                             with get_db() as conn:
                                 cur = conn.execute("SELECT COUNT(*) FROM media_files WHERE face_detection_attempted = 1")
-                                already_attempted = cur.fetchone()[0] or 0
+                                _progress_cache["attempted"] = cur.fetchone()[0] or 0
                         except:
-                            already_attempted = 0
-                        
-                        # Calculate cumulative progress
-                        current_processed = progress_data.get("processed", 0)
-                        remaining_total = progress_data.get("total", 0)
-                        cumulative_processed = already_attempted + current_processed
-                        cumulative_total = already_attempted + remaining_total
-                        
-                        indexing_state["processed"] = cumulative_processed
-                        indexing_state["total"] = cumulative_total
-                        indexing_state["faces_found"] = progress_data.get("faces_found", 0)
-                        indexing_state["current_file"] = progress_data.get("current_file", "")
-                        pct = int((cumulative_processed / cumulative_total) * 100) if cumulative_total > 0 else 0
-                        indexing_state["percentage"] = min(pct, 99)  # Cap at 99 until truly done
+                            _progress_cache["attempted"] = 0
+                        _progress_cache["attempted_ts"] = now
+                    already_attempted = _progress_cache["attempted"]
+                    
+                    # Calculate cumulative progress
+                    current_processed = progress_data.get("processed", 0)
+                    remaining_total = progress_data.get("total", 0)
+                    cumulative_processed = already_attempted + current_processed
+                    cumulative_total = already_attempted + remaining_total
+                    
+                    pct = int((cumulative_processed / cumulative_total) * 100) if cumulative_total > 0 else 0
+                    with state_lock:
+                        indexing_state.update({
+                            "processed": cumulative_processed,
+                            "total": cumulative_total,
+                            "faces_found": progress_data.get("faces_found", 0),
+                            "current_file": progress_data.get("current_file", ""),
+                            "percentage": min(pct, 99),  # Cap at 99 until truly done
+                        })
         except Exception as e:
             print(f"[API] Could not read progress file: {e}", flush=True)
     
+    # Serialize a consistent copy rather than the live dict the indexer keeps mutating
+    with state_lock:
+        snapshot = dict(indexing_state)
+    
     return {
-        "progress": indexing_state,
+        "progress": snapshot,
         "entities": {
-            "faces": [{"label": "faces", "count": indexing_state.get("faces_found", 0)}],
-            "animals": [{"label": "animals", "count": indexing_state.get("animals_found", 0)}],
+            "faces": [{"label": "faces", "count": snapshot.get("faces_found", 0)}],
+            "animals": [{"label": "animals", "count": snapshot.get("animals_found", 0)}],
         }
     }
 
@@ -1372,32 +1658,18 @@ async def get_pause_status():
 @app.post("/api/indexing/check-new-files")
 async def check_new_files(request: dict):
     """Check for new files in the given paths that are not yet in the database."""
-    import os
-    from .indexer import SUPPORTED_IMAGE_TYPES, SUPPORTED_VIDEO_TYPES, SUPPORTED_AUDIO_TYPES, SUPPORTED_TEXT_TYPES
     paths = request.get("paths", [])
     if not paths:
         return {"new_count": 0, "paths": []}
     
-    new_files = []
     with get_db() as conn:
         # Get all existing file paths in database
         cur = conn.execute("SELECT path FROM media_files")
         existing_paths = {row[0] for row in cur.fetchall()}
     
     # Check for new files in each path - include ALL supported file types
-    supported_exts = SUPPORTED_IMAGE_TYPES | SUPPORTED_VIDEO_TYPES | SUPPORTED_AUDIO_TYPES | SUPPORTED_TEXT_TYPES
-    
-    for path in paths:
-        if not os.path.isdir(path):
-            continue
-        
-        for root, dirs, files in os.walk(path):
-            for filename in files:
-                file_path = os.path.join(root, filename)
-                _, ext = os.path.splitext(filename)
-                
-                if ext.lower() in supported_exts and file_path not in existing_paths:
-                    new_files.append(file_path)
+    found = await run_io(scan_media_files, paths)
+    new_files = [file_path for file_path in found if file_path not in existing_paths]
     
     return {
         "new_count": len(new_files),
@@ -1408,25 +1680,12 @@ async def check_new_files(request: dict):
 @app.post("/api/indexing/count-files")
 async def count_files(request: dict):
     """Count media files in the given paths."""
-    import os
-    from .indexer import SUPPORTED_IMAGE_TYPES, SUPPORTED_VIDEO_TYPES, SUPPORTED_AUDIO_TYPES, SUPPORTED_TEXT_TYPES
     paths = request.get("paths", [])
     if not paths:
         return {"total_count": 0}
     
-    # Media file extensions - include ALL supported types
-    supported_exts = SUPPORTED_IMAGE_TYPES | SUPPORTED_VIDEO_TYPES | SUPPORTED_AUDIO_TYPES | SUPPORTED_TEXT_TYPES
-    
-    total_count = 0
-    for path in paths:
-        if not os.path.isdir(path):
-            continue
-        
-        for root, dirs, files in os.walk(path):
-            for filename in files:
-                _, ext = os.path.splitext(filename)
-                if ext.lower() in supported_exts:
-                    total_count += 1
+    # Include ALL supported types
+    total_count = len(await run_io(scan_media_files, paths))
     
     return {"total_count": total_count}
 
@@ -1440,9 +1699,59 @@ async def rebuild_index(silo_name: Optional[str] = Query(None)):
     
     # Rebuild FAISS index from existing embeddings in database
     total = await rebuild_faiss_index_from_db(silo_name=silo_name)
+    # The index files aren't part of the search cache key - drop results ranked by the old index
+    _search_cache.clear()
     return {"indexed": total, "silo": silo_name}
 
 
+@app.post("/api/index/compact-embeddings")
+async def compact_embeddings(silo_name: Optional[str] = Query(None), batch_size: int = Query(500)):
+    """One-time migration: rewrite legacy float32 embedding blobs as tagged float16.
+    
+    Covers media_files.clip_embedding/text_embedding and face_embeddings.embedding.
+    Already-converted rows are skipped, so it is safe to re-run.
+    """
+    from .indexer import compact_embedding_blob
+    
+    if silo_name:
+        _set_processing_silo(silo_name)
+    
+    targets = [
+        ("media_files", "clip_embedding"),
+        ("media_files", "text_embedding"),
+        ("face_embeddings", "embedding"),
+    ]
+    converted = {}
+    
+    def run():
+        with get_db() as conn:
+            for table, column in targets:
+                count = 0
+                last_id = 0
+                while True:
+                    rows = conn.execute(
+                        f"SELECT id, {column} FROM {table} WHERE id > ? AND {column} IS NOT NULL ORDER BY id LIMIT ?",
+                        (last_id, batch_size),
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+                    updates = []
+                    for row_id, blob in rows:
+                        new_blob = compact_embedding_blob(blob)
+                        if new_blob is not None:
+                            updates.append((new_blob, row_id))
+                    if updates:
+                        conn.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", updates)
+                        conn.commit()
+                        count += len(updates)
+                converted[f"{table}.{column}"] = count
+                print(f"[EMBEDDINGS] Converted {count} {table}.{column} blobs to float16")
+    
+    await asyncio.to_thread(run)
+    return {"status": "success", "converted": converted, "silo": silo_name}
+
+
 @app.post("/api/cache/rebuild-people-clusters")
 async def rebuild_people_cluster_cache(silo_name: Optional[str] = None):
     """Build a simple cache mapping cluster names to file paths for fast search."""
@@ -1483,7 +1792,7 @@ async def rebuild_people_cluster_cache(silo_name: Optional[str] = None):
                         'files': file_paths,
                         'last_updated': int(time.time())
                     }
-                    print(f"[CACHE]   {cluster_id}: '{label}' - {len(file_paths)} files")
+                    logger.debug("[CACHE]   %s: '%s' - %d files", cluster_id, label, len(file_paths))
         
         # Write cache to silo-specific directory
         cache_dir = SiloManager.get_silo_cache_dir(silo_name) if silo_name else os.path.join(os.path.dirname(__file__), '..', 'cache')
@@ -1509,29 +1818,64 @@ async def rebuild_people_cluster_cache(silo_name: Optional[str] = None):
         return {"status": "error", "message": str(e)}
 
 
+def _rows_as_dicts(cur) -> list:
+    """Fetch a cursor's rows as dicts keyed by the selected column names (built in C via zip)."""
+    columns = [d[0] for d in cur.description]
+    return [dict(zip(columns, row)) for row in cur]
+
+
+# Hot-path media queries, kept as constants so every call hits the pooled
+# connection's prepared-statement cache with the identical SQL text
+LIST_MEDIA_QUERY = "SELECT id, path, type, date_taken, size, width, height, camera, lens FROM media_files ORDER BY date_taken DESC NULLS LAST LIMIT ? OFFSET ?"
+MEDIA_PATH_QUERY = "SELECT path FROM media_files WHERE id = ?"
+MEDIA_PATH_ROTATION_QUERY = "SELECT path, rotation FROM media_files WHERE id = ?"
+MEDIA_DIMENSIONS_QUERY = "SELECT width, height FROM media_files WHERE id = ?"
+MEDIA_FACES_QUERY = "SELECT bbox, confidence FROM face_embeddings WHERE media_id = ? AND confidence > 0 ORDER BY confidence DESC"
+# Media path and its highest-confidence face bbox in one lookup (idx_face_media_conf)
+FACE_CROP_QUERY = """SELECT m.path, f.bbox FROM media_files m
+    LEFT JOIN face_embeddings f ON f.media_id = m.id
+    WHERE m.id = ?
+    ORDER BY f.confidence DESC
+    LIMIT 1"""
+# Total and processed eligible images in one pass over idx_media_type_attempted
+MEDIA_COUNT_QUERY = """SELECT COUNT(*), COALESCE(SUM(face_detection_attempted = 1), 0) FROM media_files
+    WHERE type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
+
+
 @app.get("/api/media", response_model=List[MediaResponse])
 async def list_media(limit: int = 100, offset: int = 0, silo_name: str = Query(None)):
     # CRITICAL SECURITY: Validate silo context
     if silo_name:
         _set_processing_silo(silo_name)
     
-    with get_db() as conn:
-        cur = conn.execute(
-            "SELECT id, path, type, date_taken, size, width, height, camera, lens FROM media_files ORDER BY date_taken DESC NULLS LAST LIMIT ? OFFSET ?",
-            (limit, offset),
-        )
-        rows = cur.fetchall()
-        return [MediaResponse(**{
-            "id": r[0],
-            "path": r[1],
-            "type": r[2],
-            "date_taken": r[3],
-            "size": r[4],
-            "width": r[5],
-            "height": r[6],
-            "camera": r[7],
-            "lens": r[8],
-        }) for r in rows]
+    with get_db(readonly=True) as conn:
+        cur = conn.execute(LIST_MEDIA_QUERY, (limit, offset))
+        return [MediaResponse(**row) for row in _rows_as_dicts(cur)]
+
+
+def _media_by_date_query(rotation_expr: str) -> str:
+    groups_query = f"SELECT date_taken, json_group_array(json_object('id', id, 'path', path, 'type', type, 'size', size, 'width', width, 'height', height, 'rotation', {rotation_expr})) AS items FROM media_files WHERE is_hidden = 0 GROUP BY date_taken ORDER BY date_taken DESC"
+    # SQLite assembles the whole response body; items stays a JSON string as the frontend expects.
+    # Ordering of the subquery is preserved by json_group_array over a plain scan.
+    return f"SELECT json_group_array(json_object('date_taken', date_taken, 'items', items)) FROM ({groups_query})"
+
+
+# NULL rotation defaults to 0 in SQL; old databases without the column always report 0
+MEDIA_BY_DATE_QUERY = _media_by_date_query("COALESCE(rotation, 0)")
+MEDIA_BY_DATE_QUERY_NO_ROTATION = _media_by_date_query("0")
+
+# db_path -> whether media_files has a rotation column (schema doesn't change mid-process)
+_rotation_column_cache: Dict[str, bool] = {}
+
+
+def _has_rotation_column(conn) -> bool:
+    from .db import get_db_path
+    db_path = get_db_path()
+    has_rotation = _rotation_column_cache.get(db_path)
+    if has_rotation is None:
+        has_rotation = 'rotation' in {row[1] for row in conn.execute("PRAGMA table_info(media_files)")}
+        _rotation_column_cache[db_path] = has_rotation
+    return has_rotation
 
 
 @app.get("/api/media/by-date")
@@ -1540,36 +1884,51 @@ async def media_by_date(silo_name: str = Query(None)):
     if silo_name:
         _set_processing_silo(silo_name)
     
-    with get_db() as conn:
-        # Check if rotation column exists - handle old databases
-        cursor = conn.execute("PRAGMA table_info(media_files)")
-        columns = {row[1] for row in cursor.fetchall()}
-        has_rotation = 'rotation' in columns
-        
-        # Build dynamic query based on available columns
-        if has_rotation:
-            query = "SELECT date_taken, json_group_array(json_object('id', id, 'path', path, 'type', type, 'size', size, 'width', width, 'height', height, 'rotation', rotation)) AS items FROM media_files WHERE is_hidden = 0 GROUP BY date_taken ORDER BY date_taken DESC"
-        else:
-            query = "SELECT date_taken, json_group_array(json_object('id', id, 'path', path, 'type', type, 'size', size, 'width', width, 'height', height, 'rotation', 0)) AS items FROM media_files WHERE is_hidden = 0 GROUP BY date_taken ORDER BY date_taken DESC"
-        
-        cur = conn.execute(query)
-        result = []
-        for row in cur.fetchall():
-            # Parse items - rotation is now included from database or defaulted to 0
-            items = json.loads(row[1])
-            for item in items:
-                # Ensure rotation has a default value if NULL
-                if item['rotation'] is None:
-                    item['rotation'] = 0
-            result.append({"date_taken": row[0], "items": json.dumps(items)})
-        return result
+    with get_db(readonly=True) as conn:
+        # Old databases may lack the rotation column - checked once per database
+        query = MEDIA_BY_DATE_QUERY if _has_rotation_column(conn) else MEDIA_BY_DATE_QUERY_NO_ROTATION
+        row = conn.execute(query).fetchone()
+    
+    return Response(content=row[0] if row and row[0] else "[]", media_type="application/json")
+
+
+def _validator_headers(etag: str, mtime: float, cache_control: str = "public, max-age=86400") -> Dict[str, str]:
+    """ETag/Last-Modified/Cache-Control headers for a response derived from a file."""
+    return {
+        "ETag": etag,
+        "Last-Modified": formatdate(mtime, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+
+
+def _not_modified(request: Optional[Request], headers: Dict[str, str], mtime: float) -> Optional[Response]:
+    """Return a 304 if the client's If-None-Match / If-Modified-Since still matches, else None."""
+    if request is None:
+        return None
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since when present
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in tags or headers["ETag"] in tags:
+            return Response(status_code=304, headers=headers)
+        return None
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            if int(mtime) <= int(parsedate_to_datetime(if_modified_since).timestamp()):
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+    return None
 
 
 @app.get("/api/media/file/{media_id}")
-async def serve_media_file(media_id: int):
+async def serve_media_file(media_id: int, request: Request = None):
     """Serve media file by ID. AIF files automatically converted to WAV on-the-fly if needed."""
-    with get_db() as conn:
-        cur = conn.execute("SELECT path FROM media_files WHERE id = ?", (media_id,))
+    with get_db(readonly=True) as conn:
+        cur = conn.execute(MEDIA_PATH_QUERY, (media_id,))
         row = cur.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Media not found")
@@ -1587,17 +1946,121 @@ async def serve_media_file(media_id: int):
             if converted_path != file_path and os.path.exists(converted_path):
                 file_path = converted_path
         
-        return FileResponse(file_path)
+        st = os.stat(file_path)
+        headers = _validator_headers(f'W/"{media_id}-{int(st.st_mtime)}-{st.st_size}"', st.st_mtime)
+        not_modified = _not_modified(request, headers, st.st_mtime)
+        if not_modified:
+            return not_modified
+        
+        # FileResponse answers Range requests with 206 partial content (seek/scrub in
+        # audio/video); passing the stat we already have avoids a second os.stat
+        return FileResponse(file_path, headers=headers, stat_result=st)
+
+
+THUMBNAIL_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif', '.tiff'})
+THUMBNAIL_CACHE_MAX_MB = 1024  # Per-silo disk budget for generated thumbnails
+THUMBNAIL_EVICT_EVERY = 500  # Check the budget after this many new thumbnails
+_thumbnail_writes = 0
+
+# Optional: re-encode cached thumbnails with jpegoptim if installed (lossy: quality capped at 80)
+JPEGOPTIM_PATH = shutil.which("jpegoptim")
+
+
+def _thumbnail_cache_dir() -> str:
+    """Generated thumbnails live in the active silo's cache dir."""
+    from .silo_manager import SiloManager
+    return os.path.join(SiloManager.get_silo_cache_dir(), "thumbnails")
+
+
+def _evict_thumbnail_cache(cache_dir: str, max_bytes: int) -> None:
+    """Delete least-recently-accessed thumbnails until the cache is back under 90% of max_bytes."""
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".jpg"):
+                    st = entry.stat()
+                    entries.append((st.st_atime, st.st_size, entry.path))
+                    total += st.st_size
+    except OSError:
+        return
+    
+    if total <= max_bytes:
+        return
+    
+    target = int(max_bytes * 0.9)
+    removed = 0
+    for _, file_size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= file_size
+            removed += 1
+        except OSError:
+            continue
+    print(f"[THUMBNAIL] Evicted {removed} cached thumbnails from {cache_dir}")
+
+
+def _iter_bytesio(buf, chunk_size: int = 64 * 1024):
+    """Yield an in-memory buffer in fixed-size chunks for StreamingResponse."""
+    while True:
+        chunk = buf.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    """Write data atomically (tmp file + rename) so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _optimize_thumbnail(cache_path: str, data: bytes) -> None:
+    """Re-encode a cached thumbnail through jpegoptim and keep it only if it got smaller."""
+    try:
+        result = subprocess.run(
+            [JPEGOPTIM_PATH, "--strip-all", "--max=80", "--quiet", "--stdin", "--stdout"],
+            input=data, capture_output=True, timeout=30,
+        )
+        if result.returncode == 0 and 0 < len(result.stdout) < len(data):
+            _replace_file(cache_path, result.stdout)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"[THUMBNAIL] jpegoptim failed for {cache_path}: {e}")
+
+
+def _write_thumbnail_cache(cache_path: str, data: bytes) -> None:
+    """Write a thumbnail atomically (tmp file + rename) so readers never see a partial JPEG."""
+    global _thumbnail_writes
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        _replace_file(cache_path, data)
+    except OSError as e:
+        print(f"[THUMBNAIL] Could not cache thumbnail {cache_path}: {e}")
+        return
+    
+    if JPEGOPTIM_PATH:
+        # Copy out of the caller's buffer: it is streamed to the client after this returns
+        _IO_EXECUTOR.submit(_optimize_thumbnail, cache_path, bytes(data))
+    
+    _thumbnail_writes += 1
+    if _thumbnail_writes % THUMBNAIL_EVICT_EVERY == 0:
+        asyncio.ensure_future(run_io(_evict_thumbnail_cache, cache_dir, THUMBNAIL_CACHE_MAX_MB * 1024 * 1024))
 
 
 @app.get("/api/media/thumbnail/{media_id}")
-async def serve_thumbnail(media_id: int, size: int = 300, square: bool = False):
-    """Serve compressed thumbnail directly from the file."""
+async def serve_thumbnail(media_id: int, size: int = 300, square: bool = False, request: Request = None):
+    """Serve compressed thumbnail, generated once and then served from the silo's disk cache."""
     from PIL import Image
     import io
     
-    with get_db() as conn:
-        cur = conn.execute("SELECT path, rotation FROM media_files WHERE id = ?", (media_id,))
+    with get_db(readonly=True) as conn:
+        cur = conn.execute(MEDIA_PATH_ROTATION_QUERY, (media_id,))
         row = cur.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Media not found")
@@ -1609,14 +2072,38 @@ async def serve_thumbnail(media_id: int, size: int = 300, square: bool = False):
             raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
         
         # Check if it's an image file
-        image_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif', '.tiff'}
-        if not any(file_path.lower().endswith(ext) for ext in image_extensions):
-            return FileResponse(file_path, headers={"Cache-Control": "public, max-age=86400"})
+        source_mtime = os.path.getmtime(file_path)
+        if os.path.splitext(file_path)[1].lower() not in THUMBNAIL_IMAGE_EXTENSIONS:
+            headers = _validator_headers(f'W/"{media_id}-{int(source_mtime)}-orig"', source_mtime)
+            return _not_modified(request, headers, source_mtime) or FileResponse(file_path, headers=headers)
+        
+        # Thumbnails are a pure function of these inputs, so they also make up the ETag.
+        # The URL doesn't change on rotate/edit, so browsers revalidate every time (cheap 304)
+        cache_key = f"{media_id}_{size}_{'sq' if square else 'ar'}_{rotation}"
+        headers = _validator_headers(
+            f'W/"{cache_key}-{int(source_mtime)}"', source_mtime, "public, no-cache"
+        )
+        not_modified = _not_modified(request, headers, source_mtime)
+        if not_modified:
+            return not_modified
+        
+        # Reuse a cached thumbnail that is newer than the source
+        cache_path = os.path.join(_thumbnail_cache_dir(), f"{cache_key}.jpg")
+        try:
+            if os.path.getmtime(cache_path) >= source_mtime:
+                return FileResponse(cache_path, media_type="image/jpeg", headers=headers)
+        except OSError:
+            pass  # Not cached yet
         
         try:
             # Open image directly from the file
             img = Image.open(file_path)
             
+            # Let libjpeg decode JPEGs at a reduced DCT scale (1/2..1/8) while staying
+            # at least 2x the target size; thumbnail() below refines from there
+            if img.format == 'JPEG':
+                img.draft('RGB', (size * 2, size * 2))
+            
             # Apply rotation if needed
             if rotation and rotation != 0:
                 img = img.rotate(-rotation, expand=False, fillcolor='white')
@@ -1639,84 +2126,51 @@ async def serve_thumbnail(media_id: int, size: int = 300, square: bool = False):
                 # Resize maintaining aspect ratio
                 img.thumbnail((size, size), Image.Resampling.LANCZOS)
             
-            # Return compressed JPEG directly from memory
+            # Encode once, cache on disk, and stream the buffer without copying it
             img_bytes = io.BytesIO()
             img.save(img_bytes, "JPEG", quality=80, optimize=True)
+            with img_bytes.getbuffer() as view:
+                _write_thumbnail_cache(cache_path, view)
             img_bytes.seek(0)
             
-            return Response(content=img_bytes.getvalue(), media_type="image/jpeg")
+            return StreamingResponse(_iter_bytesio(img_bytes), media_type="image/jpeg", headers=headers)
         except Exception as e:
             print(f"[THUMBNAIL] Error generating thumbnail: {str(e)}")
             return FileResponse(file_path)
 
 
+AUDIO_EXTENSIONS = frozenset({".mp3", ".wav", ".flac", ".aac", ".m4a", ".ogg", ".wma", ".opus", ".alac", ".aif", ".aiff"})
+
+# LIKE is ASCII case-insensitive, so this matches extensions regardless of case
+LIST_AUDIO_QUERY = (
+    "SELECT id, path, type, date_taken, size FROM media_files WHERE is_hidden = 0 AND ("
+    + " OR ".join(f"path LIKE '%{ext}'" for ext in sorted(AUDIO_EXTENSIONS))
+    + ") ORDER BY date_taken DESC NULLS LAST LIMIT ? OFFSET ?"
+)
+
+
 @app.get("/api/media/audio")
-async def list_audio(limit: int = 1000, offset: int = 0):
-    """Get all audio files from the database."""
-    # Define audio types inline to ensure they're available
-    audio_types = {".mp3", ".wav", ".flac", ".aac", ".m4a", ".ogg", ".wma", ".opus", ".alac", ".aif", ".aiff"}
-    
-    with get_db() as conn:
-        # Get all non-hidden files first
-        cur = conn.execute(
-            """SELECT id, path, type, date_taken, size 
-               FROM media_files 
-               WHERE is_hidden = 0
-               ORDER BY date_taken DESC NULLS LAST"""
-        )
-        all_rows = cur.fetchall()
-        
-        print(f"[AUDIO] Total non-hidden files in database: {len(all_rows)}")
-        
-        # Count file types to understand what's being stored
-        type_counts = {}
-        aif_in_db = 0
-        wav_in_db = 0
-        
-        for row in all_rows:
-            media_id, path, file_type, date_taken, size = row
-            
-            # Get file extension from path
-            _, ext = os.path.splitext(path.lower())
-            type_counts[ext] = type_counts.get(ext, 0) + 1
-            
-            if ext == '.aif' or ext == '.aiff':
-                aif_in_db += 1
-                print(f"[AUDIO] ⚠️  AIF in database: {path}")
-            elif ext == '.wav':
-                wav_in_db += 1
-        
-        print(f"[AUDIO] File type summary: {type_counts}")
-        print(f"[AUDIO] AIF files in DB: {aif_in_db}, WAV files in DB: {wav_in_db}")
-        
-        # Filter to audio files only by checking file extension
-        audio_files = []
-        for row in all_rows:
-            media_id, path, file_type, date_taken, size = row
-            
-            # Get file extension from path
-            _, ext = os.path.splitext(path.lower())
-            
-            # Check if it's an audio file
-            if ext in audio_types:
-                audio_files.append({
-                    "id": media_id,
-                    "path": path,
-                    "type": file_type,
-                    "date_taken": date_taken,
-                    "size": size,
-                })
-                if ext in ['.aif', '.aiff', '.wav']:
-                    print(f"[AUDIO] Including audio file: {os.path.basename(path)} (ext: {ext}, is_wav: {ext == '.wav'})")
-        
-        print(f"[AUDIO] Total audio files found: {len(audio_files)} out of {len(all_rows)} non-hidden files")
-        return audio_files
+async def list_audio(limit: Optional[int] = None, offset: int = 0):
+    """Get all audio files from the database; limit/offset page it when given."""
+    with get_db(readonly=True) as conn:
+        # LIMIT -1 is SQLite's "no limit"
+        cur = conn.execute(LIST_AUDIO_QUERY, (-1 if limit is None else limit, offset))
+        return [
+            {
+                "id": media_id,
+                "path": path,
+                "type": file_type,
+                "date_taken": date_taken,
+                "size": size,
+            }
+            for media_id, path, file_type, date_taken, size in cur.fetchall()
+        ]
 
 
 @app.get("/api/debug/database-file-types")
 async def debug_file_types():
     """Debug endpoint to see what file types are in the database."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cur = conn.execute(
             """SELECT type, COUNT(*) as count 
                FROM media_files 
@@ -1737,21 +2191,8 @@ async def debug_file_types():
 async def get_total_media_count():
     """Get total count of eligible media files (images only) from database."""
     try:
-        with get_db() as conn:
-            # Count eligible image files
-            cur = conn.execute(
-                """SELECT COUNT(*) FROM media_files 
-                   WHERE type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
-            )
-            total = cur.fetchone()[0] or 0
-            
-            # Also return processed count for reference
-            processed_cur = conn.execute(
-                """SELECT COUNT(*) FROM media_files 
-                   WHERE face_detection_attempted = 1
-                   AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
-            )
-            processed = processed_cur.fetchone()[0] or 0
+        with get_db(readonly=True) as conn:
+            total, processed = conn.execute(MEDIA_COUNT_QUERY).fetchone()
             
             return {
                 "total": total,
@@ -1769,7 +2210,7 @@ async def get_total_media_count():
 async def get_media_metadata(media_id: int):
     """Get metadata for a media file (dimensions, rotation, etc)."""
     try:
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             cur = conn.execute(
                 "SELECT id, width, height, rotation FROM media_files WHERE id = ?",
                 (media_id,)
@@ -1799,20 +2240,10 @@ async def get_media_metadata(media_id: int):
 async def get_media_clusters(media_id: int):
     """Get all clusters (people) that contain this media file."""
     try:
-        from .face_cluster import load_labels
-        
-        # Load all labels to find which clusters contain this media
-        labels = load_labels()
-        cluster_ids = []
+        from .face_cluster import get_media_cluster_index
         
-        # Check each cluster's confirmed_photos
-        for cluster_id, cluster_data in labels.items():
-            confirmed_photos = cluster_data.get("confirmed_photos", [])
-            if media_id in confirmed_photos:
-                cluster_ids.append(cluster_id)
-        
-        print(f"[DEBUG] Media {media_id} found in clusters: {cluster_ids}")
-        return cluster_ids
+        # Reverse index is rebuilt only when people.json changes
+        return list(get_media_cluster_index().get(media_id, ()))
     except Exception as e:
         print(f"[API_ERROR] Failed to get media clusters: {e}")
         import traceback
@@ -1824,27 +2255,19 @@ async def get_media_clusters(media_id: int):
 async def get_media_faces(media_id: int):
     """Get detected faces for a media file with bounding boxes in normalized 0-1 coordinates."""
     try:
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             # Get image dimensions
-            cur = conn.execute(
-                "SELECT width, height FROM media_files WHERE id = ?",
-                (media_id,)
-            )
+            cur = conn.execute(MEDIA_DIMENSIONS_QUERY, (media_id,))
             dims = cur.fetchone()
             width, height = (dims[0], dims[1]) if dims and dims[0] and dims[1] else (1000, 1000)
             
             # Get all face embeddings for this media
-            cur = conn.execute(
-                "SELECT bbox, confidence FROM face_embeddings WHERE media_id = ? AND confidence > 0 ORDER BY confidence DESC",
-                (media_id,)
-            )
+            cur = conn.execute(MEDIA_FACES_QUERY, (media_id,))
             rows = cur.fetchall()
             
-            faces = []
-            for idx, row in enumerate(rows):
-                bbox_json = row[0]
-                confidence = row[1] or 0.9
-                
+            # Keep each valid pixel bbox [x1, y1, x2, y2] with its row index and confidence
+            kept = []
+            for idx, (bbox_json, confidence) in enumerate(rows):
                 try:
                     bbox = json.loads(bbox_json) if bbox_json else None
                 except:
@@ -1852,22 +2275,20 @@ async def get_media_faces(media_id: int):
                 
                 if not bbox or len(bbox) != 4:
                     continue
-                
-                # bbox is in pixel coordinates [x1, y1, x2, y2]
-                # Convert to normalized coordinates [0, 1]
-                x1, y1, x2, y2 = bbox
-                norm_bbox = [
-                    max(0.0, min(1.0, x1 / width)),
-                    max(0.0, min(1.0, y1 / height)),
-                    max(0.0, min(1.0, x2 / width)),
-                    max(0.0, min(1.0, y2 / height)),
-                ]
-                
-                faces.append({
-                    "bbox": norm_bbox,
-                    "confidence": float(confidence),
-                    "index": idx,
-                })
+                kept.append((idx, bbox, confidence or 0.9))
+            
+            if not kept:
+                return []
+            
+            # Normalize all boxes to [0, 1] in one vectorized pass
+            raw = np.array([bbox for _, bbox, _ in kept], dtype=np.float32)
+            scale = np.array([width, height, width, height], dtype=np.float32)
+            norm = np.clip(raw / scale, 0.0, 1.0).tolist()
+            
+            faces = [
+                {"bbox": norm_bbox, "confidence": float(confidence), "index": idx}
+                for (idx, _, confidence), norm_bbox in zip(kept, norm)
+            ]
             
             return faces
     except Exception as e:
@@ -1878,33 +2299,38 @@ async def get_media_faces(media_id: int):
 
 
 @app.get("/api/media/face-crop/{media_id}")
-async def serve_face_crop(media_id: int):
+async def serve_face_crop(media_id: int, request: Request = None):
     """Serve a cropped face image from a media file using its bounding box."""
     from PIL import Image
     
-    with get_db() as conn:
-        # Get the media file path
-        cur = conn.execute("SELECT path FROM media_files WHERE id = ?", (media_id,))
+    with get_db(readonly=True) as conn:
+        cur = conn.execute(FACE_CROP_QUERY, (media_id,))
         row = cur.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Media not found")
         
-        file_path = row[0]
+        file_path, bbox_json = row
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="File not found on disk")
         
-        # Get the face bbox for this media
-        cur = conn.execute("SELECT bbox FROM face_embeddings WHERE media_id = ? LIMIT 1", (media_id,))
-        bbox_row = cur.fetchone()
-        if not bbox_row or not bbox_row[0]:
+        if not bbox_json:
             # No face found, serve thumbnail instead
-            return await serve_thumbnail(media_id, size=300)
+            return await serve_thumbnail(media_id, size=300, request=request)
+        
+        # The crop depends on the source file and the stored bbox
+        source_mtime = os.path.getmtime(file_path)
+        headers = _validator_headers(
+            f'W/"face-{media_id}-{int(source_mtime)}-{zlib.crc32(bbox_json.encode()):08x}"', source_mtime
+        )
+        not_modified = _not_modified(request, headers, source_mtime)
+        if not_modified:
+            return not_modified
         
         try:
-            bbox = json.loads(bbox_row[0])
+            bbox = json.loads(bbox_json)
             if not bbox or len(bbox) < 4:
                 # Invalid bbox, serve thumbnail instead
-                return await serve_thumbnail(media_id, size=300)
+                return await serve_thumbnail(media_id, size=300, request=request)
             
             # Open image and crop to face
             img = Image.open(file_path)
@@ -1944,17 +2370,42 @@ async def serve_face_crop(media_id: int):
             # Resize to 256x256 for consistent face thumbnails
             cropped.thumbnail((256, 256), Image.Resampling.LANCZOS)
             
-            # Return as in-memory JPEG
+            # Stream the in-memory JPEG (FileResponse only accepts paths)
             from io import BytesIO
             img_bytes = BytesIO()
             cropped.save(img_bytes, format='JPEG', quality=85, optimize=True)
             img_bytes.seek(0)
             
-            return FileResponse(img_bytes, media_type="image/jpeg")
+            return StreamingResponse(_iter_bytesio(img_bytes), media_type="image/jpeg", headers=headers)
         except Exception as e:
             print(f"[FACE_CROP] Failed to crop face for media {media_id}: {str(e)}")
             # Fallback: serve thumbnail
-            return await serve_thumbnail(media_id, size=300)
+            return await serve_thumbnail(media_id, size=300, request=request)
+
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_image_size(file_path: str):
+    """Return (width, height) of an image, or (None, None) if it can't be opened."""
+    from PIL import Image
+    try:
+        with Image.open(file_path) as img:
+            return img.size
+    except:
+        return None, None
+
+
+def _make_upload_thumbnail(file_path: str, thumb_path: str) -> bool:
+    """Write a 300px JPEG thumbnail for an uploaded image. Returns False on failure."""
+    from PIL import Image
+    try:
+        with Image.open(file_path) as img:
+            img.thumbnail((300, 300), Image.Resampling.LANCZOS)
+            img.save(thumb_path, 'JPEG', quality=85)
+        return True
+    except:
+        return False
 
 
 @app.post("/api/media/upload")
@@ -1966,7 +2417,6 @@ async def upload_media_file(file: UploadFile = File(...)):
     check_read_only()  # Prevent uploads in demo mode
     import tempfile
     import shutil
-    from PIL import Image
     
     try:
         # Validate file type
@@ -1983,24 +2433,16 @@ async def upload_media_file(file: UploadFile = File(...)):
         file_ext = os.path.splitext(file.filename)[1] or '.jpg'
         file_path = os.path.join(upload_dir, f"uploaded_{timestamp}{file_ext}")
         
-        # Write file to disk
+        # Stream the upload to disk in chunks; writes run off the event loop
         with open(file_path, 'wb') as f:
-            content = await file.read()
-            f.write(content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
         
         # Extract basic image info
-        try:
-            img = Image.open(file_path)
-            width, height = img.size
-        except:
-            width = height = None
+        width, height = await asyncio.to_thread(_read_image_size, file_path)
         
         # Process file and add to database
-        result = await process_single(
-            file_path, 
-            is_symlink=False, 
-            root_path=upload_dir
-        )
+        await process_single(file_path)
         
         # Get the media ID that was created
         with get_db() as conn:
@@ -2020,11 +2462,7 @@ async def upload_media_file(file: UploadFile = File(...)):
         thumb_path = os.path.join(thumb_dir, f'{media_id}.jpg')
         os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
         
-        try:
-            img = Image.open(file_path)
-            img.thumbnail((300, 300), Image.Resampling.LANCZOS)
-            img.save(thumb_path, 'JPEG', quality=85)
-        except:
+        if not await asyncio.to_thread(_make_upload_thumbnail, file_path, thumb_path):
             thumb_path = None
         
         return {
@@ -2045,7 +2483,187 @@ async def upload_media_file(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
-@app.get("/api/search")
+# Pre-normalized CLIP embedding matrix per silo for the no-FAISS search fallback,
+# rebuilt when the silo DB changes (so in-place clip_embedding rewrites are picked up too)
+_clip_matrix_cache = {}
+
+
+def _load_clip_matrix(conn, silo_name: str, dim: int):
+    """Return (ids, matrix) where matrix is an (N, dim) float32 array of L2-normalized CLIP embeddings."""
+    key = _db_version(get_db_path()) + (dim,)
+    cached = _clip_matrix_cache.get(silo_name)
+    if cached and cached["key"] == key:
+        return cached["ids"], cached["matrix"]
+    
+    rows = conn.execute(
+        "SELECT id, clip_embedding FROM media_files WHERE clip_embedding IS NOT NULL ORDER BY id"
+    ).fetchall()
+    keep, matrix = blobs_to_matrix([blob for _, blob in rows], dim)
+    ids = np.fromiter((rows[pos][0] for pos in keep), dtype=np.int64, count=len(keep))
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+    
+    _clip_matrix_cache[silo_name] = {"key": key, "ids": ids, "matrix": matrix}
+    print(f"[SEARCH] Loaded {len(ids)} CLIP embeddings into the fallback search matrix")
+    return ids, matrix
+
+
+# Keyword phase of /api/search: FTS5 trigram index when available, else a LIKE scan.
+# Trigrams can't match queries shorter than three characters, so those also use LIKE.
+SEARCH_FTS_MIN_LEN = 3
+KEYWORD_SEARCH_FTS_QUERY = """
+    SELECT id, path, type, date_taken, size, width, height, camera, lens, rotation
+    FROM media_files
+    WHERE id IN (SELECT rowid FROM media_search WHERE media_search MATCH ?)
+    ORDER BY date_taken DESC
+"""
+KEYWORD_SEARCH_LIKE_QUERY = """
+    SELECT DISTINCT media_files.id, media_files.path, media_files.type, media_files.date_taken,
+           media_files.size, media_files.width, media_files.height, media_files.camera, media_files.lens, media_files.rotation
+    FROM media_files
+    LEFT JOIN ocr_results ON ocr_results.media_id = media_files.id
+    LEFT JOIN object_detections od ON od.media_id = media_files.id
+    WHERE media_files.path LIKE ?
+       OR media_files.objects LIKE ?
+       OR media_files.animals LIKE ?
+       OR media_files.text_content LIKE ?
+       OR ocr_results.text LIKE ?
+       OR od.class_name LIKE ?
+    ORDER BY media_files.date_taken DESC
+"""
+
+# Databases known to have the media_search FTS table (created by init_db when SQLite
+# supports it). Only positives are cached so a later init_db is picked up.
+_search_fts_dbs = set()
+
+
+def _fts_phrase(text: str) -> str:
+    """Quote text as a single FTS5 phrase (substring match under the trigram tokenizer)."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _has_search_fts(conn) -> bool:
+    from .db import get_db_path
+    db_path = get_db_path()
+    if db_path in _search_fts_dbs:
+        return True
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'media_search'").fetchone():
+        _search_fts_dbs.add(db_path)
+        return True
+    return False
+
+
+# Media columns of a search result row, fetched by id for the semantic and people phases.
+# Ids (and file types) are bound as one JSON array, so the SQL text is the same for any
+# number of ids and the prepared statement is reused from the connection's cache.
+SEARCH_ROWS_QUERY = "SELECT id, path, type, date_taken, size, width, height, camera, lens, rotation FROM media_files WHERE id IN (SELECT value FROM json_each(?))"
+SEARCH_ROWS_TYPE_FILTER = " AND lower(type) IN (SELECT value FROM json_each(?))"
+
+SEARCH_CACHE_MAX_ENTRIES = 256
+SEARCH_CACHE_TTL = 300  # seconds
+SEARCH_CACHE_MIN_MS = 50  # Only cache searches that were slower than this
+
+# (db_path, version, q, confidence, file types) -> (expires_at, ranked_results, keyword_rows).
+# Whole result lists are cached so every page of a query is served from one entry.
+_search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _db_version(db_path: str) -> tuple:
+    """Data version token for a silo DB: stat of the file and its WAL, which every commit
+    touches, so indexing, moves, deletes, retraining and feedback all change it."""
+    version = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            st = os.stat(path)
+            version.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+def _search_cache_key(q: str, confidence: float, file_type_filter: frozenset) -> tuple:
+    """Cache key including a data version: the DB version plus people.json."""
+    db_path = get_db_path()
+    return (db_path, _db_version(db_path) + (_labels_file_key(),), q, confidence, file_type_filter)
+
+
+def _search_cache_get(key: tuple):
+    entry = _search_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.time():
+        _search_cache.pop(key, None)
+        return None
+    _search_cache.move_to_end(key)
+    return entry[1], entry[2]
+
+
+def _search_cache_put(key: tuple, ranked_results: list, keyword_rows: list) -> None:
+    _search_cache[key] = (time.time() + SEARCH_CACHE_TTL, ranked_results, keyword_rows)
+    _search_cache.move_to_end(key)
+    while len(_search_cache) > SEARCH_CACHE_MAX_ENTRIES:
+        _search_cache.popitem(last=False)
+
+
+def _search_page(q: str, ranked_results: list, keyword_rows: list, offset: int, limit: int) -> dict:
+    """Paginate ranked results followed by keyword rows, building dicts only for this page."""
+    paginated_results = ranked_results[offset : offset + limit]
+    
+    # Fill the rest of the page from the keyword rows, materializing only that slice
+    keyword_start = max(0, offset - len(ranked_results))
+    keyword_count = limit - len(paginated_results)
+    if keyword_count > 0:
+        paginated_results += [
+            _row_to_result(row, 0.0, False)
+            for row in keyword_rows[keyword_start : keyword_start + keyword_count]
+        ]
+
+    result_count = len(paginated_results)
+    total_count = len(ranked_results) + len(keyword_rows)
+    logger.debug("[SEARCH] Query '%s': %d results (offset %s, total %d)", q, result_count, offset, total_count)
+    
+    # Return results with pagination metadata
+    return {
+        "results": paginated_results,
+        "total": total_count,
+        "offset": offset,
+        "limit": limit,
+        "has_more": (offset + limit) < total_count,
+    }
+
+
+def _fetch_search_rows(conn, media_ids, file_type_filter: frozenset = frozenset()) -> dict:
+    """Fetch search rows by id, keeping only allowed file types. Returns {id: row}."""
+    if not media_ids:
+        return {}
+    query = SEARCH_ROWS_QUERY
+    params = [json.dumps([int(mid) for mid in media_ids])]
+    if file_type_filter:
+        query += SEARCH_ROWS_TYPE_FILTER
+        params.append(json.dumps(sorted(file_type_filter)))
+    return {row[0]: row for row in conn.execute(query, params)}
+
+
+def _row_to_result(row, score: float, is_confirmed: bool) -> dict:
+    """Search result dict for a `SEARCH_ROWS_QUERY`-shaped media row."""
+    mid, path, ftype, date_taken, size, width, height, camera, lens, rotation = row
+    return {
+        "id": mid,
+        "path": path,
+        "type": ftype,
+        "date_taken": date_taken,
+        "size": size,
+        "width": width,
+        "height": height,
+        "camera": camera,
+        "lens": lens,
+        "score": score,
+        "similarity": score,
+        "confirmed_for_query": is_confirmed,
+        "rotation": rotation or 0,
+    }
+
+
+@app.get("/api/search", response_class=FastJSONResponse)
 async def search_media(
     q: str = Query(""),
     confidence: float = 0.15,
@@ -2081,335 +2699,241 @@ async def search_media(
             silo_name = 'default'
     
     _set_processing_silo(silo_name)
-    print(f"[SEARCH] Silo: {silo_name}, Query: '{q}', confidence threshold: {confidence}, offset: {offset}, limit: {actual_limit}, file_types: '{file_types}'")
+    logger.debug("[SEARCH] Silo: %s, Query: '%s', confidence threshold: %s, offset: %s, limit: %s, file_types: '%s'",
+                 silo_name, q, confidence, offset, actual_limit, file_types)
     if not q.strip():
-        print("[SEARCH] Empty query string, returning []")
+        logger.debug("[SEARCH] Empty query string, returning []")
         return []
 
-    # Parse file_types filter
-    file_type_filter = set()
+    # Parse file_types filter once; membership is tested for every candidate row
+    file_type_filter = frozenset()
     if file_types.strip():
-        file_type_filter = {ft.strip().lower() for ft in file_types.split(',')}
-        print(f"[SEARCH] File type filter: {file_type_filter}")
+        file_type_filter = frozenset(ft.strip().lower() for ft in file_types.split(',') if ft.strip())
+        logger.debug("[SEARCH] File type filter: %s", file_type_filter)
+
+    # Repeat searches (and further pages) against unchanged data skip all phases
+    cache_key = _search_cache_key(q, confidence, file_type_filter)
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        return FastJSONResponse(_search_page(q, *cached, offset, actual_limit))
+    search_started = time.perf_counter()
 
     # Load query-specific feedback from search_feedback table
     # This ensures confirmations only apply to the query they were made for
-    with get_db() as conn:
-        # Get IDs confirmed for THIS specific query
-        confirmed_cur = conn.execute(
-            "SELECT DISTINCT media_id FROM search_feedback WHERE query = ? AND feedback = 'confirmed'",
+    with get_db(readonly=True) as conn:
+        # Confirmed and rejected IDs for THIS specific query in one round-trip
+        feedback_rows = conn.execute(
+            "SELECT media_id, feedback FROM search_feedback WHERE query = ? AND feedback IN ('confirmed', 'rejected')",
             (q,),
-        )
-        confirmed_ids = {row[0] for row in confirmed_cur.fetchall()}
-
-        # Get IDs rejected for THIS specific query
-        rejected_cur = conn.execute(
-            "SELECT DISTINCT media_id FROM search_feedback WHERE query = ? AND feedback = 'rejected'",
-            (q,),
-        )
-        rejected_ids = {row[0] for row in rejected_cur.fetchall()}
+        ).fetchall()
+    confirmed_ids = {media_id for media_id, feedback in feedback_rows if feedback == 'confirmed'}
+    rejected_ids = {media_id for media_id, feedback in feedback_rows if feedback == 'rejected'}
 
-    # Load rotation data - no longer needed from cache since reading from database
-    query_vec = get_text_embedding(q)
-    
-    # If CLIP model failed to load (e.g. OOM on low-memory deployments), return error
-    if query_vec is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Search temporarily unavailable - unable to encode query text"
-        )
-    
-    confirmed_results = []
-    semantic_results = []
-    keyword_results = []
-    seen_ids = set()
-    seen_paths = set()
+    # The three phases are independent lookups, so they run concurrently in worker threads
+    # (each with its own pooled connection). Cross-phase dedup happens afterwards in the
+    # original priority order: semantic, then keyword, then people.
 
     # PHASE 1: CLIP-based semantic search
-    if query_vec:
+    def semantic_phase():
+        """Returns (confirmed_results, semantic_results, seen_ids)."""
+        confirmed_results = []
+        semantic_results = []
+        seen_ids = set()
+        seen_paths = set()
+        
+        # Load rotation data - no longer needed from cache since reading from database
+        query_vec = get_text_embedding(q)
+        
+        # If CLIP model failed to load (e.g. OOM on low-memory deployments), return error
+        if query_vec is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Search temporarily unavailable - unable to encode query text"
+            )
+        if not query_vec:
+            return confirmed_results, semantic_results, seen_ids
+        
         index, ids = load_index(len(query_vec), silo_name=silo_name)
         
         # If FAISS not available, do manual cosine similarity search from database
         if index is None:
-            print("[SEARCH] FAISS not available, using database cosine similarity")
-            with get_db() as conn:
-                # Fetch all embeddings from database
-                cur = conn.execute(
-                    "SELECT id, path, type, date_taken, size, width, height, camera, lens, rotation, embedding FROM media_files WHERE embedding IS NOT NULL"
-                )
-                rows = cur.fetchall()
-                
-                # Compute cosine similarity manually
-                query_array = np.array(query_vec, dtype=np.float32)
-                query_norm = query_array / (np.linalg.norm(query_array) + 1e-12)
+            logger.debug("[SEARCH] FAISS not available, using database cosine similarity")
+            query_array = np.asarray(query_vec, dtype=np.float32)
+            query_norm = query_array / (np.linalg.norm(query_array) + 1e-12)
+            
+            with get_db(readonly=True) as conn:
+                clip_ids, clip_matrix = _load_clip_matrix(conn, silo_name, len(query_vec))
                 
+                # Score every pre-normalized row in one pass (numba kernel or matmul), then top-k
                 scores = []
-                for row in rows:
-                    mid = row[0]
-                    embedding_blob = row[10]
-                    if embedding_blob:
-                        # Deserialize embedding
-                        import pickle
-                        embedding = pickle.loads(embedding_blob)
-                        emb_array = np.array(embedding, dtype=np.float32)
-                        emb_norm = emb_array / (np.linalg.norm(emb_array) + 1e-12)
-                        
-                        # Cosine similarity
-                        similarity = np.dot(query_norm, emb_norm)
-                        scores.append((mid, float(similarity), row))
+                if len(clip_ids):
+                    top, top_scores = cosine_top_k(clip_matrix, query_norm, len(ids) if ids else 100)
+                    
+                    # Drop rejected and low-scoring ids before fetching rows
+                    candidates = [
+                        (mid, float(score))
+                        for mid, score in zip(map(int, clip_ids[top]), top_scores)
+                        if score >= confidence and mid not in rejected_ids
+                    ]
+                    rows_map = _fetch_search_rows(conn, [mid for mid, _ in candidates], file_type_filter)
+                    scores = [(mid, score, rows_map[mid]) for mid, score in candidates if mid in rows_map]
+            
+            for mid, score, row in scores:
+                if mid in seen_ids:
+                    continue
+                seen_ids.add(mid)
                 
-                # Sort by similarity descending
-                scores.sort(key=lambda x: x[1], reverse=True)
+                path = row[1]
+                if path in seen_paths:
+                    continue
+                seen_paths.add(path)
                 
-                # Take top results
-                for mid, score, row in scores[:len(ids) if ids else 100]:
-                    # Skip if rejected for THIS query
-                    if mid in rejected_ids:
-                        continue
-                    
-                    if score < confidence:
-                        continue
-                    
-                    if mid in seen_ids:
-                        continue
-                    seen_ids.add(mid)
-                    
-                    path = row[1]
-                    if path in seen_paths:
-                        continue
-                    seen_paths.add(path)
-                    
-                    result = {
-                        "id": mid,
-                        "path": path,
-                        "type": row[2],
-                        "date_taken": row[3],
-                        "size": row[4],
-                        "width": row[5],
-                        "height": row[6],
-                        "camera": row[7],
-                        "lens": row[8],
-                        "rotation": row[9] or 0,
-                        "score": score,
-                        "confirmed": mid in confirmed_ids,
-                    }
-                    
-                    if mid in confirmed_ids:
-                        confirmed_results.append(result)
-                    else:
-                        semantic_results.append(result)
+                if mid in confirmed_ids:
+                    confirmed_results.append(_row_to_result(row, score, True))
+                else:
+                    semantic_results.append(_row_to_result(row, score, False))
         else:
             # Use FAISS index
             results = search(index, ids, query_vec, top_k=len(ids))
+            # Drop rejected and low-scoring ids before fetching rows
+            results = [(mid, score) for mid, score in results if score >= confidence and mid not in rejected_ids]
             if results:
-                id_set = tuple(r[0] for r in results)
-                with get_db() as conn:
-                    placeholders = ','.join('?' * len(id_set))
-                    cur = conn.execute(
-                        f"SELECT id, path, type, date_taken, size, width, height, camera, lens, rotation FROM media_files WHERE id IN ({placeholders})",
-                        id_set,
-                    )
-                    rows = cur.fetchall()
-                    rows_map = {r[0]: r for r in rows}
+                with get_db(readonly=True) as conn:
+                    rows_map = _fetch_search_rows(conn, [mid for mid, _ in results], file_type_filter)
                 
                 for mid, score in results:
-                    # Skip if rejected for THIS query
-                    if mid in rejected_ids:
-                        continue
-                    
-                    if score < confidence:
-                        continue
-                    
                     if mid in seen_ids:
                         continue
                     
                     if mid in rows_map:
-                        r = rows_map[mid]
-                        is_confirmed = mid in confirmed_ids
-                        result_obj = {
-                            "id": r[0],
-                            "path": r[1],
-                            "type": r[2],
-                            "date_taken": r[3],
-                            "size": r[4],
-                            "width": r[5],
-                            "height": r[6],
-                            "camera": r[7],
-                            "lens": r[8],
-                            "score": score,
-                            "similarity": score,
-                            "confirmed_for_query": is_confirmed,
-                            "rotation": r[9] or 0,
-                        }
-                        
-                        # Apply file type filter
-                        if file_type_filter and r[2].lower() not in file_type_filter:
-                            continue
+                        row = rows_map[mid]
                         
                         # Separate confirmed results to show first
-                        if is_confirmed:
-                            confirmed_results.append(result_obj)
+                        if mid in confirmed_ids:
+                            confirmed_results.append(_row_to_result(row, score, True))
                         else:
-                            semantic_results.append(result_obj)
+                            semantic_results.append(_row_to_result(row, score, False))
                         
                         seen_ids.add(mid)
+        
+        return confirmed_results, semantic_results, seen_ids
 
     # PHASE 2: Fallback / hybrid search via SQL (objects, OCR, filename, document text content)
-    like_term = f"%{q}%"
-    with get_db() as conn:
-        cur = conn.execute(
-            """
-            SELECT DISTINCT media_files.id, media_files.path, media_files.type, media_files.date_taken,
-                   media_files.size, media_files.width, media_files.height, media_files.camera, media_files.lens, media_files.rotation
-            FROM media_files
-            LEFT JOIN ocr_results ON ocr_results.media_id = media_files.id
-            LEFT JOIN object_detections od ON od.media_id = media_files.id
-            WHERE media_files.path LIKE ?
-               OR media_files.objects LIKE ?
-               OR media_files.animals LIKE ?
-               OR media_files.text_content LIKE ?
-               OR ocr_results.text LIKE ?
-               OR od.class_name LIKE ?
-            ORDER BY media_files.date_taken DESC
-            """,
-            (like_term, like_term, like_term, like_term, like_term, like_term),
-        )
-        rows = cur.fetchall()
+    def keyword_phase():
+        """Returns matching rows that are not rejected and pass the file type filter."""
+        with get_db(readonly=True) as conn:
+            rows = None
+            if len(q) >= SEARCH_FTS_MIN_LEN and _has_search_fts(conn):
+                # Trigram index lookup - same substring semantics as the LIKE scan below
+                try:
+                    rows = conn.execute(KEYWORD_SEARCH_FTS_QUERY, (_fts_phrase(q),)).fetchall()
+                except sqlite3.OperationalError as e:
+                    # Database was recreated without the index (e.g. nuked silo) - rescan next time
+                    print(f"[SEARCH] Full-text index unusable, falling back to LIKE: {e}")
+                    _search_fts_dbs.clear()
+            if rows is None:
+                like_term = f"%{q}%"
+                rows = conn.execute(KEYWORD_SEARCH_LIKE_QUERY, (like_term,) * 6).fetchall()
+        
+        if file_type_filter:
+            return [row for row in rows if row[0] not in rejected_ids and row[2].lower() in file_type_filter]
+        return [row for row in rows if row[0] not in rejected_ids]
 
-    for r in rows:
-        if r[0] in rejected_ids:
-            continue
-        if r[0] in seen_ids:
-            continue
-        
-        # Apply file type filter
-        if file_type_filter and r[2].lower() not in file_type_filter:
+    # PHASE 3: Search by cluster names - check if query matches any named people/clusters
+    def people_phase():
+        """Returns media rows of matched clusters, in cluster order."""
+        try:
+            from .face_cluster import find_clusters_by_label
+            
+            # Query is a case-insensitive substring of a user-assigned label (indexed lookup);
+            # clusters are only loaded when some label actually matches
+            matched_cluster_ids = set(find_clusters_by_label(q))
+            logger.debug("[SEARCH] PHASE 3 - People search for '%s' (%d labeled clusters match)", q, len(matched_cluster_ids))
+            clusters, photo_ids_by_cluster = _get_cached_clusters() if matched_cluster_ids else ([], {})
+            
+            # Collect every matched cluster's photo ids first, keeping cluster order
+            matched_photo_ids = []
+            for cluster in clusters:
+                cluster_id = cluster.get('id', '')
+                
+                if cluster_id in matched_cluster_ids:
+                    # Get all photos in this cluster (from embeddings)
+                    # This is the primary source - all faces detected in this cluster's photos
+                    embedding_photo_ids = photo_ids_by_cluster.get(cluster_id)
+                    if embedding_photo_ids is None:
+                        # Clusters from the on-disk cache aren't pre-aggregated
+                        embedding_photo_ids = frozenset(p.get('media_id') for p in cluster.get('photos', []) if p.get('media_id'))
+                    
+                    # Get confirmed_photos if any were manually added
+                    confirmed_photos = set(cluster.get('confirmed_photos', []))
+                    
+                    # Combine all photos from the cluster
+                    all_photo_ids = embedding_photo_ids | confirmed_photos
+                    logger.debug("[SEARCH]   MATCH! Cluster '%s' (%s): %d embeddings + %d confirmed = %d photos",
+                                 cluster.get('label'), cluster_id, len(embedding_photo_ids), len(confirmed_photos), len(all_photo_ids))
+                    matched_photo_ids.append(sorted(all_photo_ids))
+            
+            # One query for the union of all matched clusters' photos
+            union_ids = set().union(*matched_photo_ids)
+            if not union_ids:
+                return []
+            with get_db(readonly=True) as conn:
+                cur = conn.execute(
+                    SEARCH_ROWS_QUERY,
+                    (json.dumps([int(mid) for mid in union_ids]),)
+                )
+                rows_map = {row[0]: row for row in cur.fetchall()}
+            logger.debug("[SEARCH]     Query found %d media files from %d IDs", len(rows_map), len(union_ids))
+            
+            return [rows_map[mid] for photo_ids in matched_photo_ids for mid in photo_ids if mid in rows_map]
+        except Exception as e:
+            print(f"[SEARCH] Error in people search phase: {e}")
+            import traceback
+            traceback.print_exc()
+            return []
+
+    (confirmed_results, semantic_results, seen_ids), keyword_rows, people_rows = await asyncio.gather(
+        asyncio.to_thread(semantic_phase),
+        asyncio.to_thread(keyword_phase),
+        asyncio.to_thread(people_phase),
+    )
+
+    # Merge keyword matches not already found semantically
+    keyword_results = []
+    for row in keyword_rows:
+        mid = row[0]
+        if mid in seen_ids:
             continue
         
-        is_confirmed = r[0] in confirmed_ids
-        result_obj = {
-            "id": r[0],
-            "path": r[1],
-            "type": r[2],
-            "date_taken": r[3],
-            "size": r[4],
-            "width": r[5],
-            "height": r[6],
-            "camera": r[7],
-            "lens": r[8],
-            "score": 0.0,
-            "similarity": 0.0,
-            "confirmed_for_query": is_confirmed,
-            "rotation": r[9] or 0,
-        }
-        
-        # Separate confirmed results to show first
-        if is_confirmed:
-            confirmed_results.append(result_obj)
+        # Separate confirmed results to show first. Unconfirmed keyword matches sort last,
+        # so they stay raw rows and only the ones on the requested page become dicts.
+        if mid in confirmed_ids:
+            confirmed_results.append(_row_to_result(row, 0.0, True))
         else:
-            keyword_results.append(result_obj)
+            keyword_results.append(row)
         
-        seen_ids.add(r[0])
+        seen_ids.add(mid)
 
-    # PHASE 3: Search by cluster names - check if query matches any named people/clusters
+    # Merge people matches not already found by the other phases
     people_results = []
-    try:
-        from .face_cluster import load_faces_from_db, cluster_faces, apply_labels
-        
-        # Get clustered faces with labels applied (gives us cluster names)
-        faces = load_faces_from_db()
-        clusters = cluster_faces(faces)
-        clusters = apply_labels(clusters)
-        
-        query_lower = q.lower().strip()
-        print(f"[SEARCH] PHASE 3 - People search for '{q}' (checking {len(clusters)} clusters)")
-        
-        # Debug: Print all cluster names for comparison
-        for i, c in enumerate(clusters[:5]):  # First 5 clusters
-            print(f"[SEARCH]   Cluster {i}: label='{c.get('label', 'UNNAMED')}' id={c.get('id', 'NO_ID')} photos={len(c.get('photos', []))}")
+    for row in people_rows:
+        mid = row[0]
+        if mid in seen_ids:
+            continue
         
-        # Check if query matches any cluster label (user-assigned name)
-        for cluster in clusters:
-            cluster_label = cluster.get('label', '').lower()
-            cluster_id = cluster.get('id', '')
-            
-            # Match if query is substring of cluster label (case-insensitive)
-            if cluster_label and query_lower and query_lower in cluster_label:
-                print(f"[SEARCH]   MATCH! Cluster '{cluster.get('label')}' ({cluster_id}) matches query")
-                
-                # Get all photos in this cluster (from embeddings)
-                # This is the primary source - all faces detected in this cluster's photos
-                embedding_photo_ids = set(p.get('media_id') for p in cluster.get('photos', []) if p.get('media_id'))
-                
-                # Get confirmed_photos if any were manually added
-                confirmed_photos = set(cluster.get('confirmed_photos', []))
-                
-                # Combine all photos from the cluster
-                all_photo_ids = embedding_photo_ids | confirmed_photos
-                
-                print(f"[SEARCH]     Cluster has {len(cluster.get('photos', []))} total entries in photos array")
-                print(f"[SEARCH]     Extracted IDs: {len(embedding_photo_ids)} embeddings + {len(confirmed_photos)} confirmed = {len(all_photo_ids)} total")
-                
-                # Get media file data for these photos
-                with get_db() as conn:
-                    if all_photo_ids:
-                        placeholders = ','.join('?' * len(all_photo_ids))
-                        cur = conn.execute(
-                            f"SELECT id, path, type, date_taken, size, width, height, camera, lens, rotation FROM media_files WHERE id IN ({placeholders})",
-                            tuple(all_photo_ids)
-                        )
-                        rows = cur.fetchall()
-                        
-                        print(f"[SEARCH]     Query found {len(rows)} media files from {len(all_photo_ids)} IDs")
-                        if rows:
-                            print(f"[SEARCH]     First result: id={rows[0][0]} path={rows[0][1]}")
-                        
-                        for row in rows:
-                            if row[0] in seen_ids:
-                                print(f"[SEARCH]     Skipping {row[0]} - already seen")
-                                continue
-                            
-                            result_obj = {
-                                "id": row[0],
-                                "path": row[1],
-                                "type": row[2],
-                                "date_taken": row[3],
-                                "size": row[4],
-                                "width": row[5],
-                                "height": row[6],
-                                "camera": row[7],
-                                "lens": row[8],
-                                "score": 0.95,  # High score for exact cluster name match
-                                "similarity": 0.95,
-                                "confirmed_for_query": True,
-                                "rotation": row[9] or 0,
-                            }
-                            people_results.append(result_obj)
-                            seen_ids.add(row[0])
-    except Exception as e:
-        print(f"[SEARCH] Error in people search phase: {e}")
-        import traceback
-        traceback.print_exc()
+        # High score for exact cluster name match
+        people_results.append(_row_to_result(row, 0.95, True))
+        seen_ids.add(mid)
 
     # PHASE 4: Reorder - confirmed first, then people (cluster matches), then semantic, then keywords
     # People/cluster matches should appear before semantic results so named clusters are prioritized
-    all_results = confirmed_results + people_results + semantic_results + keyword_results
-    paginated_results = all_results[offset : offset + actual_limit]
-
-    result_count = len(paginated_results)
-    total_count = len(all_results)
-    print(
-        f"[SEARCH] Query '{q}': {result_count} results (offset {offset}, total {total_count})"
-    )
+    ranked_results = confirmed_results + people_results + semantic_results
     
-    # Return results with pagination metadata
-    return {
-        "results": paginated_results,
-        "total": total_count,
-        "offset": offset,
-        "limit": actual_limit,
-        "has_more": (offset + actual_limit) < total_count,
-    }
+    if (time.perf_counter() - search_started) * 1000 >= SEARCH_CACHE_MIN_MS:
+        _search_cache_put(cache_key, ranked_results, keyword_results)
+    
+    # Already JSON-native - serialize directly, skipping FastAPI's jsonable_encoder pass
+    return FastJSONResponse(_search_page(q, ranked_results, keyword_results, offset, actual_limit))
 
 
 @app.get("/api/search/file-types")
@@ -2429,7 +2953,6 @@ async def get_file_types():
 async def detect_faces_batch(limit: int = 100, silo_name: str = "bighouse"):
     """Detect and store faces for media files that don't have face data yet.
     Returns count of files processed and faces found."""
-    from .face_cluster import detect_faces
     from .indexer import to_blob
     
     global _face_clusters_cache
@@ -2452,44 +2975,53 @@ async def detect_faces_batch(limit: int = 100, silo_name: str = "bighouse"):
             (limit,)
         )
         rows = cur.fetchall()
-        
-        for media_id, path in rows:
-            try:
-                faces = detect_faces([path])
-                faces_json = json.dumps([
-                    {"bbox": f.bbox, "score": f.score}
-                    for f in faces
-                ])
-                
-                # Update faces JSON in media_files
-                conn.execute(
-                    "UPDATE media_files SET faces = ? WHERE id = ?",
-                    (faces_json, media_id)
-                )
-                
-                # Store embeddings in face_embeddings table
-                for face in faces:
-                    embedding_blob = to_blob(face.embedding)
-                    bbox_json = json.dumps(face.bbox)
-                    conn.execute(
-                        """INSERT OR REPLACE INTO face_embeddings 
-                           (media_id, embedding, bbox, confidence, created_at, updated_at)
-                           VALUES (?, ?, ?, ?, ?, ?)""",
-                        (media_id, embedding_blob, bbox_json, face.score, int(time.time()), int(time.time()))
-                    )
-                
-                conn.commit()
-                
-                processed += 1
-                faces_found += len(faces)
-            except Exception as e:
-                print(f"Error detecting faces in {path}: {e}")
-                continue
+    
+    # Detect everything first, then write the whole batch in one transaction (one fsync)
+    face_updates = []
+    face_inserts = []
+    now = int(time.time())
+    if rows:
+        # One batched detection call (models stay warm, per-image errors handled inside),
+        # off the event loop
+        try:
+            faces_per_image = await asyncio.to_thread(
+                detect_faces_by_image, [path for _, path in rows], 3
+            )
+        except Exception as e:
+            print(f"Error detecting faces in batch: {e}")
+            faces_per_image = []
+        
+        for (media_id, path), faces in zip(rows, faces_per_image):
+            faces_json = json.dumps([
+                {"bbox": f.bbox, "score": f.score}
+                for f in faces
+            ])
+            face_updates.append((faces_json, media_id))
+            face_inserts.extend(
+                (media_id, to_blob(face.embedding), json.dumps(face.bbox), face.score, now, now)
+                for face in faces
+            )
+            
+            processed += 1
+            faces_found += len(faces)
+    
+    if face_updates:
+        with get_db() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Update faces JSON in media_files
+            conn.executemany("UPDATE media_files SET faces = ? WHERE id = ?", face_updates)
+            # Store embeddings in face_embeddings table
+            conn.executemany(
+                """INSERT OR REPLACE INTO face_embeddings 
+                   (media_id, embedding, bbox, confidence, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                face_inserts
+            )
+            conn.commit()
     
     # Invalidate face clusters cache so new faces are clustered on next request
     if faces_found > 0:
-        _face_clusters_cache["data"] = None
-        _face_clusters_cache["timestamp"] = 0
+        _face_clusters_cache["key"] = None
         print(f"[FACE_DETECTION] Cleared face clusters cache after detecting {faces_found} new faces")
     
     return {
@@ -2511,8 +3043,7 @@ async def clear_face_clusters_cache(silo_name: Optional[str] = None):
             silo = SiloManager.get_active_silo()
             silo_name = silo.get("name") if silo else None
         
-        _face_clusters_cache["data"] = None
-        _face_clusters_cache["timestamp"] = 0
+        _face_clusters_cache["key"] = None
         print(f"[CACHE] Face clusters cache cleared for silo: {silo_name}")
         return {"status": "success", "message": "Face clusters cache cleared", "silo": silo_name}
     except Exception as e:
@@ -2534,9 +3065,7 @@ async def list_people():
     
     # Fallback: cluster on-demand if cache doesn't exist
     print(f"[PEOPLE] No cache found, clustering on-demand...")
-    faces = load_faces_from_db()
-    print(f"[PEOPLE] Loaded {len(faces)} faces from database")
-    clusters = cluster_faces(faces)
+    clusters = _get_face_clusters()
     print(f"[PEOPLE] Created {len(clusters)} clusters")
     clusters = apply_labels(clusters)
     
@@ -2959,58 +3488,98 @@ async def hide_animal(animal_id: str, request: HidePersonRequest = Body(...)):
         )
 
 
+# Detection columns plus the media path, joined instead of looked up per row
+UNCERTAIN_DETECTION_QUERY = """
+    SELECT ud.id, ud.media_id, ud.detection_type, ud.class_name, ud.confidence, ud.bbox,
+           ud.reviewed, ud.approved, ud.user_label, m.path AS media_path
+    FROM uncertain_detections ud
+    LEFT JOIN media_files m ON m.id = ud.media_id
+"""
+
+# One UNCERTAIN_DETECTION_QUERY row as an API JSON object, assembled by SQLite.
+# bbox is stored as JSON text and embedded as-is instead of parsed and re-serialized.
+_UNCERTAIN_DETECTION_JSON_TEMPLATE = """json_object(
+    'id', id, 'media_id', media_id, 'detection_type', detection_type, 'class_name', class_name,
+    'confidence', confidence,
+    'bbox', CASE WHEN bbox IS NULL OR bbox = '' THEN NULL ELSE json(bbox) END,
+    'reviewed', json(CASE WHEN reviewed THEN 'true' ELSE 'false' END),
+    'approved', CASE WHEN approved IS NULL THEN NULL WHEN approved THEN json('true') ELSE json('false') END,
+    'user_label', user_label, 'media_path', {media_path}
+)"""
+UNCERTAIN_DETECTION_JSON = _UNCERTAIN_DETECTION_JSON_TEMPLATE.format(media_path="media_path")
+
+# Review update that hands back the updated row as API JSON in the same statement
+REVIEW_DETECTION_UPDATE = """
+    UPDATE uncertain_detections 
+    SET reviewed = 1, approved = ?, user_label = ?, updated_at = ?
+    WHERE id = ?
+    RETURNING """ + _UNCERTAIN_DETECTION_JSON_TEMPLATE.format(
+    media_path="(SELECT path FROM media_files WHERE media_files.id = uncertain_detections.media_id)"
+)
+
+
+@lru_cache(maxsize=None)
+def _uncertain_list_query(by_type: bool, keyset: bool = False) -> str:
+    """Review list SQL for one filter combination, built once so every request sends
+    identical text and hits the pooled connection's prepared-statement cache.
+    
+    Params: reviewed, [detection_type,] [after_confidence, after_id,] limit, [offset].
+    With keyset the page starts after the (confidence, id) cursor, so SQLite seeks
+    straight into the review index instead of stepping over skipped rows.
+    """
+    query = UNCERTAIN_DETECTION_QUERY + " WHERE ud.reviewed = ?"
+    if by_type:
+        query += " AND ud.detection_type = ?"
+    if keyset:
+        query += " AND (ud.confidence, ud.id) > (?, ?)"
+    query += " ORDER BY ud.confidence ASC, ud.id ASC LIMIT ?"
+    if not keyset:
+        query += " OFFSET ?"
+    # SQLite assembles the response body (json_group_array keeps the page order) and
+    # also returns the row count plus the last row's (confidence, id) for the next cursor
+    last = "FROM page ORDER BY confidence DESC, id DESC LIMIT 1"
+    return (
+        f"WITH page AS MATERIALIZED ({query}) "
+        f"SELECT json_group_array({UNCERTAIN_DETECTION_JSON}), count(*), "
+        f"(SELECT confidence {last}), (SELECT id {last}) FROM page"
+    )
+
+
 @app.get("/api/uncertain-detections")
 async def list_uncertain_detections(
     detection_type: Optional[str] = None,
     reviewed: Optional[bool] = None,
     limit: int = 50,
     offset: int = 0,
+    after_confidence: Optional[float] = None,
+    after_id: Optional[int] = None,
 ):
     """
     List uncertain detections that need user review.
     Users should confirm whether these detections are correct.
+    
+    Full pages carry an X-Next-Cursor: "<confidence>,<id>" header (the last item's
+    values); pass them back as after_confidence/after_id to fetch the next page by
+    cursor. offset is ignored when a cursor is given.
     """
-    with get_db() as conn:
-        query = "SELECT id, media_id, detection_type, class_name, confidence, bbox, reviewed, approved, user_label FROM uncertain_detections"
-        params = []
-        
-        if detection_type:
-            query += " AND detection_type = ?"
-            params.append(detection_type)
-        
-        if reviewed is not None:
-            query += " AND reviewed = ?"
-            params.append(1 if reviewed else 0)
-        else:
-            query += " AND reviewed = 0"  # Default: show unreviewed only
-        
-        query += " ORDER BY confidence ASC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        cur = conn.execute(query, params)
-        rows = cur.fetchall()
-        
-        result = []
-        for r in rows:
-            # Get media path
-            media_cur = conn.execute("SELECT path FROM media_files WHERE id = ?", (r[1],))
-            media_row = media_cur.fetchone()
-            media_path = media_row[0] if media_row else None
-            
-            bbox = json.loads(r[5]) if r[5] else None
-            result.append({
-                "id": r[0],
-                "media_id": r[1],
-                "detection_type": r[2],
-                "class_name": r[3],
-                "confidence": r[4],
-                "bbox": bbox,
-                "reviewed": bool(r[6]),
-                "approved": bool(r[7]) if r[7] is not None else None,
-                "user_label": r[8],
-                "media_path": media_path,
-            })
-        return result
+    keyset = after_confidence is not None and after_id is not None
+    params = [1 if reviewed else 0]  # Default: show unreviewed only
+    if detection_type:
+        params.append(detection_type)
+    if keyset:
+        params.extend([after_confidence, after_id])
+    params.append(limit)
+    if not keyset:
+        params.append(offset)
+    
+    with get_db(readonly=True) as conn:
+        body, count, last_confidence, last_id = conn.execute(
+            _uncertain_list_query(bool(detection_type), keyset), params
+        ).fetchone()
+    headers = {}
+    if count and count == limit and last_confidence is not None:
+        headers["X-Next-Cursor"] = f"{last_confidence!r},{last_id}"
+    return Response(content=body or "[]", media_type="application/json", headers=headers)
 
 
 @app.post("/api/uncertain-detections/{detection_id}/review")
@@ -3028,39 +3597,15 @@ async def review_detection(
         user_label: Optional custom label from the user
     """
     with get_db() as conn:
-        conn.execute(
-            """
-            UPDATE uncertain_detections 
-            SET reviewed = 1, approved = ?, user_label = ?, updated_at = ?
-            WHERE id = ?
-            """,
+        r = conn.execute(
+            REVIEW_DETECTION_UPDATE,
             (1 if approved else 0, user_label, int(time.time()), detection_id),
-        )
+        ).fetchone()
         conn.commit()
-        
-        # Get the updated detection
-        cur = conn.execute(
-            "SELECT id, media_id, detection_type, class_name, confidence, bbox, reviewed, approved, user_label FROM uncertain_detections WHERE id = ?",
-            (detection_id,),
-        )
-        r = cur.fetchone()
-        
-        media_cur = conn.execute("SELECT path FROM media_files WHERE id = ?", (r[1],))
-        media_row = media_cur.fetchone()
-        
-        bbox = json.loads(r[5]) if r[5] else None
-        return {
-            "id": r[0],
-            "media_id": r[1],
-            "detection_type": r[2],
-            "class_name": r[3],
-            "confidence": r[4],
-            "bbox": bbox,
-            "reviewed": bool(r[6]),
-            "approved": bool(r[7]) if r[7] is not None else None,
-            "user_label": r[8],
-            "media_path": media_row[0] if media_row else None,
-        }
+    if not r:
+        raise HTTPException(status_code=404, detail="Detection not found")
+    
+    return Response(content=r[0], media_type="application/json")
 
 
 @app.post("/api/uncertain-detections/batch-review")
@@ -3071,21 +3616,22 @@ async def batch_review_detections(detections: List[dict]):
     Args:
         detections: List of {id, approved, user_label}
     """
+    now = int(time.time())
+    params = [
+        (1 if det.get("approved") else 0, det.get("user_label"), now, det["id"])
+        for det in detections
+    ]
     with get_db() as conn:
-        for det in detections:
-            conn.execute(
-                """
-                UPDATE uncertain_detections 
-                SET reviewed = 1, approved = ?, user_label = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (
-                    1 if det.get("approved") else 0,
-                    det.get("user_label"),
-                    int(time.time()),
-                    det["id"],
-                ),
-            )
+        # One statement, one transaction (single fsync) for the whole batch
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            """
+            UPDATE uncertain_detections 
+            SET reviewed = 1, approved = ?, user_label = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            params,
+        )
         conn.commit()
     
     return {"reviewed": len(detections)}
@@ -3105,17 +3651,12 @@ async def count_uncertain_detections():
             """
         )
         result = {row[0]: row[1] for row in cur.fetchall()}
-        
-        # Get total unreviewed count
-        total_cur = conn.execute(
-            "SELECT COUNT(*) FROM uncertain_detections WHERE reviewed = 0"
-        )
-        total = total_cur.fetchone()[0]
-        
-        return {
-            "total": total,
-            "by_type": result,
-        }
+    
+    # Total unreviewed count is the sum of the per-type counts
+    return {
+        "total": sum(result.values()),
+        "by_type": result,
+    }
 
 
 # ============================================================================
@@ -3302,6 +3843,77 @@ async def search_animal_labels(q: str = Query(""), silo_name: str = Query(None))
 # Advanced Search & Filtering
 # ============================================================================
 
+def _db_fetchall(query: str, params=()) -> list:
+    """Run a read query on a pooled read-only connection; call via asyncio.to_thread."""
+    with get_db(readonly=True) as conn:
+        return conn.execute(query, params).fetchall()
+
+
+# (sort_by, descending) -> exact ORDER BY clause; doubles as the sortable-column allowlist
+ADVANCED_SEARCH_ORDER_BY = {
+    (column, descending): f" ORDER BY {column} {'DESC' if descending else 'ASC'}"
+    for column in ("date_taken", "size", "path")
+    for descending in (True, False)
+}
+
+
+ADVANCED_SEARCH_STREAM_MIN_LIMIT = 1000  # Larger pages are streamed instead of built in memory
+ADVANCED_SEARCH_STREAM_CHUNK = 500  # Rows fetched and encoded per streamed chunk
+
+
+def _advanced_search_sql(conn, query: str, params: list, path_term: Optional[str], order_by: str, limit: int, offset: int):
+    """Finish an advanced search query, adding the filename filter when path_term is given.
+    
+    Filenames are matched through the media_search trigram index (path column only) when
+    it exists, otherwise with a single LIKE - SQLite's LIKE is already case-insensitive
+    for ASCII, so one pattern covers both cases.
+    """
+    if path_term is not None:
+        if len(path_term) >= SEARCH_FTS_MIN_LEN and _has_search_fts(conn):
+            query += " AND id IN (SELECT rowid FROM media_search WHERE media_search MATCH ?)"
+            params = params + ["path : " + _fts_phrase(path_term)]
+        else:
+            query += " AND path LIKE ?"
+            params = params + [f"%{path_term}%"]
+    return query + order_by + " LIMIT ? OFFSET ?", params + [limit, offset]
+
+
+def _advanced_search_rows(query: str, params: list, path_term: Optional[str], order_by: str, limit: int, offset: int) -> list:
+    """Run an advanced search query as result dicts."""
+    with get_db(readonly=True) as conn:
+        return _rows_as_dicts(conn.execute(*_advanced_search_sql(conn, query, params, path_term, order_by, limit, offset)))
+
+
+def _encode_json_list(items: list) -> bytes:
+    """Compact JSON bytes for a list, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(items)
+    return json.dumps(items, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _iter_advanced_search_json(query: str, params: list, path_term: Optional[str], order_by: str, limit: int, offset: int):
+    """Yield an advanced search result as a JSON array, encoded chunk by chunk.
+    
+    Only ADVANCED_SEARCH_STREAM_CHUNK rows are held at a time, and the first bytes go
+    out as soon as SQLite produces the first rows. StreamingResponse drives this sync
+    generator in the threadpool; the pooled connection is released when it finishes
+    or the client disconnects.
+    """
+    with get_db(readonly=True) as conn:
+        cur = conn.execute(*_advanced_search_sql(conn, query, params, path_term, order_by, limit, offset))
+        columns = [d[0] for d in cur.description]
+        yield b"["
+        first = True
+        while True:
+            rows = cur.fetchmany(ADVANCED_SEARCH_STREAM_CHUNK)
+            if not rows:
+                break
+            body = _encode_json_list([dict(zip(columns, row)) for row in rows])[1:-1]
+            yield body if first else b"," + body
+            first = False
+        yield b"]"
+
+
 @app.get("/api/media/search")
 async def advanced_search(
     q: str = Query(""),
@@ -3321,80 +3933,102 @@ async def advanced_search(
     Advanced search with multiple filters.
     Search by: filename, text content, people, animals, size, date, type.
     """
-    with get_db() as conn:
-        query = "SELECT id, path, type, date_taken, size, width, height, camera, lens FROM media_files WHERE 1=1"
-        params = []
-        
-        # Full-text search on filename
-        if q.strip():
-            config_mgr = get_config_manager(None)  # Search prefs can use active silo
-            config_mgr.add_recent_search(q)
-            
-            query += " AND (path LIKE ? OR path LIKE ?)"
-            params.extend([f"%{q}%", f"%{q.lower()}%"])
-        
-        # File type filter
-        if file_type:
-            query += " AND type = ?"
-            params.append(file_type)
-        
-        # Size filter
-        if min_size is not None:
-            query += " AND size >= ?"
-            params.append(min_size)
-        if max_size is not None:
-            query += " AND size <= ?"
-            params.append(max_size)
-        
-        # Date range filter
-        if date_from is not None:
-            query += " AND date_taken >= ?"
-            params.append(date_from)
-        if date_to is not None:
-            query += " AND date_taken <= ?"
-            params.append(date_to)
-        
-        # Person filter (from user labels)
-        if contains_person:
-            config_mgr = get_config_manager(None)  # Use active silo
-            label = config_mgr.get_face_label(contains_person)
-            if label:
-                # Would need additional logic to link faces to media
-                pass
-        
-        # Animal filter
-        if contains_animal:
-            query += " AND animals LIKE ?"
-            params.append(f"%{contains_animal}%")
-        
-        # Sorting
-        sort_column = "date_taken" if sort_by == "date_taken" else sort_by
-        if sort_column in ["date_taken", "size", "path"]:
-            sort_direction = "DESC" if sort_order == "desc" else "ASC"
-            query += f" ORDER BY {sort_column} {sort_direction}"
-        
-        query += " LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        cur = conn.execute(query, params)
-        rows = cur.fetchall()
-        
-        results = [
-            {
-                "id": r[0],
-                "path": r[1],
-                "type": r[2],
-                "date_taken": r[3],
-                "size": r[4],
-                "width": r[5],
-                "height": r[6],
-                "camera": r[7],
-                "lens": r[8],
-            }
-            for r in rows
-        ]
+    query = "SELECT id, path, type, date_taken, size, width, height, camera, lens FROM media_files WHERE 1=1"
+    params = []
+    
+    # Full-text search on filename (filter added on the DB thread, see _advanced_search_rows)
+    if q.strip():
+        config_mgr = get_config_manager(None)  # Search prefs can use active silo
+        config_mgr.add_recent_search(q)
+    
+    # File type filter
+    if file_type:
+        query += " AND type = ?"
+        params.append(file_type)
+    
+    # Size filter
+    if min_size is not None:
+        query += " AND size >= ?"
+        params.append(min_size)
+    if max_size is not None:
+        query += " AND size <= ?"
+        params.append(max_size)
+    
+    # Date range filter
+    if date_from is not None:
+        query += " AND date_taken >= ?"
+        params.append(date_from)
+    if date_to is not None:
+        query += " AND date_taken <= ?"
+        params.append(date_to)
+    
+    # Person filter (from user labels)
+    if contains_person:
+        config_mgr = get_config_manager(None)  # Use active silo
+        label = config_mgr.get_face_label(contains_person)
+        if label:
+            # Would need additional logic to link faces to media
+            pass
+    
+    # Animal filter
+    if contains_animal:
+        query += " AND animals LIKE ?"
+        params.append(f"%{contains_animal}%")
+    
+    # Sorting (allowlisted columns only; unknown sort_by leaves the rows unordered)
+    order_by = ADVANCED_SEARCH_ORDER_BY.get((sort_by, sort_order == "desc"), "")
+    
+    path_term = q if q.strip() else None
+    if limit >= ADVANCED_SEARCH_STREAM_MIN_LIMIT:
+        return StreamingResponse(
+            _iter_advanced_search_json(query, params, path_term, order_by, limit, offset),
+            media_type="application/json",
+        )
+    return await asyncio.to_thread(
+        _advanced_search_rows, query, params, path_term, order_by, limit, offset
+    )
+
+
+# Each bound is its own scalar subquery so SQLite answers it with a single index seek
+# (idx_media_date / idx_media_size); MIN and MAX in one SELECT would scan the index
+FILTER_RANGES_QUERY = """
+    SELECT
+        (SELECT MIN(date_taken) FROM media_files WHERE date_taken IS NOT NULL),
+        (SELECT MAX(date_taken) FROM media_files),
+        (SELECT MIN(size) FROM media_files WHERE size IS NOT NULL),
+        (SELECT MAX(size) FROM media_files)
+"""
+
+FILTER_OPTIONS_CACHE_TTL = 60  # seconds
+
+# db_path -> (expires_at, db version, (types, date_range, size_range))
+_filter_options_cache: Dict[str, tuple] = {}
+
+
+def _filter_option_ranges():
+    """(file types, (min, max) date_taken, (min, max) size) for the filter options panel.
+    
+    Cached per silo DB for a minute, and dropped early once the DB version changes.
+    """
+    db_path = get_db_path()
+    version = _db_version(db_path)
+    cached = _filter_options_cache.get(db_path)
+    if cached and cached[0] > time.time() and cached[1] == version:
+        return cached[2]
+    
+    with get_db(readonly=True) as conn:
+        # Get available file types
+        cur = conn.execute(
+            "SELECT DISTINCT type FROM media_files WHERE type IS NOT NULL"
+        )
+        types = [row[0] for row in cur.fetchall()]
         
-        return results
+        # Get date and size ranges
+        min_date, max_date, min_size, max_size = conn.execute(FILTER_RANGES_QUERY).fetchone()
+    
+    result = (types, (min_date, max_date), (min_size, max_size))
+    _filter_options_cache[db_path] = (time.time() + FILTER_OPTIONS_CACHE_TTL, version, result)
+    return result
 
 
 @app.get("/api/media/filter-options")
@@ -3406,24 +4040,7 @@ async def get_filter_options(silo_name: str = Query(None)):
     if silo_name:
         _set_processing_silo(silo_name)
     
-    with get_db() as conn:
-        # Get available file types
-        cur = conn.execute(
-            "SELECT DISTINCT type FROM media_files WHERE type IS NOT NULL"
-        )
-        types = [row[0] for row in cur.fetchall()]
-        
-        # Get date range
-        cur = conn.execute(
-            "SELECT MIN(date_taken), MAX(date_taken) FROM media_files WHERE date_taken IS NOT NULL"
-        )
-        date_range = cur.fetchone()
-        
-        # Get size range
-        cur = conn.execute(
-            "SELECT MIN(size), MAX(size) FROM media_files WHERE size IS NOT NULL"
-        )
-        size_range = cur.fetchone()
+    types, date_range, size_range = await asyncio.to_thread(_filter_option_ranges)
     
     config_mgr = get_config_manager(silo_name)
     face_labels = [
@@ -3454,35 +4071,66 @@ async def get_filter_options(silo_name: str = Query(None)):
 # File Organization & Management
 # ============================================================================
 
+def _move_file_on_disk(source_path: str, destination: str) -> None:
+    """Move a file, falling back to copy + delete when the destination is on another device.
+    
+    The cross-device copy goes to a temp file next to the destination (shutil.copyfile
+    uses sendfile(2) on Linux) and is renamed into place, so a partially copied file
+    never appears at the destination.
+    """
+    dest_dir = os.path.dirname(destination)
+    if dest_dir:
+        os.makedirs(dest_dir, exist_ok=True)
+    try:
+        os.replace(source_path, destination)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    
+    tmp_path = f"{destination}.{os.getpid()}.tmp"
+    try:
+        shutil.copy2(source_path, tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, destination)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    os.remove(source_path)
+
+
 @app.post("/api/media/{media_id}/move")
 async def move_file(media_id: int, destination: str):
     """Move a file to a new location."""
-    with get_db() as conn:
-        cur = conn.execute("SELECT path FROM media_files WHERE id = ?", (media_id,))
-        row = cur.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="File not found")
-        
-        source_path = row[0]
-        
-        # Prevent directory traversal
-        if ".." in destination:
-            raise HTTPException(status_code=400, detail="Invalid destination")
+    with get_db(readonly=True) as conn:
+        row = conn.execute(MEDIA_PATH_QUERY, (media_id,)).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    source_path = row[0]
+    
+    # Prevent directory traversal
+    if ".." in destination:
+        raise HTTPException(status_code=400, detail="Invalid destination")
+    
+    try:
+        # Large videos can take a while to copy across devices - keep the event loop free
+        await asyncio.to_thread(_move_file_on_disk, source_path, destination)
         
-        try:
-            os.makedirs(os.path.dirname(destination), exist_ok=True)
-            os.rename(source_path, destination)
-            
-            # Update database
+        # Update database
+        with get_db() as conn:
             conn.execute(
                 "UPDATE media_files SET path = ?, updated_at = ? WHERE id = ?",
                 (destination, int(time.time()), media_id)
             )
-            conn.commit()
-            
-            return {"status": "ok", "new_path": destination}
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=str(e))
+        
+        return {"status": "ok", "new_path": destination}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.delete("/api/media/{media_id}")
@@ -3490,7 +4138,7 @@ async def delete_file(media_id: int):
     """Delete a file (moves to trash or deletes)."""
     check_read_only()  # Prevent deletions in demo mode
     with get_db() as conn:
-        cur = conn.execute("SELECT path FROM media_files WHERE id = ?", (media_id,))
+        cur = conn.execute(MEDIA_PATH_QUERY, (media_id,))
         row = cur.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="File not found")
@@ -3501,9 +4149,8 @@ async def delete_file(media_id: int):
             if os.path.exists(file_path):
                 os.remove(file_path)
             
-            # Remove from database
+            # Remove from database; child rows go with it via ON DELETE CASCADE
             conn.execute("DELETE FROM media_files WHERE id = ?", (media_id,))
-            conn.execute("DELETE FROM uncertain_detections WHERE media_id = ?", (media_id,))
             conn.commit()
             
             return {"status": "deleted"}
@@ -3533,12 +4180,37 @@ async def submit_search_feedback(media_id: int, query: str, feedback: str, label
 @app.get("/api/status/has-indexed-files")
 async def has_indexed_files():
     """Check if the database has any indexed files (used to determine if setup wizard should show)."""
-    with get_db() as conn:
-        count_cur = conn.execute("SELECT COUNT(*) FROM media_files")
-        count = count_cur.fetchone()[0]
+    count = (await asyncio.to_thread(_db_fetchall, "SELECT COUNT(*) FROM media_files"))[0][0]
     return {"has_indexed_files": count > 0, "file_count": count}
 
 
+MEDIA_STATS_QUERY = """
+    SELECT type, COUNT(*), SUM(size),
+           SUM(CASE WHEN animals IS NOT NULL AND animals != '[]' THEN 1 ELSE 0 END)
+    FROM media_files
+    GROUP BY type
+"""
+
+
+def _media_stats():
+    """(total, by_type, total_size, with_people, with_animals) for the active silo."""
+    with get_db(readonly=True) as conn:
+        # Totals, per-type counts, size and animal counts in one pass over media_files
+        rows = conn.execute(MEDIA_STATS_QUERY).fetchall()
+        by_type = {row[0]: row[1] for row in rows}
+        total = sum(by_type.values())
+        total_size = sum(row[2] or 0 for row in rows)
+        with_animals = sum(row[3] for row in rows)
+        
+        # With people - count distinct media that have face embeddings with actual embedding data (not no-faces markers)
+        people_cur = conn.execute(
+            "SELECT COUNT(DISTINCT media_id) FROM face_embeddings WHERE embedding IS NOT NULL AND LENGTH(embedding) > 0"
+        )
+        with_people = people_cur.fetchone()[0]
+    logger.debug("[STATS] Total files: %d, people: %d, animals: %d", total, with_people, with_animals)
+    return total, by_type, total_size, with_people, with_animals
+
+
 @app.get("/api/media/stats")
 async def get_media_stats(silo_name: str = Query(None)):
     """Get statistics about the media library.
@@ -3548,44 +4220,9 @@ async def get_media_stats(silo_name: str = Query(None)):
     # CRITICAL SECURITY: Validate silo context
     if silo_name:
         _set_processing_silo(silo_name)
-        print(f"[STATS] Set silo context to: {silo_name}", flush=True)
-    else:
-        print(f"[STATS] No silo_name provided, using current silo", flush=True)
-    
-    # Verify which database we're using
-    from .db import get_db_path
-    db_path = get_db_path()
-    print(f"[STATS] Using database: {db_path}", flush=True)
+    logger.debug("[STATS] Silo: %s", silo_name or "(current)")
     
-    with get_db() as conn:
-        # Total files
-        total_cur = conn.execute("SELECT COUNT(*) FROM media_files")
-        total = total_cur.fetchone()[0]
-        print(f"[STATS] Total files found: {total}", flush=True)
-        
-        # By type
-        type_cur = conn.execute(
-            "SELECT type, COUNT(*) FROM media_files GROUP BY type"
-        )
-        by_type = {row[0]: row[1] for row in type_cur.fetchall()}
-        
-        # Total size
-        size_cur = conn.execute("SELECT SUM(size) FROM media_files")
-        total_size = size_cur.fetchone()[0] or 0
-        
-        # With people - count distinct media that have face embeddings with actual embedding data (not no-faces markers)
-        people_cur = conn.execute(
-            "SELECT COUNT(DISTINCT media_id) FROM face_embeddings WHERE embedding IS NOT NULL AND LENGTH(embedding) > 0"
-        )
-        with_people = people_cur.fetchone()[0]
-        print(f"[STATS] People found: {with_people}", flush=True)
-        
-        # With animals
-        animals_cur = conn.execute(
-            "SELECT COUNT(*) FROM media_files WHERE animals IS NOT NULL AND animals != '[]'"
-        )
-        with_animals = animals_cur.fetchone()[0]
-        print(f"[STATS] Animals found: {with_animals}", flush=True)
+    total, by_type, total_size, with_people, with_animals = await asyncio.to_thread(_media_stats)
     
     return {
         "total_files": total,
@@ -3642,26 +4279,36 @@ class AddToMultipleClustersRequest(BaseModel):
     target_clusters: List[str]
 
 
+VALIDATION_LOG_EXAMPLES = 5  # Example paths logged per validation problem
+# Echo recluster log lines to stdout as well (they are always kept for the status endpoint)
+CLUSTER_LOG_STDOUT = os.environ.get("PAI_CLUSTER_LOG_STDOUT", "0") == "1"
+
 # Global state for clustering progress tracking
 _clustering_state = {
     "is_running": False,
     "progress": 0,
     "total": 0,
-    "logs": [],
+    "logs": deque(maxlen=50),  # (time, message) of the last 50 log lines
     "current_status": "idle",
 }
 
 
 def _add_cluster_log(message: str):
-    """Add a log message to the clustering progress."""
-    global _clustering_state
-    timestamp = time.strftime("%H:%M:%S")
-    log_entry = f"[{timestamp}] {message}"
-    _clustering_state["logs"].append(log_entry)
-    # Keep only last 50 logs to avoid memory bloat
-    if len(_clustering_state["logs"]) > 50:
-        _clustering_state["logs"] = _clustering_state["logs"][-50:]
-    print(log_entry)
+    """Add a log message to the clustering progress (timestamps are formatted on read)."""
+    entry = (time.time(), message)
+    _clustering_state["logs"].append(entry)
+    if CLUSTER_LOG_STDOUT:
+        print(_format_cluster_log(entry))
+
+
+def _format_cluster_log(entry) -> str:
+    ts, message = entry
+    return f"[{time.strftime('%H:%M:%S', time.localtime(ts))}] {message}"
+
+
+def _cluster_log_lines() -> List[str]:
+    """The kept clustering log as "[HH:MM:SS] message" lines."""
+    return [_format_cluster_log(entry) for entry in list(_clustering_state["logs"])]
 
 
 @app.post("/api/faces/recluster")
@@ -3683,14 +4330,14 @@ async def recluster_faces():
     try:
         _clustering_state["is_running"] = True
         _clustering_state["progress"] = 0
-        _clustering_state["logs"] = []
+        _clustering_state["logs"].clear()
         _clustering_state["current_status"] = "validating"
         
         _add_cluster_log("Starting face cluster validation and re-clustering...")
         
         # Step 1: Validate all face embeddings in database
         _add_cluster_log("Step 1: Validating face embeddings in database...")
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             # Get all face embeddings
             cur = conn.execute("""
                 SELECT 
@@ -3703,62 +4350,49 @@ async def recluster_faces():
                 JOIN media_files ON media_files.id = face_embeddings.media_id
             """)
             rows = cur.fetchall()
-            total_embeddings = len(rows)
-            
-            _add_cluster_log(f"Found {total_embeddings} total face embedding records")
-            
-            # Validate embeddings
-            valid_count = 0
-            invalid_count = 0
-            corrupted_count = 0
-            incomplete_count = 0
-            
-            for idx, (emb_id, path, emb_blob, bbox_json, conf) in enumerate(rows):
-                if idx % max(1, total_embeddings // 10) == 0:
-                    _clustering_state["progress"] = int((idx / total_embeddings) * 25)
-                
-                # Check if embedding exists
-                if emb_blob is None:
-                    incomplete_count += 1
-                    _add_cluster_log(f"  ⚠ [{path}] Missing embedding blob")
-                    continue
-                
+        
+        total_embeddings = len(rows)
+        
+        _add_cluster_log(f"Found {total_embeddings} total face embedding records")
+        
+        # Validate embeddings: decode every blob into one (N, dim) matrix and check it
+        # for NaN/Inf in a single pass. dim is the most common embedding size; missing,
+        # empty and differently sized blobs are incomplete.
+        blobs = [r[2] for r in rows]
+        dims = Counter(d for d in map(blob_dim, blobs) if d)
+        dim = dims.most_common(1)[0][0] if dims else 0
+        keep, matrix = blobs_to_matrix(blobs, dim) if dim else ([], np.empty((0, 0), dtype=np.float32))
+        keep = np.asarray(keep, dtype=np.intp)
+        finite = np.isfinite(matrix).all(axis=1)
+        
+        corrupted = keep[~finite].tolist()
+        incomplete = sorted(set(range(total_embeddings)) - set(keep.tolist()))
+        valid = []
+        for pos in keep[finite].tolist():
+            bbox_json = rows[pos][3]
+            if bbox_json:
                 try:
-                    # Try to deserialize embedding
-                    emb = np.frombuffer(emb_blob, dtype=np.float32)
-                    
-                    # Validate size
-                    if len(emb) == 0:
-                        incomplete_count += 1
-                        _add_cluster_log(f"  ⚠ [{path}] Empty embedding array")
-                        continue
-                    
-                    # Check for NaN or Inf
-                    if np.any(np.isnan(emb)) or np.any(np.isinf(emb)):
-                        corrupted_count += 1
-                        _add_cluster_log(f"  ✗ [{path}] Corrupted embedding (contains NaN/Inf)")
-                        continue
-                    
-                    # Validate bbox
-                    if bbox_json:
-                        bbox = json.loads(bbox_json)
-                        if not isinstance(bbox, list) or len(bbox) != 4:
-                            incomplete_count += 1
-                            _add_cluster_log(f"  ⚠ [{path}] Invalid bounding box")
-                            continue
-                    
-                    valid_count += 1
-                    
-                except (ValueError, TypeError) as e:
-                    corrupted_count += 1
-                    _add_cluster_log(f"  ✗ [{path}] Failed to deserialize: {e}")
+                    bbox = json.loads(bbox_json)
+                except ValueError:
+                    corrupted.append(pos)
                     continue
-                except Exception as e:
-                    invalid_count += 1
-                    _add_cluster_log(f"  ✗ [{path}] Validation error: {e}")
+                if not isinstance(bbox, list) or len(bbox) != 4:
+                    incomplete.append(pos)
                     continue
-            
-            _add_cluster_log(f"Validation complete: {valid_count} valid, {incomplete_count} incomplete, {corrupted_count} corrupted, {invalid_count} errors")
+            valid.append(pos)
+        
+        valid_count = len(valid)
+        incomplete_count = len(incomplete)
+        corrupted_count = len(corrupted)
+        
+        # Log a few example paths per problem instead of one line per bad row
+        for label, positions in (("⚠ Incomplete embedding or bounding box", incomplete), ("✗ Corrupted embedding", corrupted)):
+            for pos in positions[:VALIDATION_LOG_EXAMPLES]:
+                _add_cluster_log(f"  {label}: {rows[pos][1]}")
+            if len(positions) > VALIDATION_LOG_EXAMPLES:
+                _add_cluster_log(f"  ... and {len(positions) - VALIDATION_LOG_EXAMPLES} more")
+        
+        _add_cluster_log(f"Validation complete: {valid_count} valid, {incomplete_count} incomplete, {corrupted_count} corrupted")
         
         # Step 2: Load valid faces from database
         _clustering_state["current_status"] = "loading"
@@ -3777,7 +4411,7 @@ async def recluster_faces():
                 "clusters_created": 0,
                 "faces_clustered": 0,
                 "clusters_with_3plus": 0,
-                "logs": _clustering_state["logs"]
+                "logs": _cluster_log_lines()
             }
         
         # Step 3: Perform clustering
@@ -3828,8 +4462,7 @@ async def recluster_faces():
         _add_cluster_log(f"Total photos in clusters: {total_photos}")
         
         # Clear cache to force reload with new clusters
-        _face_clusters_cache["data"] = None
-        _face_clusters_cache["timestamp"] = 0
+        _face_clusters_cache["key"] = None
         _add_cluster_log("✓ Cache cleared, ready for new queries")
         
         _clustering_state["progress"] = 100
@@ -3841,7 +4474,7 @@ async def recluster_faces():
             "clusters_with_3plus": clusters_3plus,
             "faces_clustered": len(faces),
             "total_photos": total_photos,
-            "logs": _clustering_state["logs"]
+            "logs": _cluster_log_lines()
         }
         
     except Exception as e:
@@ -3864,10 +4497,35 @@ async def get_recluster_status():
         "is_running": _clustering_state["is_running"],
         "progress": _clustering_state["progress"],
         "status": _clustering_state["current_status"],
-        "logs": _clustering_state["logs"]
+        "logs": _cluster_log_lines()
     }
 
 
+# Per-media stats for the cluster list in one grouped pass over every cluster photo (ids
+# bound as a JSON array): date_taken plus the face confidence sum/count, so each cluster's
+# AVG(confidence) can be summed up in Python. Confirmed photos without face embeddings
+# still contribute their date_taken.
+FACE_MEDIA_STATS_QUERY = """
+    SELECT m.id, m.date_taken, SUM(fe.confidence), COUNT(fe.confidence)
+    FROM media_files m
+    LEFT JOIN face_embeddings fe ON fe.media_id = m.id
+    WHERE m.id IN (SELECT value FROM json_each(?))
+    GROUP BY m.id
+"""
+
+
+# Exclusions are a (cluster_id, media_id) set; re-excluding a photo is a no-op
+ADD_CLUSTER_EXCLUSION = "INSERT OR IGNORE INTO face_cluster_exclusions (cluster_id, media_id, created_at) VALUES (?, ?, ?)"
+
+
+def _load_cluster_exclusions(conn) -> Dict[str, set]:
+    """cluster_id -> excluded media ids, for all clusters at once."""
+    excluded: Dict[str, set] = {}
+    for cluster_id, media_id in conn.execute("SELECT cluster_id, media_id FROM face_cluster_exclusions"):
+        excluded.setdefault(cluster_id, set()).add(media_id)
+    return excluded
+
+
 @app.get("/api/faces/clusters", response_model=List[FaceClusterResponse])
 async def list_face_clusters(include_hidden: bool = False, min_photos: int = 1, silo_name: str = Query(None)):
     """Get ALL face clusters - both labeled and embedding-based.
@@ -3885,30 +4543,22 @@ async def list_face_clusters(include_hidden: bool = False, min_photos: int = 1,
         
         result = []
         
-        with get_db() as conn:
-            # Load embedding-based clusters and apply labels to them
-            faces = load_faces_from_db()
-            clusters = cluster_faces(faces)
-            clusters = apply_labels(clusters)
+        with get_db(readonly=True) as conn:
+            # Embedding-based clusters (reused while face_embeddings is unchanged) with labels applied
+            clusters = apply_labels(_get_face_clusters())
             # Don't auto-assign - let user manually confirm/reject photos
             # clusters = assign_new_faces_to_confirmed_clusters(clusters)
             
+            # Exclusions and per-photo stats for every cluster, loaded up front
+            exclusions = _load_cluster_exclusions(conn)
+            photo_ids = sorted({p.get("media_id") for c in clusters for p in c.get("photos", []) if p.get("media_id")})
+            media_stats = {row[0]: row[1:] for row in conn.execute(FACE_MEDIA_STATS_QUERY, (json.dumps(photo_ids),))}
+            
             for cluster in clusters:
                 cluster_id = cluster.get("id")
                 
                 photos = cluster.get("photos", [])
-                
-                # Get exclusions for this cluster
-                excluded_ids = set()
-                cur = conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name='face_cluster_exclusions'"
-                )
-                if cur.fetchone():
-                    cur = conn.execute(
-                        "SELECT media_id FROM face_cluster_exclusions WHERE cluster_id = ?",
-                        (cluster_id,)
-                    )
-                    excluded_ids = {row[0] for row in cur.fetchall()}
+                excluded_ids = exclusions.get(cluster_id, set())
                 
                 # Filter out excluded photos
                 photos = [p for p in photos if p.get("media_id") not in excluded_ids]
@@ -3942,37 +4592,13 @@ async def list_face_clusters(include_hidden: bool = False, min_photos: int = 1,
                     if first_photo_id:
                         thumbnail_url = f"http://127.0.0.1:8000/api/media/file/{first_photo_id}"
                 
-                # Get timestamp
-                last_updated = int(time.time())
-                if photos:
-                    photo_ids = [p.get("media_id") for p in photos if p.get("media_id")]
-                    if photo_ids:
-                        try:
-                            placeholders = ','.join(['?' for _ in photo_ids])
-                            cur = conn.execute(
-                                f"SELECT MAX(date_taken) FROM media_files WHERE id IN ({placeholders})",
-                                photo_ids
-                            )
-                            row = cur.fetchone()
-                            last_updated = row[0] if row and row[0] else int(time.time())
-                        except Exception as e:
-                            pass
-                
-                # Get confidence score from cluster
-                confidence_score = 0.0
-                if photos:
-                    try:
-                        photo_ids = [p.get("media_id") for p in photos if p.get("media_id")]
-                        if photo_ids:
-                            placeholders = ','.join(['?' for _ in photo_ids])
-                            cur = conn.execute(
-                                f"SELECT AVG(confidence) FROM face_embeddings WHERE media_id IN ({placeholders})",
-                                photo_ids
-                            )
-                            row = cur.fetchone()
-                            confidence_score = float(row[0]) if row and row[0] else 0.0
-                    except:
-                        confidence_score = 0.0
+                # Timestamp (newest photo) and mean face confidence over the cluster's photos
+                stats = [media_stats[mid] for mid in {p.get("media_id") for p in photos} if mid in media_stats]
+                last_updated = max((date for date, _, _ in stats if date is not None), default=None)
+                if not last_updated:
+                    last_updated = int(time.time())
+                conf_count = sum(count for _, _, count in stats)
+                confidence_score = float(sum(total for _, total, count in stats if count) / conf_count) if conf_count else 0.0
                 
                 # Get name from cluster (apply_labels already added it)
                 # Check both "name" and "label" fields for backwards compatibility
@@ -4024,10 +4650,8 @@ async def get_cluster_photos(cluster_id: str, silo_name: str = Query(None)):
         label_data = labels.get(cluster_id, {})
         confirmed_photo_ids = set(label_data.get("confirmed_photos", []))
         
-        # Always load all photos from embedding-based clustering
-        faces = load_faces_from_db()
-        clusters = cluster_faces(faces)
-        clusters = apply_labels(clusters)
+        # Always load all photos from embedding-based clustering (reused while faces are unchanged)
+        clusters = apply_labels(_get_face_clusters())
         # Don't auto-assign - let user manually confirm/reject photos
         # (auto-assignment only runs during bulk reclustering)
         
@@ -4043,18 +4667,12 @@ async def get_cluster_photos(cluster_id: str, silo_name: str = Query(None)):
             raise HTTPException(status_code=404, detail=f"Cluster {cluster_id} not found")
         
         # Get exclusions for this cluster
-        excluded_ids = set()
         with get_db() as conn:
-            # Check if exclusions table exists
             cur = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='face_cluster_exclusions'"
+                "SELECT media_id FROM face_cluster_exclusions WHERE cluster_id = ?",
+                (cluster_id,)
             )
-            if cur.fetchone():
-                cur = conn.execute(
-                    "SELECT media_id FROM face_cluster_exclusions WHERE cluster_id = ?",
-                    (cluster_id,)
-                )
-                excluded_ids = {row[0] for row in cur.fetchall()}
+            excluded_ids = {row[0] for row in cur.fetchall()}
         
         # Load confirmed photos from labels
         confirmed_photo_ids = set(labels.get(cluster_id, {}).get("confirmed_photos", []))
@@ -4146,7 +4764,7 @@ async def rename_cluster(cluster_id: str, request: NamePersonRequest = Body(...)
     try:
         set_label(cluster_id, name=request.name)
         # Invalidate cache since data changed
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         return {
             "id": cluster_id,
             "name": request.name,
@@ -4170,7 +4788,7 @@ async def hide_cluster(cluster_id: str, request: HidePersonRequest = Body(...)):
     try:
         set_label(cluster_id, hidden=request.hidden)
         # Invalidate cache since data changed
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         return {
             "id": cluster_id,
             "hidden": request.hidden,
@@ -4198,7 +4816,7 @@ async def rotate_cluster_thumbnail(cluster_id: str, request: RotateClusterReques
         set_label(cluster_id, rotation_override=request.rotation)
         
         # Invalidate cache since data changed
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         
         print(f"[DEBUG] Set cluster {cluster_id} rotation to {request.rotation}°")
         
@@ -4268,16 +4886,18 @@ async def confirm_photo_in_cluster(cluster_id: str, media_id: int = Query(...)):
             labels[cluster_id]["confirmed_photos"] = []
         
         media_id_int = int(media_id)
+        # Re-confirming is a no-op: people.json is only rewritten, and the clusters
+        # cache (cluster_faces reads confirmed photos) only dropped, on a real change
         if media_id_int not in labels[cluster_id]["confirmed_photos"]:
             labels[cluster_id]["confirmed_photos"].append(media_id_int)
             print(f"[DEBUG] Added media_id {media_id} to confirmed_photos in {cluster_id}")
-        
-        # Save labels
-        save_labels(labels)
-        
-        # Clear the clusters cache
-        _face_clusters_cache["data"] = None
-        print(f"[DEBUG] Cleared face clusters cache")
+            
+            # Save labels
+            save_labels(labels)
+            
+            # Clear the clusters cache
+            _face_clusters_cache["key"] = None
+            print(f"[DEBUG] Cleared face clusters cache")
         
         return {
             "cluster_id": cluster_id,
@@ -4312,17 +4932,12 @@ def check_and_hide_empty_cluster(cluster_id: str, labels: dict) -> bool:
     confirmed_photos = set(cluster.get('confirmed_photos', []))
     
     # Get excluded photo IDs
-    excluded_ids = set()
     with get_db() as conn:
         cur = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='face_cluster_exclusions'"
+            "SELECT media_id FROM face_cluster_exclusions WHERE cluster_id = ?",
+            (cluster_id,)
         )
-        if cur.fetchone():
-            cur = conn.execute(
-                "SELECT media_id FROM face_cluster_exclusions WHERE cluster_id = ?",
-                (cluster_id,)
-            )
-            excluded_ids = {row[0] for row in cur.fetchall()}
+        excluded_ids = {row[0] for row in cur.fetchall()}
     
     # Calculate remaining valid photos
     all_photos = embedding_photo_ids | confirmed_photos
@@ -4353,25 +4968,8 @@ async def remove_photo_from_cluster(cluster_id: str, media_id: int = Query(...))
         profile_media_id = cluster_labels.get("profile_media_id")
         
         with get_db() as conn:
-            # Create exclusion table if needed
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS face_cluster_exclusions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    cluster_id TEXT NOT NULL,
-                    media_id INTEGER NOT NULL,
-                    created_at INTEGER,
-                    UNIQUE(cluster_id, media_id)
-                )
-            """)
-            
-            import time
-            # Delete if exists, then insert
-            conn.execute(
-                "DELETE FROM face_cluster_exclusions WHERE cluster_id = ? AND media_id = ?",
-                (cluster_id, media_id)
-            )
             conn.execute(
-                "INSERT INTO face_cluster_exclusions (cluster_id, media_id, created_at) VALUES (?, ?, ?)",
+                ADD_CLUSTER_EXCLUSION,
                 (cluster_id, media_id, int(time.time()))
             )
             conn.commit()
@@ -4404,16 +5002,11 @@ async def remove_photo_from_cluster(cluster_id: str, media_id: int = Query(...))
                     remaining_photo_ids.add(int(pid))
             
             # Check which ones aren't excluded
-            excluded_ids = set()
             cur = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='face_cluster_exclusions'"
+                "SELECT media_id FROM face_cluster_exclusions WHERE cluster_id = ?",
+                (cluster_id,)
             )
-            if cur.fetchone():
-                cur = conn.execute(
-                    "SELECT media_id FROM face_cluster_exclusions WHERE cluster_id = ?",
-                    (cluster_id,)
-                )
-                excluded_ids = {row[0] for row in cur.fetchall()}
+            excluded_ids = {row[0] for row in cur.fetchall()}
             
             valid_photo_ids = remaining_photo_ids - excluded_ids
             
@@ -4449,7 +5042,7 @@ async def remove_photo_from_cluster(cluster_id: str, media_id: int = Query(...))
         
         # Clear the clusters cache so fresh data is fetched next time
         # Clear the clusters cache
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         print(f"[DEBUG] Cleared face clusters cache")
         
         # Additionally, remove this photo from any duplicate unnamed clusters it might appear in
@@ -4473,7 +5066,7 @@ async def remove_photo_from_cluster(cluster_id: str, media_id: int = Query(...))
                         print(f"[DEBUG] Found duplicate in {other_cluster_id}, excluding...")
                         with get_db() as conn:
                             conn.execute(
-                                "INSERT OR IGNORE INTO face_cluster_exclusions (cluster_id, media_id, created_at) VALUES (?, ?, ?)",
+                                ADD_CLUSTER_EXCLUSION,
                                 (other_cluster_id, media_id, int(time.time()))
                             )
                             conn.commit()
@@ -4558,7 +5151,7 @@ async def merge_clusters(request: MergeRequest = Body(...)):
         save_labels(labels)
         
         # Clear cache
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         
         print(f"[MERGE] Merged {len(all_cluster2_photos)} photos from {cluster_id_2} into {cluster_id_1}. Total: {len(merged_photos)} photos")
         
@@ -4788,26 +5381,8 @@ async def move_photo_to_cluster(cluster_id: str, request: MovePhotoRequest):
         
         # Create an exclusion in the from_cluster so it doesn't show there
         with get_db() as conn:
-            # Ensure exclusion table exists
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS face_cluster_exclusions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    cluster_id TEXT NOT NULL,
-                    media_id INTEGER NOT NULL,
-                    created_at INTEGER,
-                    UNIQUE(cluster_id, media_id)
-                )
-            """)
-            
-            import time
-            # Remove any existing exclusion first
-            conn.execute(
-                "DELETE FROM face_cluster_exclusions WHERE cluster_id = ? AND media_id = ?",
-                (from_cluster_id, int(media_id))
-            )
-            # Create new exclusion
             conn.execute(
-                "INSERT INTO face_cluster_exclusions (cluster_id, media_id, created_at) VALUES (?, ?, ?)",
+                ADD_CLUSTER_EXCLUSION,
                 (from_cluster_id, int(media_id), int(time.time()))
             )
             conn.commit()
@@ -4821,7 +5396,7 @@ async def move_photo_to_cluster(cluster_id: str, request: MovePhotoRequest):
         check_and_hide_empty_cluster(from_cluster_id, labels)
         
         # Clear the clusters cache so fresh data is fetched next time
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         print(f"[DEBUG] Cleared face clusters cache")
         
         return {
@@ -4906,26 +5481,8 @@ async def add_photo_to_multiple_clusters(request: AddToMultipleClustersRequest):
             
             # Create exclusion in source cluster so it doesn't appear there
             with get_db() as conn:
-                # Ensure exclusion table exists
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS face_cluster_exclusions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        cluster_id TEXT NOT NULL,
-                        media_id INTEGER NOT NULL,
-                        created_at INTEGER,
-                        UNIQUE(cluster_id, media_id)
-                    )
-                """)
-                
-                import time
-                # Remove any existing exclusion first
-                conn.execute(
-                    "DELETE FROM face_cluster_exclusions WHERE cluster_id = ? AND media_id = ?",
-                    (source_cluster_id, media_id_int)
-                )
-                # Create new exclusion
                 conn.execute(
-                    "INSERT INTO face_cluster_exclusions (cluster_id, media_id, created_at) VALUES (?, ?, ?)",
+                    ADD_CLUSTER_EXCLUSION,
                     (source_cluster_id, media_id_int, int(time.time()))
                 )
                 conn.commit()
@@ -4942,7 +5499,7 @@ async def add_photo_to_multiple_clusters(request: AddToMultipleClustersRequest):
         print(f"[DEBUG] Labels saved")
         
         # Clear the clusters cache so fresh data is fetched next time
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         print(f"[DEBUG] Cleared face clusters cache")
         
         return {
@@ -5077,7 +5634,7 @@ async def merge_clusters(request: MergeClusterRequest):
         
         # Clear cache
         global _face_clusters_cache
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         
         return {
             "success": True,
@@ -5133,7 +5690,7 @@ async def create_new_cluster(request: CreateClusterRequest):
         print(f"[DEBUG] New cluster saved to labels")
         
         # Clear the clusters cache
-        _face_clusters_cache["data"] = None
+        _face_clusters_cache["key"] = None
         
         return {
             "success": True,
@@ -5260,7 +5817,6 @@ async def download_folder_zip(request: FolderZipDownloadRequest):
         zip_filename = f"{safe_folder_name}.zip"
         
         # Return the ZIP as a StreamingResponse
-        from fastapi.responses import StreamingResponse
         return StreamingResponse(
             iter([zip_buffer.getvalue()]),
             media_type="application/zip",
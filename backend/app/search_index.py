@@ -9,6 +9,14 @@ except ImportError:
     FAISS_AVAILABLE = False
     faiss = None
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+    prange = range
+
 # Base cache directory - will be overridden by silo-specific paths
 BASE_CACHE_DIR = os.environ.get("PAI_INDEX_DIR", "./cache")
 
@@ -116,4 +124,41 @@ def search(index, ids: List[int], query: List[float], top_k: int = 20):
     return []
 
 
-__all__ = ["load_index", "build_index", "search", "save_index"]
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _cosine_scores(matrix, query):
+        """Dot product of every pre-normalized row with query, one row per thread chunk."""
+        n, d = matrix.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+else:
+    _cosine_scores = None
+
+
+def cosine_top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k rows of a pre-normalized (N, D) float32 matrix by cosine similarity to query.
+    
+    Uses the numba kernel when numba is installed, otherwise a single NumPy
+    matrix-vector product. Returns (row_indices, scores), best first.
+    """
+    if len(matrix) == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    if _cosine_scores is not None:
+        scores = _cosine_scores(np.ascontiguousarray(matrix, dtype=np.float32), query)
+    else:
+        scores = matrix @ query
+    
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+__all__ = ["load_index", "build_index", "search", "save_index", "cosine_top_k"]
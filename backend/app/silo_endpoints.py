@@ -23,6 +23,7 @@ from cryptography.fernet import Fernet
 import secrets
 
 from .silo_manager import SiloManager
+from .db import close_idle_connections
 
 router = APIRouter(prefix="/api/silos", tags=["silos"])
 
@@ -408,7 +409,8 @@ async def nuke_database(silo_name: Optional[str] = None):
         db_path = SiloManager.get_silo_db_path(silo_name)
         cache_dir = SiloManager.get_silo_cache_dir(silo_name)
         
-        # Delete database
+        # Delete database (drop pooled handles first so they don't outlive the file)
+        close_idle_connections(db_path)
         if os.path.exists(db_path):
             os.remove(db_path)
         
@@ -20,6 +20,7 @@ from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime
 import secrets
+from functools import lru_cache
 
 SILOS_FILE = os.path.join(os.path.dirname(__file__), "..", "silos.json")
 CACHE_BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "cache")
@@ -103,13 +104,32 @@ class SiloManager:
         SiloManager.save_silos(silos)
         return silos
     
+    @staticmethod
+    def _path_config(silos: Optional[dict]):
+        """The parts of silos metadata the memoized path lookups depend on."""
+        if not silos:
+            return None
+        return (
+            silos.get("active_silo"),
+            {name: (s.get("db_path"), s.get("cache_dir")) for name, s in silos.get("silos", {}).items()},
+        )
+    
     @staticmethod
     def save_silos(silos: dict) -> bool:
         """Save silos metadata."""
         try:
+            try:
+                with open(SILOS_FILE, "r", encoding="utf-8") as f:
+                    previous = json.load(f)
+            except (OSError, ValueError):
+                previous = None
             os.makedirs(os.path.dirname(SILOS_FILE), exist_ok=True)
             with open(SILOS_FILE, "w", encoding="utf-8") as f:
                 json.dump(silos, f, indent=2)
+            # Only drop the path memo when a silo's paths (or the active silo) changed,
+            # not on saves that just touch flags like "authenticated"
+            if SiloManager._path_config(previous) != SiloManager._path_config(silos):
+                SiloManager.clear_path_cache()
             return True
         except Exception as e:
             print(f"[ERROR] Failed to save silos: {e}")
@@ -317,6 +337,8 @@ class SiloManager:
         # Remove cache directory
         if cache_dir and os.path.exists(cache_dir):
             try:
+                from .db import close_idle_connections
+                close_idle_connections(SiloManager.get_silo_db_path(name))
                 shutil.rmtree(cache_dir)
             except Exception as e:
                 print(f"[ERROR] Failed to delete cache dir: {e}")
@@ -352,28 +374,33 @@ class SiloManager:
         return silo_list
     
     @staticmethod
-    def get_silo_db_path(silo_name: Optional[str] = None) -> str:
-        """Get database path for a silo. Creates path if needed, ensures silo exists."""
-        # CRITICAL: Check if there's a processing silo set by main.py
-        if not silo_name:
-            try:
-                from . import main
-                if hasattr(main, '_currently_processing_silo') and main._currently_processing_silo:
-                    silo_name = main._currently_processing_silo
-                    print(f"[GET_SILO_DB_PATH] Using processing silo: {silo_name}", flush=True)
-            except:
-                pass
+    def _resolve_silo_name(silo_name: Optional[str] = None) -> Optional[str]:
+        """Explicit silo name, else the processing silo set by main.py, else the active silo."""
+        if silo_name:
+            return silo_name
         
-        if not silo_name:
-            silo = SiloManager.get_active_silo()
-            silo_name = silo.get("name") if silo else None
-            if not silo_name:
-                raise ValueError("[GET_SILO_DB_PATH] No active silo found and no silo_name provided")
-            print(f"[GET_SILO_DB_PATH] No processing silo, using active silo: {silo_name}", flush=True)
-        else:
-            silos = SiloManager.load_silos()
-            silo = silos["silos"].get(silo_name)
+        # CRITICAL: Check if there's a processing silo set by main.py
+        try:
+            from . import main
+            if hasattr(main, '_currently_processing_silo') and main._currently_processing_silo:
+                return main._currently_processing_silo
+        except:
+            pass
         
+        silo = SiloManager.get_active_silo()
+        return silo.get("name") if silo else None
+    
+    @staticmethod
+    def clear_path_cache() -> None:
+        """Drop memoized silo db/cache paths (call whenever silos.json or the processing silo changes)."""
+        SiloManager._silo_db_path_for.cache_clear()
+        SiloManager._silo_cache_dir_for.cache_clear()
+    
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _silo_db_path_for(silo_name: str) -> str:
+        silos = SiloManager.load_silos()
+        silo = silos["silos"].get(silo_name)
         if not silo:
             raise ValueError(f"[GET_SILO_DB_PATH] Silo '{silo_name}' not found in configuration")
         
@@ -386,32 +413,37 @@ class SiloManager:
         
         # CRITICAL: Normalize the path to resolve .. and expand user
         db_path = os.path.abspath(os.path.expanduser(db_path))
-        print(f"[GET_SILO_DB_PATH] Returning normalized path: {db_path}", flush=True)
+        print(f"[GET_SILO_DB_PATH] Resolved {silo_name} -> {db_path}", flush=True)
         return db_path
     
     @staticmethod
-    def get_silo_cache_dir(silo_name: Optional[str] = None) -> str:
-        """Get cache directory for a silo."""
-        # CRITICAL: Check if there's a processing silo set by main.py
-        if not silo_name:
-            try:
-                from . import main
-                if hasattr(main, '_currently_processing_silo') and main._currently_processing_silo:
-                    silo_name = main._currently_processing_silo
-            except:
-                pass
-        
-        if not silo_name:
-            silo = SiloManager.get_active_silo()
-        else:
-            silos = SiloManager.load_silos()
-            silo = silos["silos"].get(silo_name)
-        
+    @lru_cache(maxsize=16)
+    def _silo_cache_dir_for(silo_name: str) -> str:
+        silos = SiloManager.load_silos()
+        silo = silos["silos"].get(silo_name)
         if not silo:
             return CACHE_BASE_DIR
-        
         return silo.get("cache_dir", CACHE_BASE_DIR)
     
+    @staticmethod
+    def get_silo_db_path(silo_name: Optional[str] = None) -> str:
+        """Get database path for a silo. Creates path if needed, ensures silo exists.
+        
+        Paths are memoized per silo name; see clear_path_cache().
+        """
+        silo_name = SiloManager._resolve_silo_name(silo_name)
+        if not silo_name:
+            raise ValueError("[GET_SILO_DB_PATH] No active silo found and no silo_name provided")
+        return SiloManager._silo_db_path_for(silo_name)
+    
+    @staticmethod
+    def get_silo_cache_dir(silo_name: Optional[str] = None) -> str:
+        """Get cache directory for a silo (memoized per silo name)."""
+        silo_name = SiloManager._resolve_silo_name(silo_name)
+        if not silo_name:
+            return CACHE_BASE_DIR
+        return SiloManager._silo_cache_dir_for(silo_name)
+    
     @staticmethod
     def get_silo_media_paths(silo_name: Optional[str] = None) -> List[str]:
         """Get media paths configured for a silo."""
@@ -504,6 +536,7 @@ class SiloManager:
         
         conn = sqlite3.connect(db_path)
         conn.executescript(db.SCHEMA)
+        conn.executescript(db.POST_MIGRATION_INDEXES)
         conn.close()
 
     @staticmethod
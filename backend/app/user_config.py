@@ -7,8 +7,9 @@ CRITICAL: This is now SILO-SPECIFIC to prevent data leakage between silos.
 
 import os
 import json
+import threading
 from dataclasses import dataclass, asdict, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 
@@ -91,6 +92,38 @@ class UserConfig:
     last_indexed: Optional[int] = None
 
 
+def _config_file_key(config_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(config_path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+# Queries at least this long are answered from the substring index; shorter ones scan labels.
+# Shared with face_cluster.find_clusters_by_label.
+LABEL_INDEX_MIN_LEN = 3
+
+
+def _build_label_index(texts_by_id: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """{substring: [label_id, ...]} for every substring of length >= LABEL_INDEX_MIN_LEN.
+    
+    Texts are expected lowercased. Ids keep the label dict's order and appear once per
+    substring even if several of a label's texts (name, aliases, ...) contain it.
+    """
+    substrings: Dict[str, List[str]] = {}
+    for label_id, texts in texts_by_id.items():
+        seen = set()
+        for text in texts:
+            for start in range(len(text)):
+                for end in range(start + LABEL_INDEX_MIN_LEN, len(text) + 1):
+                    part = text[start:end]
+                    if part not in seen:
+                        seen.add(part)
+                        substrings.setdefault(part, []).append(label_id)
+    return substrings
+
+
 class ConfigManager:
     """Manage user configuration and metadata.
     
@@ -109,10 +142,20 @@ class ConfigManager:
                 config_path = "./cache/user_config.json"
         
         self.config_path = config_path
+        self.file_key = None  # (mtime_ns, size) of the config file as last loaded/saved
+        # Lazily built (texts_by_id, substring index) per label kind; reset whenever
+        # the config is loaded or saved
+        self._face_label_index: Optional[Tuple[Dict[str, List[str]], Dict[str, List[str]]]] = None
+        self._animal_label_index: Optional[Tuple[Dict[str, List[str]], Dict[str, List[str]]]] = None
         self.config = self._load_config()
     
+    def _reset_label_indexes(self) -> None:
+        self._face_label_index = None
+        self._animal_label_index = None
+    
     def _load_config(self) -> UserConfig:
         """Load config from disk or create new."""
+        self._reset_label_indexes()
         try:
             # Ensure cache directory exists
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
@@ -120,6 +163,7 @@ class ConfigManager:
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
+                    self.file_key = _config_file_key(self.config_path)
                     return self._dict_to_config(data)
         except Exception as e:
             print(f"Error loading config: {e}, using defaults")
@@ -134,6 +178,8 @@ class ConfigManager:
         data = self._config_to_dict(self.config)
         with open(self.config_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
+        self.file_key = _config_file_key(self.config_path)
+        self._reset_label_indexes()
     
     def _config_to_dict(self, config: UserConfig) -> Dict:
         """Convert config to JSON-serializable dict."""
@@ -213,14 +259,25 @@ class ConfigManager:
     
     def search_face_label(self, query: str) -> List[FaceLabel]:
         """Search face labels by name or alias."""
+        if self._face_label_index is None:
+            texts = {
+                label_id: [label.name.lower()] + [alias.lower() for alias in label.aliases]
+                for label_id, label in self.config.face_labels.items()
+            }
+            self._face_label_index = (texts, _build_label_index(texts))
+        return [
+            self.config.face_labels[label_id]
+            for label_id in self._search_label_index(self._face_label_index, query)
+        ]
+    
+    @staticmethod
+    def _search_label_index(index, query: str) -> List[str]:
+        """Ids of labels with a text containing query (case-insensitive), in label order."""
+        texts, substrings = index
         query_lower = query.lower()
-        results = []
-        for label in self.config.face_labels.values():
-            if query_lower in label.name.lower():
-                results.append(label)
-            elif any(query_lower in alias.lower() for alias in label.aliases):
-                results.append(label)
-        return results
+        if len(query_lower) >= LABEL_INDEX_MIN_LEN:
+            return substrings.get(query_lower, [])
+        return [label_id for label_id, label_texts in texts.items() if any(query_lower in t for t in label_texts)]
     
     # Animal label operations
     def add_animal_label(
@@ -247,16 +304,16 @@ class ConfigManager:
     
     def search_animal_label(self, query: str) -> List[AnimalLabel]:
         """Search animal labels by name or species."""
-        query_lower = query.lower()
-        results = []
-        for label in self.config.animal_labels.values():
-            if query_lower in label.species.lower():
-                results.append(label)
-            elif label.name and query_lower in label.name.lower():
-                results.append(label)
-            elif label.breed and query_lower in label.breed.lower():
-                results.append(label)
-        return results
+        if self._animal_label_index is None:
+            texts = {
+                label_id: [text.lower() for text in (label.species, label.name, label.breed) if text]
+                for label_id, label in self.config.animal_labels.items()
+            }
+            self._animal_label_index = (texts, _build_label_index(texts))
+        return [
+            self.config.animal_labels[label_id]
+            for label_id in self._search_label_index(self._animal_label_index, query)
+        ]
     
     # Search preset operations
     def save_search_preset(
@@ -303,6 +360,20 @@ class ConfigManager:
 # Each API call must get the silo-specific config manager
 # _config_manager: Optional[ConfigManager] = None
 
+# config_path -> ConfigManager. Keyed by the silo-specific file, so silos never share one;
+# an entry is reloaded when its file changed on disk outside this manager's own saves.
+_config_managers: Dict[str, ConfigManager] = {}
+_config_managers_lock = threading.Lock()
+
+
+def _cached_config_manager(config_path: str) -> ConfigManager:
+    with _config_managers_lock:
+        manager = _config_managers.get(config_path)
+        if manager is None or manager.file_key != _config_file_key(config_path):
+            manager = ConfigManager(config_path)
+            _config_managers[config_path] = manager
+        return manager
+
 
 def get_config_manager(silo_name: Optional[str] = None) -> ConfigManager:
     """Get silo-specific config manager.
@@ -314,13 +385,14 @@ def get_config_manager(silo_name: Optional[str] = None) -> ConfigManager:
         silo_name: Optional silo name. If not provided, uses active silo.
     
     Returns:
-        ConfigManager for the specified silo
+        ConfigManager for the specified silo (cached per silo; the config file is
+        only re-read when it changes on disk)
     """
     try:
         from .silo_manager import SiloManager
         cache_dir = SiloManager.get_silo_cache_dir(silo_name)
         config_path = os.path.join(cache_dir, "user_config.json")
-        return ConfigManager(config_path)
+        return _cached_config_manager(config_path)
     except Exception as e:
         print(f"[USER_CONFIG] ERROR: Could not create silo-specific config: {e}")
         # Fallback for startup/testing
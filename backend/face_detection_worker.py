@@ -199,6 +199,234 @@ def detect_faces_with_timeout(img_path, timeout_seconds=30):
     
     return result[0]
 
+def load_detection_stats():
+    """Return (total eligible, already processed, faces found) counts for progress reporting."""
+    with get_db() as conn:
+        # Total eligible files (still images only)
+        total_cur = conn.execute(
+            """SELECT COUNT(*) FROM media_files 
+               WHERE type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
+        )
+        total_eligible_files = total_cur.fetchone()[0] or 0
+        
+        # Already processed files
+        processed_cur = conn.execute(
+            """SELECT COUNT(*) FROM media_files 
+               WHERE face_detection_attempted = 1
+               AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
+        )
+        already_processed = processed_cur.fetchone()[0] or 0
+        
+        # Already found faces from previously processed files
+        faces_cur = conn.execute(
+            """SELECT COUNT(*) FROM face_embeddings 
+               WHERE embedding IS NOT NULL"""
+        )
+        already_found_faces = faces_cur.fetchone()[0] or 0
+    return total_eligible_files, already_processed, already_found_faces
+
+def process_images(unprocessed, total_eligible_files, already_processed, already_found_faces, restart_threshold=None):
+    """Detect and store faces for a list of (media_id, path) rows.
+    
+    Exits the process on a detection timeout (the stuck thread can't be killed),
+    and after restart_threshold images when one is given.
+    
+    Returns (processed_count, faces_detected, skipped_count).
+    """
+    total_faces_detected = 0
+    processed_count = 0
+    skipped_count = 0
+    TIMEOUT_SECONDS = 60  # Increased timeout to 60s to handle slow images
+    last_failed_file = None  # Track consecutive failures
+    
+    # Process each image one at a time with strict batch_size=1
+    for media_id, img_path in unprocessed:
+        try:
+            # Memory check: if memory usage > 600MB, force cleanup (lowered from 800MB)
+            mem_usage = get_memory_usage()
+            if mem_usage > 600:
+                log_worker(f"Memory high ({mem_usage:.0f}MB), forcing cleanup...")
+                gc.collect()
+                time.sleep(0.5)
+            
+            # Update progress checkpoint (cumulative from database + current batch)
+            cumulative_processed = already_processed + processed_count
+            cumulative_faces = already_found_faces + total_faces_detected
+            current_filename = os.path.basename(img_path)
+            log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
+            
+            print(f"[{cumulative_processed}/{total_eligible_files}] {current_filename}...", end=" ", flush=True)
+            
+            # Check if file still exists
+            if not os.path.exists(img_path):
+                log_skipped(img_path, "File not found")
+                skipped_count += 1
+                processed_count += 1
+                print("✗ Not found", flush=True)
+                mark_image_processed(media_id)
+                last_failed_file = None
+                continue
+            
+            # Detect faces for this single image with timeout protection
+            try:
+                log_worker(f"[FACE_DETECT_START] Processing {current_filename}")
+                log_worker(f"  - Image path: {img_path}")
+                log_worker(f"  - File size: {os.path.getsize(img_path) if os.path.exists(img_path) else 'N/A'} bytes")
+                log_worker(f"  - Memory before: {get_memory_usage():.1f}MB available / {psutil.virtual_memory().available / 1024 / 1024:.0f}MB")
+                
+                # Use timeout-protected detection
+                all_faces = detect_faces_with_timeout(img_path, timeout_seconds=TIMEOUT_SECONDS)
+                
+                log_worker(f"[FACE_DETECT_SUCCESS] Found {len(all_faces)} face(s)")
+                print(f"✓ {len(all_faces)} faces", flush=True)
+                last_failed_file = None  # Reset on success
+                
+            except (TimeoutError, Exception) as detect_error:
+                # Check if this is same file failing twice in a row
+                error_type = "TIMEOUT" if isinstance(detect_error, TimeoutError) else type(detect_error).__name__
+                error_msg = str(detect_error)[:100]
+                
+                if last_failed_file == img_path:
+                    # Same file failed twice - skip it
+                    log_skipped(img_path, f"Consecutive failure ({error_type}): {error_msg}")
+                    log_worker(f"[SKIP_CONSECUTIVE] Skipping {current_filename} - failed twice in a row")
+                    skipped_count += 1
+                    processed_count += 1
+                    print(f"✗ SKIP (consecutive fail)", flush=True)
+                    mark_image_processed(media_id)
+                    last_failed_file = None
+                    continue
+                else:
+                    # First failure - log and trigger restart after this batch
+                    log_worker(f"[FACE_DETECT_ERROR] {error_type}: {error_msg}")
+                    if isinstance(detect_error, TimeoutError):
+                        # Timeout - exit to restart fresh
+                        log_worker(f"[TIMEOUT_EXIT] File {current_filename} exceeded {TIMEOUT_SECONDS}s, restarting worker")
+                        mark_image_processed(media_id)
+                        processed_count += 1
+                        # Save progress and exit to restart
+                        cumulative_processed = already_processed + processed_count
+                        cumulative_faces = already_found_faces + total_faces_detected
+                        log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
+                        print(json.dumps({
+                            "status": "restarting",
+                            "reason": "timeout",
+                            "processed": cumulative_processed,
+                            "faces_found": cumulative_faces
+                        }), flush=True)
+                        sys.exit(0)
+                    else:
+                        # Other error - skip this file and mark for retry
+                        last_failed_file = img_path
+                        log_skipped(img_path, f"Detection failed ({error_type}): {error_msg}")
+                        skipped_count += 1
+                        processed_count += 1
+                        print(f"✗ SKIP", flush=True)
+                        mark_image_processed(media_id)
+                        continue
+            
+            # Store embeddings if faces found
+            if all_faces and len(all_faces) > 0:
+                try:
+                    log_worker(f"[STORE_EMBEDDINGS_START] Storing {len(all_faces)} face(s) for media_id {media_id}")
+                    with get_db() as conn:
+                        log_worker(f"[DB_CONNECTED] Database connection established")
+                        store_face_embeddings(
+                            conn,
+                            media_id,
+                            [
+                                {
+                                    "embedding": f.embedding,
+                                    "bbox": f.bbox,
+                                    "score": f.score,
+                                }
+                                for f in all_faces
+                            ],
+                        )
+                        log_worker(f"[DB_COMMIT] Committing changes to database")
+                        conn.commit()
+                    log_worker(f"[STORE_EMBEDDINGS_SUCCESS] Embeddings stored successfully")
+                except Exception as store_error:
+                    log_worker(f"[STORE_EMBEDDINGS_ERROR] {type(store_error).__name__}: {str(store_error)}")
+                    log_worker(f"[STORE_EMBEDDINGS_TRACEBACK] {traceback.format_exc()}")
+                    raise
+                
+                face_count = len([f for f in all_faces if f.embedding])
+                total_faces_detected += face_count
+            else:
+                face_count = 0
+            
+            processed_count += 1
+            
+            # Log with face count (using cumulative)
+            cumulative_processed = already_processed + processed_count
+            cumulative_faces = already_found_faces + total_faces_detected
+            log_worker(f"[IMAGE_COMPLETE] {current_filename}: {face_count} face(s) found • Total: {cumulative_faces} faces in {cumulative_processed} images")
+            log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
+            
+            if face_count > 0:
+                print(f"✓ {face_count} face(s) [Total: {cumulative_faces}]", flush=True)
+            else:
+                print(f"✓ No faces [Total: {cumulative_faces}]", flush=True)
+            
+            # Mark as processed
+            mark_image_processed(media_id)
+            
+            # Explicit memory cleanup after each image
+            gc.collect()
+            time.sleep(0.1)  # Small delay to prevent overheating
+            
+            # Auto-restart after processing restart_threshold files to clean memory
+            if restart_threshold and processed_count >= restart_threshold:
+                cumulative_processed = already_processed + processed_count
+                cumulative_faces = already_found_faces + total_faces_detected
+                
+                # Rebuild clustering cache before restart for live propagation
+                log_worker(f"[AUTO_RESTART] Rebuilding clustering cache with newly detected faces...")
+                rebuild_clustering_cache()
+                
+                log_worker(f"[AUTO_RESTART] Processed {processed_count} files (cumulative: {cumulative_processed}/{total_eligible_files}), restarting to clean memory...")
+                log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
+                print(json.dumps({
+                    "status": "restarting",
+                    "reason": "Memory cleanup + clustering cache rebuild",
+                    "processed": processed_count,
+                    "faces_found": total_faces_detected
+                }), flush=True)
+                # Exit cleanly - backend will restart us automatically
+                sys.exit(0)
+            
+        except Exception as img_error:
+            error_msg = str(img_error)[:100]
+            print(f"✗ Unexpected error: {error_msg}", flush=True)
+            log_crash(f"Error processing {img_path}: {str(img_error)}\n{traceback.format_exc()}")
+            
+            # Try to mark as processed to avoid infinite loops
+            try:
+                mark_image_processed(media_id)
+                processed_count += 1
+            except:
+                pass
+    
+    return processed_count, total_faces_detected, skipped_count
+
+def log_cluster_stats():
+    """Log named cluster and embedding counts after a run."""
+    try:
+        with get_db() as conn:
+            # Count unique person clusters
+            cluster_cur = conn.execute("SELECT COUNT(DISTINCT label) FROM face_clusters WHERE label IS NOT NULL")
+            named_clusters = cluster_cur.fetchone()[0] or 0
+            
+            # Count total face embeddings in database
+            face_cur = conn.execute("SELECT COUNT(*) FROM face_embeddings")
+            total_embeddings = face_cur.fetchone()[0] or 0
+            
+            log_worker(f"  - Named clusters: {named_clusters} (labeled people)")
+            log_worker(f"  - Total face embeddings in database: {total_embeddings}")
+    except Exception as e:
+        log_worker(f"  - Could not fetch cluster stats: {e}")
+
 def detect_faces_worker():
     """Run face detection with crash recovery and memory management."""
     try:
@@ -207,38 +435,12 @@ def detect_faces_worker():
         init_db()
         log_worker("Database initialized")
         
-        total_faces_detected = 0
-        processed_count = 0
-        skipped_count = 0
         RESTART_THRESHOLD = 5  # Auto-restart after processing 5 files to avoid memory/hang issues
-        TIMEOUT_SECONDS = 60  # Increased timeout to 60s to handle slow images
-        last_failed_file = None  # Track consecutive failures
         
         # Get total count of eligible files in database
         log_worker("Querying database for file counts...")
+        total_eligible_files, already_processed, already_found_faces = load_detection_stats()
         with get_db() as conn:
-            # Total eligible files (still images only)
-            total_cur = conn.execute(
-                """SELECT COUNT(*) FROM media_files 
-                   WHERE type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
-            )
-            total_eligible_files = total_cur.fetchone()[0] or 0
-            
-            # Already processed files
-            processed_cur = conn.execute(
-                """SELECT COUNT(*) FROM media_files 
-                   WHERE face_detection_attempted = 1
-                   AND type IN ('.jpg', '.jpeg', '.png', '.heic', '.webp', '.tiff', '.bmp')"""
-            )
-            already_processed = processed_cur.fetchone()[0] or 0
-            
-            # Already found faces from previously processed files
-            faces_cur = conn.execute(
-                """SELECT COUNT(*) FROM face_embeddings 
-                   WHERE embedding IS NOT NULL"""
-            )
-            already_found_faces = faces_cur.fetchone()[0] or 0
-            
             # Get unprocessed files for this batch
             unprocessed_cur = conn.execute(
                 """SELECT id, path FROM media_files 
@@ -263,174 +465,10 @@ def detect_faces_worker():
         
         log_progress(already_processed, total_eligible_files, already_found_faces)
         
-        # Process each image one at a time with strict batch_size=1
-        for media_id, img_path in unprocessed:
-            try:
-                # Memory check: if memory usage > 600MB, force cleanup (lowered from 800MB)
-                mem_usage = get_memory_usage()
-                if mem_usage > 600:
-                    log_worker(f"Memory high ({mem_usage:.0f}MB), forcing cleanup...")
-                    gc.collect()
-                    time.sleep(0.5)
-                
-                # Update progress checkpoint (cumulative from database + current batch)
-                cumulative_processed = already_processed + processed_count
-                cumulative_faces = already_found_faces + total_faces_detected
-                current_filename = os.path.basename(img_path)
-                log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
-                
-                print(f"[{cumulative_processed}/{total_eligible_files}] {current_filename}...", end=" ", flush=True)
-                
-                # Check if file still exists
-                if not os.path.exists(img_path):
-                    log_skipped(img_path, "File not found")
-                    skipped_count += 1
-                    processed_count += 1
-                    print("✗ Not found", flush=True)
-                    mark_image_processed(media_id)
-                    last_failed_file = None
-                    continue
-                
-                # Detect faces for this single image with timeout protection
-                try:
-                    log_worker(f"[FACE_DETECT_START] Processing {current_filename}")
-                    log_worker(f"  - Image path: {img_path}")
-                    log_worker(f"  - File size: {os.path.getsize(img_path) if os.path.exists(img_path) else 'N/A'} bytes")
-                    log_worker(f"  - Memory before: {get_memory_usage():.1f}MB available / {psutil.virtual_memory().available / 1024 / 1024:.0f}MB")
-                    
-                    # Use timeout-protected detection
-                    all_faces = detect_faces_with_timeout(img_path, timeout_seconds=TIMEOUT_SECONDS)
-                    
-                    log_worker(f"[FACE_DETECT_SUCCESS] Found {len(all_faces)} face(s)")
-                    print(f"✓ {len(all_faces)} faces", flush=True)
-                    last_failed_file = None  # Reset on success
-                    
-                except (TimeoutError, Exception) as detect_error:
-                    # Check if this is same file failing twice in a row
-                    error_type = "TIMEOUT" if isinstance(detect_error, TimeoutError) else type(detect_error).__name__
-                    error_msg = str(detect_error)[:100]
-                    
-                    if last_failed_file == img_path:
-                        # Same file failed twice - skip it
-                        log_skipped(img_path, f"Consecutive failure ({error_type}): {error_msg}")
-                        log_worker(f"[SKIP_CONSECUTIVE] Skipping {current_filename} - failed twice in a row")
-                        skipped_count += 1
-                        processed_count += 1
-                        print(f"✗ SKIP (consecutive fail)", flush=True)
-                        mark_image_processed(media_id)
-                        last_failed_file = None
-                        continue
-                    else:
-                        # First failure - log and trigger restart after this batch
-                        log_worker(f"[FACE_DETECT_ERROR] {error_type}: {error_msg}")
-                        if isinstance(detect_error, TimeoutError):
-                            # Timeout - exit to restart fresh
-                            log_worker(f"[TIMEOUT_EXIT] File {current_filename} exceeded {TIMEOUT_SECONDS}s, restarting worker")
-                            mark_image_processed(media_id)
-                            processed_count += 1
-                            # Save progress and exit to restart
-                            cumulative_processed = already_processed + processed_count
-                            cumulative_faces = already_found_faces + total_faces_detected
-                            log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
-                            print(json.dumps({
-                                "status": "restarting",
-                                "reason": "timeout",
-                                "processed": cumulative_processed,
-                                "faces_found": cumulative_faces
-                            }), flush=True)
-                            sys.exit(0)
-                        else:
-                            # Other error - skip this file and mark for retry
-                            last_failed_file = img_path
-                            log_skipped(img_path, f"Detection failed ({error_type}): {error_msg}")
-                            skipped_count += 1
-                            processed_count += 1
-                            print(f"✗ SKIP", flush=True)
-                            mark_image_processed(media_id)
-                            continue
-                
-                # Store embeddings if faces found
-                if all_faces and len(all_faces) > 0:
-                    try:
-                        log_worker(f"[STORE_EMBEDDINGS_START] Storing {len(all_faces)} face(s) for media_id {media_id}")
-                        with get_db() as conn:
-                            log_worker(f"[DB_CONNECTED] Database connection established")
-                            store_face_embeddings(
-                                conn,
-                                media_id,
-                                [
-                                    {
-                                        "embedding": f.embedding,
-                                        "bbox": f.bbox,
-                                        "score": f.score,
-                                    }
-                                    for f in all_faces
-                                ],
-                            )
-                            log_worker(f"[DB_COMMIT] Committing changes to database")
-                            conn.commit()
-                        log_worker(f"[STORE_EMBEDDINGS_SUCCESS] Embeddings stored successfully")
-                    except Exception as store_error:
-                        log_worker(f"[STORE_EMBEDDINGS_ERROR] {type(store_error).__name__}: {str(store_error)}")
-                        log_worker(f"[STORE_EMBEDDINGS_TRACEBACK] {traceback.format_exc()}")
-                        raise
-                    
-                    face_count = len([f for f in all_faces if f.embedding])
-                    total_faces_detected += face_count
-                else:
-                    face_count = 0
-                
-                processed_count += 1
-                
-                # Log with face count (using cumulative)
-                cumulative_processed = already_processed + processed_count
-                cumulative_faces = already_found_faces + total_faces_detected
-                log_worker(f"[IMAGE_COMPLETE] {current_filename}: {face_count} face(s) found • Total: {cumulative_faces} faces in {cumulative_processed} images")
-                log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
-                
-                if face_count > 0:
-                    print(f"✓ {face_count} face(s) [Total: {cumulative_faces}]", flush=True)
-                else:
-                    print(f"✓ No faces [Total: {cumulative_faces}]", flush=True)
-                
-                # Mark as processed
-                mark_image_processed(media_id)
-                
-                # Explicit memory cleanup after each image
-                gc.collect()
-                time.sleep(0.1)  # Small delay to prevent overheating
-                
-                # Auto-restart after processing RESTART_THRESHOLD files to clean memory
-                if processed_count >= RESTART_THRESHOLD:
-                    cumulative_processed = already_processed + processed_count
-                    cumulative_faces = already_found_faces + total_faces_detected
-                    
-                    # Rebuild clustering cache before restart for live propagation
-                    log_worker(f"[AUTO_RESTART] Rebuilding clustering cache with newly detected faces...")
-                    rebuild_clustering_cache()
-                    
-                    log_worker(f"[AUTO_RESTART] Processed {processed_count} files (cumulative: {cumulative_processed}/{total_eligible_files}), restarting to clean memory...")
-                    log_progress(cumulative_processed, total_eligible_files, cumulative_faces, current_filename)
-                    print(json.dumps({
-                        "status": "restarting",
-                        "reason": "Memory cleanup + clustering cache rebuild",
-                        "processed": processed_count,
-                        "faces_found": total_faces_detected
-                    }), flush=True)
-                    # Exit cleanly - backend will restart us automatically
-                    sys.exit(0)
-                
-            except Exception as img_error:
-                error_msg = str(img_error)[:100]
-                print(f"✗ Unexpected error: {error_msg}", flush=True)
-                log_crash(f"Error processing {img_path}: {str(img_error)}\n{traceback.format_exc()}")
-                
-                # Try to mark as processed to avoid infinite loops
-                try:
-                    mark_image_processed(media_id)
-                    processed_count += 1
-                except:
-                    pass
+        processed_count, total_faces_detected, skipped_count = process_images(
+            unprocessed, total_eligible_files, already_processed, already_found_faces,
+            restart_threshold=RESTART_THRESHOLD,
+        )
         
         # Final status with cluster information
         cumulative_final = already_processed + processed_count
@@ -445,23 +483,8 @@ def detect_faces_worker():
         rebuild_clustering_cache()
         
         # Get cluster information
-        try:
-            with get_db() as conn:
-                # Count unique person clusters
-                cluster_cur = conn.execute("SELECT COUNT(DISTINCT label) FROM face_clusters WHERE label IS NOT NULL")
-                named_clusters = cluster_cur.fetchone()[0] or 0
-                
-                # Count total face embeddings in database
-                face_cur = conn.execute("SELECT COUNT(*) FROM face_embeddings")
-                total_embeddings = face_cur.fetchone()[0] or 0
-                
-                log_worker(f"  - Named clusters: {named_clusters} (labeled people)")
-                log_worker(f"  - Total face embeddings in database: {total_embeddings}")
-        except Exception as e:
-            log_worker(f"  - Could not fetch cluster stats: {e}")
+        log_cluster_stats()
         
-        cumulative_final = already_processed + processed_count
-        cumulative_faces_final = already_found_faces + total_faces_detected
         log_progress(cumulative_final, total_eligible_files, cumulative_faces_final)
         print(json.dumps({
             "status": "complete",
@@ -477,6 +500,68 @@ def detect_faces_worker():
         print(json.dumps({"status": "error", "error": str(e)}))
         sys.exit(1)
 
+def serve_batches():
+    """Long-lived mode: read batches of media ids from stdin until EOF.
+    
+    Each stdin line is a JSON object {"media_ids": [...]}. After processing a
+    batch one JSON status line is written to stdout so the backend can send the
+    next one. Models stay loaded between batches instead of being re-imported
+    by a fresh interpreter for every batch.
+    """
+    log_worker("Initializing database...")
+    init_db()
+    log_worker("Database initialized - waiting for batches on stdin")
+    
+    batches_done = 0
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            media_ids = json.loads(line).get("media_ids", [])
+            if not media_ids:
+                print(json.dumps({"status": "batch_complete", "processed": 0, "faces_found": 0, "skipped": 0}), flush=True)
+                continue
+            
+            total_eligible_files, already_processed, already_found_faces = load_detection_stats()
+            placeholders = ",".join("?" for _ in media_ids)
+            with get_db() as conn:
+                unprocessed = conn.execute(
+                    f"SELECT id, path FROM media_files WHERE id IN ({placeholders}) ORDER BY id",
+                    media_ids,
+                ).fetchall()
+            
+            log_worker(f"[BATCH] Received {len(media_ids)} image(s) ({already_processed}/{total_eligible_files} done so far)")
+            processed_count, faces_detected, skipped_count = process_images(
+                unprocessed, total_eligible_files, already_processed, already_found_faces
+            )
+            batches_done += 1
+            
+            # Keep the People tab live between batches
+            rebuild_clustering_cache()
+            
+            print(json.dumps({
+                "status": "batch_complete",
+                "processed": processed_count,
+                "faces_found": faces_detected,
+                "skipped": skipped_count,
+            }), flush=True)
+        except Exception as e:
+            log_crash(f"Batch error: {str(e)}\n{traceback.format_exc()}")
+            print(json.dumps({"status": "error", "error": str(e)}), flush=True)
+    
+    # stdin closed - backend has no more work
+    log_worker(f"✓ face detection complete ({batches_done} batch(es) served)")
+    log_cluster_stats()
+    total_eligible_files, already_processed, already_found_faces = load_detection_stats()
+    log_progress(already_processed, total_eligible_files, already_found_faces)
+    print(json.dumps({
+        "status": "complete",
+        "faces_found": already_found_faces,
+        "processed": already_processed,
+        "total": total_eligible_files,
+    }), flush=True)
+
 
 if __name__ == "__main__":
     try:
@@ -487,7 +572,10 @@ if __name__ == "__main__":
         log_worker(f"database: {os.environ.get('PAI_DB', 'default')}")
         log_worker("=" * 50)
         
-        detect_faces_worker()
+        if "--serve" in sys.argv[1:]:
+            serve_batches()
+        else:
+            detect_faces_worker()
         
         log_worker("=" * 50)
         log_worker("face detection worker exiting normally")
@@ -61,14 +61,25 @@ export async function GET(
       headers: request.headers as HeadersInit,
     });
     
+    const validators: Record<string, string> = {};
+    for (const name of ['etag', 'last-modified', 'cache-control', 'content-range']) {
+      const value = backendResponse.headers.get(name);
+      if (value) validators[name] = value;
+    }
+    
+    if (backendResponse.status === 304) {
+      return new NextResponse(null, { status: 304, headers: validators });
+    }
+    
     if (!backendResponse.ok) {
       throw new Error(`Backend returned ${backendResponse.status}`);
     }
     
-    // Stream the audio file from backend
-    const buffer = await backendResponse.arrayBuffer();
-    return new NextResponse(buffer, {
+    // Stream the file from backend, keeping 206 partial responses for Range requests
+    return new NextResponse(backendResponse.body, {
+      status: backendResponse.status,
       headers: {
+        ...validators,
         'Content-Type': backendResponse.headers.get('Content-Type') || 'audio/mpeg',
         'Content-Length': backendResponse.headers.get('Content-Length') || '',
         'Accept-Ranges': 'bytes',
@@ -68,6 +68,16 @@ export async function GET(
       signal: AbortSignal.timeout(10000),
     });
     
+    const validators: Record<string, string> = {};
+    for (const name of ['etag', 'last-modified']) {
+      const value = backendResponse.headers.get(name);
+      if (value) validators[name] = value;
+    }
+    
+    if (backendResponse.status === 304) {
+      return new NextResponse(null, { status: 304, headers: validators });
+    }
+    
     if (!backendResponse.ok) {
       throw new Error(`Backend returned ${backendResponse.status}`);
     }
@@ -77,8 +87,9 @@ export async function GET(
     
     return new NextResponse(imageBuffer, {
       headers: {
+        ...validators,
         'Content-Type': contentType,
-        'Cache-Control': 'public, max-age=31536000, immutable',
+        'Cache-Control': backendResponse.headers.get('cache-control') || 'public, max-age=31536000, immutable',
       },
     });
   } catch (error) {